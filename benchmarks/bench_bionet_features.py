@@ -0,0 +1,60 @@
+"""
+BioNet Feature Extraction Benchmark
+===================================
+
+Fills the ring buffers of many users with synthetic EEG/ECG, then times
+one full batched feature refresh (Welch band power over 2 s EEG windows,
+autocorrelation heart rate over 5 s ECG windows) and a steady-state
+refresh after one hop of new data, reporting users per second on one
+core.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bionet_features
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from interconnect.bionet import BioNet
+
+USERS = [500, 2_000, 8_000]
+RATE = 256.0
+FILL_SECONDS = 6
+HOP_SECONDS = 0.25
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = np.random.default_rng(3)
+    t = np.arange(int(FILL_SECONDS * RATE)) / RATE
+    print(f"{'users':>6} {'full refresh':>13} {'users/s':>10} {'per hop':>10} {'users/s':>10}")
+    for users in USERS:
+        bn = BioNet(channels={"eeg": RATE, "ecg": RATE}, seconds=FILL_SECONDS, hop_seconds=HOP_SECONDS)
+        ids = [f"u{i}" for i in range(users)]
+        for u in ids:
+            bn.register_bio_id(u, "0" * 64)
+        alpha = rng.uniform(5, 25, (users, 1))
+        eeg = alpha * np.sin(2 * np.pi * 10 * t) + rng.normal(0, 2, (users, len(t)))
+        ecg = (np.sin(2 * np.pi * rng.uniform(1, 2, (users, 1)) * t) > 0.95) + rng.normal(0, 0.05, (users, len(t)))
+        bn.store.ingest_many("eeg", ids, eeg)
+        bn.store.ingest_many("ecg", ids, ecg)
+
+        t0 = time.perf_counter()
+        bn.update_features()
+        full = time.perf_counter() - t0
+
+        hop = int(HOP_SECONDS * RATE)
+        bn.store.ingest_many("eeg", ids, eeg[:, :hop])
+        bn.store.ingest_many("ecg", ids, ecg[:, :hop])
+        t0 = time.perf_counter()
+        bn.update_features()
+        steady = time.perf_counter() - t0
+        print(f"{users:>6} {full * 1e3:>10.1f} ms {users / full:>10,.0f} {steady * 1e3:>7.1f} ms "
+              f"{users / steady:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
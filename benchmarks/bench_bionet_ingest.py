@@ -0,0 +1,67 @@
+"""
+BioNet Signal Ingest Benchmark
+==============================
+
+Streams synthetic EEG (1024 Hz) and ECG (256 Hz) for thousands of users
+into the columnar ring buffers in 1/32 s blocks, per user (``ingest``)
+and for all users at once (``ingest_many``), reporting samples per
+second, the real-time factor and the fixed buffer memory.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_bionet_ingest
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from interconnect.bionet import BioNet
+
+USERS = 2_000
+CHANNELS = {"eeg": 1024.0, "ecg": 256.0}
+SECONDS_BUFFERED = 8.0
+BLOCKS_PER_SECOND = 32
+STREAM_SECONDS = 2
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    bn = BioNet(channels=CHANNELS, seconds=SECONDS_BUFFERED)
+    users = [f"user{i}" for i in range(USERS)]
+    for u in users:
+        bn.register_bio_id(u, "0" * 64)
+    rng = np.random.default_rng(0)
+    blocks = {ch: rng.normal(size=(USERS, int(rate) // BLOCKS_PER_SECOND)).astype(np.float32)
+              for ch, rate in CHANNELS.items()}
+    samples = sum(b.size for b in blocks.values()) * BLOCKS_PER_SECOND * STREAM_SECONDS
+    print(f"users={USERS:,}, channels={CHANNELS}, {STREAM_SECONDS} s streamed, "
+          f"buffers {bn.store.nbytes() / 2**20:.0f} MiB ({SECONDS_BUFFERED:.0f} s each)")
+
+    t0 = time.perf_counter()
+    for _ in range(BLOCKS_PER_SECOND * STREAM_SECONDS):
+        for ch, block in blocks.items():
+            for i, u in enumerate(users):
+                bn.ingest(u, ch, block[i])
+    per_user = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(BLOCKS_PER_SECOND * STREAM_SECONDS):
+        for ch, block in blocks.items():
+            bn.store.ingest_many(ch, users, block)
+    batched = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for u in users:
+        bn.window(u, "eeg", 1024)
+    window = (time.perf_counter() - t0) / USERS
+
+    for label, elapsed in (("ingest (per user)", per_user), ("ingest_many", batched)):
+        print(f"{label:<18}: {samples / elapsed / 1e6:7.1f} M samples/s, "
+              f"real-time factor {STREAM_SECONDS / elapsed:6.1f}x")
+    print(f"window (1 s view) : {window * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+CosmicSubstrate Channel Log Benchmark
+=====================================
+
+Appends a day's worth of pulses for a busy channel into the segmented
+log, then reports append throughput, resident log size and the latency
+of time-range and sender queries.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_cosmic_channel_log [directory]
+"""
+
+import sys
+import tempfile
+import time
+
+from interconnect.cosmic_substrate import ChannelLog
+
+PULSES = 2_000_000
+SENDERS = 1_000
+DAY = 86_400.0
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = sys.argv[1] if len(sys.argv) > 1 else tmp
+        log = ChannelLog(directory, segment_bytes=64 << 20, segment_seconds=None, retention_bytes=None)
+        start = 1_700_000_000.0
+        step = DAY / PULSES
+
+        t0 = time.perf_counter()
+        for i in range(PULSES):
+            log.append(f"node-{i % SENDERS}", f"resonance pulse #{i}", "broadcast", False, start + i * step)
+        append = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        window = list(log.read(start + DAY / 2, start + DAY / 2 + 60))
+        range_query = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        sender = list(log.read(start + DAY / 2, start + DAY / 2 + 3600, sender="node-42"))
+        sender_query = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        count = len(log)
+        meta = time.perf_counter() - t0
+
+        print(f"pulses={count:,} segments={len(log.segments)} bytes={log.size_bytes / 2**20:.1f} MiB")
+        print(f"append           : {PULSES / append:12,.0f} pulses/s")
+        print(f"1-minute window  : {range_query * 1e3:12.2f} ms ({len(window)} records)")
+        print(f"sender, 1 hour   : {sender_query * 1e3:12.2f} ms ({len(sender)} records)")
+        print(f"count (metadata) : {meta * 1e6:12.2f} us")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+CosmicSubstrate Multicast Benchmark
+===================================
+
+Publishes pulses to a channel with 100k members and reports delivered
+pulses per second for immediate and asyncio (batched) fan-out.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_cosmic_multicast
+"""
+
+import asyncio
+import logging
+import time
+
+from interconnect.cosmic_substrate import CosmicSubstrate, PulseMulticaster
+
+MEMBERS = 100_000
+PULSES = 20
+
+
+def _substrate(policy: str) -> CosmicSubstrate:
+    cs = CosmicSubstrate(multicast=PulseMulticaster(inbox_size=8, policy=policy))
+    cs.add_node("origin")
+    cs.create_channel("galaxy")
+    for i in range(MEMBERS):
+        name = f"m{i}"
+        cs.add_node(name)
+        cs.join_channel(name, "galaxy")
+    return cs
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+
+    cs = _substrate("drop_oldest")
+    t0 = time.perf_counter()
+    for i in range(PULSES):
+        cs.send_pulse("origin", f"pulse {i}", channel="galaxy")
+    sync = time.perf_counter() - t0
+    print(f"members={MEMBERS:,} pulses={PULSES}")
+    print(f"immediate fan-out : {cs.multicast.stats['delivered'] / sync:12,.0f} deliveries/s "
+          f"{cs.multicast.stats}")
+
+    for policy in ("drop_oldest", "drop_new"):
+        cs = _substrate(policy)
+
+        async def publish():
+            for i in range(PULSES):
+                await cs.send_pulse_async("origin", f"pulse {i}", channel="galaxy")
+
+        t0 = time.perf_counter()
+        asyncio.run(publish())
+        elapsed = time.perf_counter() - t0
+        print(f"async {policy:<11} : {cs.multicast.stats['delivered'] / elapsed:12,.0f} deliveries/s "
+              f"{cs.multicast.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+CosmicSubstrate Trust Propagation Benchmark
+===========================================
+
+Builds a large resonance graph, then reports the cold global-trust
+computation, the warm-started recompute after a single resonance change,
+and the cost of cached trust lookups, plus the cost of a per-sender
+(personalized) trust vector and lookups against it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_cosmic_trust
+"""
+
+import random
+import statistics
+import time
+
+from interconnect.cosmic_substrate import TrustEngine
+
+NODES = 100_000
+EDGES = 1_000_000
+UPDATES = 20
+LOOKUPS = 1_000_000
+
+
+def main() -> None:
+    rng = random.Random(9)
+    names = [f"c{i}" for i in range(NODES)]
+    engine = TrustEngine()
+
+    t0 = time.perf_counter()
+    for _ in range(EDGES):
+        engine.set_trust(rng.choice(names), rng.choice(names), rng.uniform(30, 100))
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    engine.recompute()
+    cold = time.perf_counter() - t0
+    cold_iterations = engine.stats["iterations"]
+
+    warm, iterations = [], []
+    for _ in range(UPDATES):
+        engine.set_trust(rng.choice(names), rng.choice(names), rng.uniform(30, 100))
+        before = engine.stats["iterations"]
+        t0 = time.perf_counter()
+        engine.score(names[0])
+        warm.append(time.perf_counter() - t0)
+        iterations.append(engine.stats["iterations"] - before)
+
+    probes = [rng.choice(names) for _ in range(LOOKUPS)]
+    score = engine.score
+    t0 = time.perf_counter()
+    for name in probes:
+        score(name)
+    lookup = (time.perf_counter() - t0) / LOOKUPS
+
+    t0 = time.perf_counter()
+    engine.personal_score(names[1], names[2])
+    personal = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for name in probes[:LOOKUPS // 10]:
+        engine.personal_score(names[1], name)
+    personal_lookup = (time.perf_counter() - t0) / (LOOKUPS // 10)
+
+    print(f"nodes={NODES:,} edges={len(engine):,}")
+    print(f"graph build        : {build:8.2f} s")
+    print(f"cold recompute     : {cold * 1e3:8.1f} ms ({cold_iterations} iterations)")
+    print(f"warm recompute     : {statistics.mean(warm) * 1e3:8.1f} ms "
+          f"({statistics.mean(iterations):.1f} iterations per change)")
+    print(f"cached lookup      : {lookup * 1e6:8.3f} us")
+    print(f"per-sender vector  : {personal * 1e3:8.1f} ms")
+    print(f"per-sender lookup  : {personal_lookup * 1e6:8.3f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+CryptoEngine Bulk Encryption Benchmark
+======================================
+
+Compares the Fernet message path (``encrypt``/``decrypt`` on str) with
+the chunked AES-GCM stream format:
+
+* one large payload: MB/s and ciphertext expansion,
+* many small messages: µs and bytes of overhead per message,
+* ``encrypt_many``/``decrypt_many`` on 1 worker and on a thread pool.
+
+Thread-pool speedup depends on the cores available; the machine's core
+count is printed with the results.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_crypto_stream
+"""
+
+import os
+import time
+
+from security.crypto_engine import CryptoEngine
+
+LARGE = 64 * 1024 * 1024
+SMALL = 256
+SMALL_COUNT = 20_000
+BULK_SIZE = 1024 * 1024
+BULK_COUNT = 64
+WORKERS = [1, 4]
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _large(engine: CryptoEngine) -> None:
+    text = "x" * LARGE
+    token, enc = _timed(engine.encrypt, text)
+    _, dec = _timed(engine.decrypt, token)
+    print(f"{'Fernet encrypt(str)':<24} {LARGE / 2**20 / enc:>8.1f} MiB/s enc  {LARGE / 2**20 / dec:>8.1f} MiB/s dec  "
+          f"size x{len(token) / LARGE:.3f}")
+    del text, token
+
+    data = os.urandom(LARGE)
+    token, enc = _timed(engine.encrypt_bytes, memoryview(data))
+    _, dec = _timed(engine.decrypt_bytes, token)
+    print(f"{'AES-GCM encrypt_bytes':<24} {LARGE / 2**20 / enc:>8.1f} MiB/s enc  {LARGE / 2**20 / dec:>8.1f} MiB/s dec  "
+          f"size x{len(token) / LARGE:.3f}")
+
+
+def _small(engine: CryptoEngine) -> None:
+    texts = ["m" * SMALL] * SMALL_COUNT
+    tokens, enc = _timed(lambda: [engine.encrypt(t) for t in texts])
+    _, dec = _timed(lambda: [engine.decrypt(t) for t in tokens])
+    overhead = sum(map(len, tokens)) / SMALL_COUNT - SMALL
+    print(f"{'Fernet, per message':<24} {enc / SMALL_COUNT * 1e6:>8.2f} µs enc  {dec / SMALL_COUNT * 1e6:>8.2f} µs dec  "
+          f"+{overhead:.0f} B/message")
+
+    payloads = [b"m" * SMALL] * SMALL_COUNT
+    tokens, enc = _timed(engine.encrypt_many, payloads)
+    _, dec = _timed(engine.decrypt_many, tokens)
+    overhead = sum(map(len, tokens)) / SMALL_COUNT - SMALL
+    print(f"{'AES-GCM encrypt_many':<24} {enc / SMALL_COUNT * 1e6:>8.2f} µs enc  {dec / SMALL_COUNT * 1e6:>8.2f} µs dec  "
+          f"+{overhead:.0f} B/message")
+
+
+def _bulk(key: bytes) -> None:
+    payloads = [os.urandom(BULK_SIZE) for _ in range(BULK_COUNT)]
+    total = BULK_SIZE * BULK_COUNT / 2**20
+    for workers in WORKERS:
+        engine = CryptoEngine(key, max_workers=workers)
+        try:
+            tokens, enc = _timed(engine.encrypt_many, payloads)
+            _, dec = _timed(engine.decrypt_many, tokens)
+        finally:
+            engine.close()
+        print(f"{f'encrypt_many, {workers} worker(s)':<24} {total / enc:>8.1f} MiB/s enc  {total / dec:>8.1f} MiB/s dec")
+
+
+def main() -> None:
+    print(f"{os.cpu_count()} CPU core(s)")
+    engine = CryptoEngine()
+    _large(engine)
+    _small(engine)
+    _bulk(engine.get_key())
+
+
+if __name__ == "__main__":
+    main()
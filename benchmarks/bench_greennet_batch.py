@@ -0,0 +1,60 @@
+"""
+GreenNet Batch Send Benchmark
+=============================
+
+Replays a packet trace through ``send_packet`` one call at a time and
+through ``send_packets`` in batches, reporting packets per second.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_greennet_batch
+"""
+
+import logging
+import random
+import time
+
+from interconnect.greennet import GreenNet
+
+NODES = 256
+RULES = 500
+PACKETS = 200_000
+BATCH = 50_000
+
+
+def _build() -> GreenNet:
+    gn = GreenNet()
+    for i in range(NODES):
+        gn.add_route(f"Node{i}", f"10.1.{i // 256}.{i % 256}")
+    for i in range(RULES):
+        gn.add_firewall_rule("content", f"sig-{i:04d};")
+    return gn
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(7)
+    payloads = [f"telemetry frame {i} sig-{i * 7:04d};" for i in range(100)]
+    trace = [(f"Node{rng.randrange(NODES)}", rng.choice(payloads)) for _ in range(PACKETS)]
+
+    gn = _build()
+    t0 = time.perf_counter()
+    for node, data in trace:
+        gn.send_packet(node, data)
+    single = time.perf_counter() - t0
+    single_stats = dict(gn.analytics)
+
+    gn = _build()
+    t0 = time.perf_counter()
+    for start in range(0, PACKETS, BATCH):
+        gn.send_packets(trace[start:start + BATCH])
+    batched = time.perf_counter() - t0
+
+    print(f"packets={PACKETS} nodes={NODES} rules={RULES} batch={BATCH}")
+    print(f"send_packet  : {PACKETS / single:12,.0f} packets/s {single_stats}")
+    print(f"send_packets : {PACKETS / batched:12,.0f} packets/s {gn.analytics}")
+    print(f"speedup      : {single / batched:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+GreenNet Routing Table Benchmark
+================================
+
+Loads a full-table-sized set of IPv4 prefixes into the GreenNet
+``RoutingTable`` and reports build time, memory, and lookup latency.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_greennet_lpm
+"""
+
+import random
+import time
+
+from interconnect.greennet import RoutingTable
+
+PREFIXES = 1_000_000
+LOOKUPS = 1_000_000
+
+# Rough shape of a public BGP table: mostly /24s, a long tail of shorter ones.
+LENGTHS = [24] * 60 + [23] * 8 + [22] * 12 + [21] * 5 + [20] * 5 + [19] * 3 + \
+    [18] * 2 + [17] * 1 + [16] * 2 + [28] * 1 + [32] * 1
+
+
+def main() -> None:
+    rng = random.Random(2024)
+    entries = []
+    for _ in range(PREFIXES):
+        plen = rng.choice(LENGTHS)
+        network = rng.getrandbits(32) & ~((1 << (32 - plen)) - 1) & 0xFFFFFFFF
+        entries.append((network, plen, f"AS{rng.randrange(70_000)}"))
+
+    table = RoutingTable()
+    t0 = time.perf_counter()
+    for network, plen, hop in entries:
+        table.insert_int(network, plen, hop)
+    build = time.perf_counter() - t0
+
+    probes = [rng.getrandbits(32) for _ in range(LOOKUPS)]
+    lookup = table.lookup_int
+    t0 = time.perf_counter()
+    hits = sum(1 for address in probes if lookup(address) is not None)
+    elapsed = time.perf_counter() - t0
+
+    print(f"prefixes={len(table):,} lookups={LOOKUPS:,}")
+    print(f"build        : {build:8.2f} s ({PREFIXES / build:,.0f} prefixes/s)")
+    print(f"trie memory  : {table.memory_bytes() / 2**20:8.1f} MiB")
+    print(f"lookup       : {elapsed / LOOKUPS * 1e6:8.3f} us/lookup ({hits:,} hits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+GreenNet Path Engine Benchmark
+==============================
+
+Builds a 100k-node topology, then reports shortest-path query latency
+(cold and cached) and the recomputation cost after single-link updates.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_greennet_paths
+"""
+
+import random
+import statistics
+import time
+
+from interconnect.greennet import PathEngine
+
+NODES = 100_000
+EXTRA_LINKS = 200_000
+SOURCES = 8
+QUERIES = 100_000
+UPDATES = 200
+
+
+def main() -> None:
+    rng = random.Random(11)
+    engine = PathEngine(energy_weight=1.0, latency_weight=0.1)
+
+    t0 = time.perf_counter()
+    for i in range(NODES):  # ring keeps the graph connected
+        engine.set_link(f"n{i}", f"n{(i + 1) % NODES}", rng.uniform(1, 10), rng.uniform(1, 50))
+    for _ in range(EXTRA_LINKS):
+        a, b = rng.randrange(NODES), rng.randrange(NODES)
+        if a != b:
+            engine.set_link(f"n{a}", f"n{b}", rng.uniform(1, 10), rng.uniform(1, 50))
+    build = time.perf_counter() - t0
+
+    sources = [f"n{rng.randrange(NODES)}" for _ in range(SOURCES)]
+    t0 = time.perf_counter()
+    for src in sources:
+        engine.path(src, "n0")
+    cold = (time.perf_counter() - t0) / SOURCES
+
+    targets = [(rng.choice(sources), f"n{rng.randrange(NODES)}") for _ in range(QUERIES)]
+    t0 = time.perf_counter()
+    for src, dst in targets:
+        engine.path(src, dst)
+    warm = (time.perf_counter() - t0) / QUERIES
+
+    links = list(engine.links)
+    repaired, recompute = [], []
+    for _ in range(UPDATES):
+        a, b = rng.choice(links)
+        energy, latency = engine.links[(a, b)]
+        before = engine.stats["trees_repaired"]
+        t0 = time.perf_counter()
+        engine.set_link(a, b, energy * rng.choice((0.5, 2.0)), latency)
+        recompute.append(time.perf_counter() - t0)
+        repaired.append(engine.stats["trees_repaired"] - before)
+
+    print(f"nodes={NODES:,} links={len(engine.links):,} cached sources={SOURCES}")
+    print(f"topology build     : {build:8.2f} s")
+    print(f"cold query (tree)  : {cold * 1e3:8.1f} ms")
+    print(f"cached query       : {warm * 1e6:8.2f} us")
+    print(f"trees repaired     : {statistics.mean(repaired):8.2f} of {SOURCES} per update")
+    print(f"recompute / update : {statistics.mean(recompute) * 1e3:8.1f} ms mean, "
+          f"{max(recompute) * 1e3:.1f} ms max")
+
+
+if __name__ == "__main__":
+    main()
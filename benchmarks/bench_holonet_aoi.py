@@ -0,0 +1,58 @@
+"""
+HoloNet Area-of-Interest Benchmark
+==================================
+
+Simulates one large hologram room where every participant moves and
+broadcasts once per tick, comparing whole-room fan-out against delivery
+limited to an interest radius via the spatial grid.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_holonet_aoi
+"""
+
+import logging
+import random
+import time
+
+from interconnect.holonet import HoloNet
+
+SIZES = [250, 1_000, 2_000]
+WORLD = (200.0, 200.0, 20.0)
+RADIUS = 15.0
+STEP = 1.0
+TICKS = 3
+
+
+def _tick_time(n: int, radius) -> tuple:
+    rng = random.Random(n)
+    hn = HoloNet()
+    hn.create_hologram("arena", interest_radius=radius)
+    positions = {f"u{i}": [rng.uniform(0, w) for w in WORLD] for i in range(n)}
+    for user, pos in positions.items():
+        hn.add_participant(user, "arena", pos)
+
+    deliveries = 0
+    t0 = time.perf_counter()
+    for _ in range(TICKS):
+        for user, pos in positions.items():
+            for axis in range(3):
+                pos[axis] = min(WORLD[axis], max(0.0, pos[axis] + rng.uniform(-STEP, STEP)))
+            hn.move_participant(user, "arena", pos)
+        for user in positions:
+            deliveries += hn.broadcast_vr_message("arena", b"pose", sender=user)["count"]
+    return (time.perf_counter() - t0) / TICKS, deliveries / TICKS / n
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"world={WORLD}, radius={RADIUS}, {TICKS} ticks")
+    print(f"{'users':>6} {'whole room':>12} {'fan-out':>8} {'interest':>12} {'fan-out':>8} {'speed-up':>9}")
+    for n in SIZES:
+        full, full_k = _tick_time(n, None)
+        aoi, aoi_k = _tick_time(n, RADIUS)
+        print(f"{n:>6} {full * 1e3:>9.1f} ms {full_k:>8.1f} {aoi * 1e3:>9.1f} ms {aoi_k:>8.1f} {full / aoi:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
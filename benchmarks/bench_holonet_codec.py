@@ -0,0 +1,56 @@
+"""
+HoloNet Frame Codec Benchmark
+=============================
+
+Encodes a stream of mostly-static hologram scenes (a few small regions
+change per frame) with the binary keyframe/delta codec and reports
+encode/decode cost per frame and bytes on the wire versus raw payloads.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_holonet_codec
+"""
+
+import random
+import time
+
+from interconnect.holonet import FrameCodec, FrameDecoder
+
+SCENE_BYTES = [4 << 10, 64 << 10, 1 << 20]
+FRAMES = 600
+REGIONS = 4
+REGION_BYTES = 64
+KEYFRAME_INTERVAL = 60
+
+
+def _scenes(size: int):
+    rng = random.Random(size)
+    scene = bytearray(rng.randbytes(size))
+    for _ in range(FRAMES):
+        for _ in range(REGIONS):
+            start = rng.randrange(size - REGION_BYTES)
+            scene[start:start + REGION_BYTES] = rng.randbytes(REGION_BYTES)
+        yield bytes(scene)
+
+
+def main() -> None:
+    print(f"{FRAMES} frames, {REGIONS}x{REGION_BYTES} B changed per frame, keyframe every {KEYFRAME_INTERVAL}")
+    print(f"{'scene':>9} {'encode':>11} {'decode':>11} {'raw MB':>8} {'wire MB':>8} {'ratio':>7}")
+    for size in SCENE_BYTES:
+        scenes = list(_scenes(size))
+        codec = FrameCodec(keyframe_interval=KEYFRAME_INTERVAL)
+        t0 = time.perf_counter()
+        wires = [codec.encode("room", "P", scene)[0] for scene in scenes]
+        encode = (time.perf_counter() - t0) / FRAMES
+        decoder = FrameDecoder()
+        t0 = time.perf_counter()
+        for wire in wires:
+            decoder.decode(wire)
+        decode = (time.perf_counter() - t0) / FRAMES
+        raw, wire = codec.stats["raw_bytes"], codec.stats["wire_bytes"]
+        print(f"{size:>9,} {encode * 1e6:>8.1f} us {decode * 1e6:>8.1f} us {raw / 1e6:>8.1f} "
+              f"{wire / 1e6:>8.2f} {raw / wire:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
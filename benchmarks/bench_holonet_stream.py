@@ -0,0 +1,88 @@
+"""
+HoloNet Stream Pipeline Benchmark
+=================================
+
+Runs many hologram rooms on one asyncio loop: a frame clock broadcasts one
+frame per room per tick at 60 fps, and every participant is a consumer
+task (a tenth of them deliberately slow). Reports the achieved tick rate,
+deliveries per second, publish→receive latency and coalescing rate.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_holonet_stream
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+from interconnect.holonet import FrameBroadcaster, HoloNet
+
+ROOMS = [100, 250, 1_000]
+PARTICIPANTS = 8
+FPS = 60
+DURATION = 3.0
+SLOW_EVERY = 10
+SLOW_DELAY = 0.1
+PAYLOAD = os.urandom(1_200)
+
+
+async def _consumer(hn: HoloNet, room: str, user: str, slow: bool) -> None:
+    while True:
+        await hn.broadcaster.receive_many(room, user)
+        if slow:
+            await asyncio.sleep(SLOW_DELAY)
+
+
+async def _run(rooms: int) -> None:
+    hn = HoloNet(broadcaster=FrameBroadcaster(queue_size=4))
+    users = []
+    for r in range(rooms):
+        room = f"room{r}"
+        hn.create_hologram(room)
+        for p in range(PARTICIPANTS):
+            user = f"{room}:u{p}"
+            hn.add_participant(user, room)
+            users.append((room, user))
+    consumers = [asyncio.ensure_future(_consumer(hn, room, user, i % SLOW_EVERY == 0))
+                 for i, (room, user) in enumerate(users)]
+
+    ticks, late = 0, 0
+    start = time.perf_counter()
+    deadline = start
+    while time.perf_counter() - start < DURATION:
+        for r in range(rooms):
+            room = f"room{r}"
+            hn.broadcast_vr_message(room, PAYLOAD, sender=f"{room}:u{ticks % PARTICIPANTS}")
+        ticks += 1
+        deadline += 1 / FPS
+        delay = deadline - time.perf_counter()
+        if delay < 0:
+            late += 1
+        await asyncio.sleep(max(0.0, delay))
+    elapsed = time.perf_counter() - start
+    for task in consumers:
+        task.cancel()
+    await asyncio.gather(*consumers, return_exceptions=True)
+
+    stats = [hn.broadcaster.room_stats(f"room{r}") for r in range(rooms)]
+    delivered = sum(s["queued"] + s["coalesced"] for s in stats)
+    p50 = statistics.mean(s.get("latency_p50_ms", 0.0) for s in stats)
+    p99 = statistics.mean(s.get("latency_p99_ms", 0.0) for s in stats)
+    drops = statistics.mean(s["drop_rate"] for s in stats)
+    print(f"{rooms:>6} {ticks / elapsed:>9.1f} {late:>6} {delivered / elapsed:>14,.0f} "
+          f"{p50:>9.2f} {p99:>9.2f} {drops:>9.2%}")
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{PARTICIPANTS} participants/room, target {FPS} fps, {DURATION:.0f} s per run")
+    print(f"{'rooms':>6} {'tick fps':>9} {'late':>6} {'deliveries/s':>14} {'p50 ms':>9} {'p99 ms':>9} {'coalesced':>9}")
+    for rooms in ROOMS:
+        asyncio.run(_run(rooms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+LegacyBridge HTTP Engine Benchmark
+==================================
+
+Serves requests from a local keep-alive HTTP/1.1 stand-in server that adds
+a small fixed delay per response (simulating a remote legacy host) and
+compares three ways of issuing the same batch of GETs:
+
+* ``requests.get`` per call (the previous ``send_http`` path: a fresh
+  connection and handshake every time),
+* the pooled ``send_http`` path, sequentially,
+* ``send_many`` with several requests in flight.
+
+Reports requests per second and p50/p99 per-request latency.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_legacy_bridge
+"""
+
+import logging
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from interconnect.legacy_bridge import LegacyBridge
+
+REQUESTS = 400
+SERVER_DELAY = 0.002
+IN_FLIGHT = [4, 16]
+BODY = b"x" * 512
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY a
+    # keep-alive client waits out a delayed ACK on every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        time.sleep(SERVER_DELAY)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _report(label, elapsed, latencies):
+    print(
+        f"{label:<28} {REQUESTS / elapsed:>9,.0f} req/s   "
+        f"p50 {statistics.median(latencies) * 1e3:6.2f} ms   p99 {_percentile(latencies, 0.99) * 1e3:6.2f} ms"
+    )
+
+
+def _sequential(label, fetch, urls):
+    latencies = []
+    started = time.perf_counter()
+    for url in urls:
+        t0 = time.perf_counter()
+        fetch(url)
+        latencies.append(time.perf_counter() - t0)
+    _report(label, time.perf_counter() - started, latencies)
+
+
+def _concurrent(bridge, urls, in_flight):
+    latencies = []
+
+    def timed(url):
+        t0 = time.perf_counter()
+        text = fetch(url)
+        latencies.append(time.perf_counter() - t0)
+        return text
+
+    # Same scheduling as send_many, with each request timed individually
+    fetch = bridge._fetch
+    bridge._fetch = timed
+    try:
+        started = time.perf_counter()
+        results = bridge.send_many(urls, max_in_flight=in_flight)
+        elapsed = time.perf_counter() - started
+    finally:
+        del bridge._fetch
+    assert all(r is not None for r in results)
+    _report(f"send_many ({in_flight} in flight)", elapsed, latencies)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/item/{i}" for i in range(REQUESTS)]
+    print(f"{REQUESTS} GETs, {SERVER_DELAY * 1e3:.0f} ms server delay")
+
+    _sequential("requests.get per call", lambda url: requests.get(url, timeout=5).text, urls)
+
+    bridge = LegacyBridge(max_per_host=max(IN_FLIGHT), max_in_flight=max(IN_FLIGHT))
+    try:
+        _sequential("pooled send_http", bridge.send_http, urls)
+        for in_flight in IN_FLIGHT:
+            _concurrent(bridge, urls, in_flight)
+    finally:
+        bridge.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
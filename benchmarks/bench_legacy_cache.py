@@ -0,0 +1,126 @@
+"""
+LegacyBridge Response Cache Benchmark
+=====================================
+
+Replays a skewed (Zipf-like) stream of GETs against a local stand-in
+server with a fixed per-response delay. Half of the URLs are cacheable for
+a short ``max-age``; the other half are ``no-cache`` with an ``ETag`` and
+must be revalidated (304) on every use. Compares the bridge with the cache
+disabled and enabled, then fires bursts of identical concurrent GETs to
+show request coalescing.
+
+Reports requests per second, upstream requests, hit rate and per-outcome
+latency percentiles.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_legacy_cache
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from interconnect.legacy_bridge import LegacyBridge
+
+REQUESTS = 2_000
+URLS = 200
+ZIPF = 1.1
+MAX_AGE = 1
+SERVER_DELAY = 0.005
+BODY = b"x" * 4_096
+BURSTS = 20
+BURST_SIZE = 16
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.upstream[self.path.split("/")[1]] += 1
+        time.sleep(SERVER_DELAY)
+        if self.path.startswith("/fresh"):
+            headers = {"Cache-Control": f"max-age={MAX_AGE}"}
+        else:
+            headers = {"Cache-Control": "no-cache", "ETag": '"v1"'}
+        unchanged = self.headers.get("If-None-Match") == '"v1"'
+        self.send_response(304 if unchanged else 200)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        body = b"" if unchanged else BODY
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _workload(base: str):
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) ** ZIPF for rank in range(URLS)]
+    urls = [f"{base}/{'fresh' if i % 2 else 'etag'}/{i}" for i in range(URLS)]
+    return rng.choices(urls, weights, k=REQUESTS)
+
+
+def _replay(label: str, bridge: LegacyBridge, server, urls) -> None:
+    server.upstream.clear()
+    started = time.perf_counter()
+    for url in urls:
+        bridge.send_http(url)
+    elapsed = time.perf_counter() - started
+    stats = bridge.cache.stats()
+    print(
+        f"{label:<10} {REQUESTS / elapsed:>7,.0f} req/s   upstream {sum(server.upstream.values()):>5}   "
+        f"hit rate {stats['hit_rate']:.0%}   no body download {stats['saved_rate']:.0%}"
+    )
+    for outcome in ("hits", "revalidated", "misses"):
+        if f"{outcome}_p50_ms" in stats:
+            print(
+                f"{'':<10} {outcome:<12} {stats[outcome]:>5}   "
+                f"p50 {stats[f'{outcome}_p50_ms']:6.2f} ms   p99 {stats[f'{outcome}_p99_ms']:6.2f} ms"
+            )
+
+
+def _bursts(bridge: LegacyBridge, server, base: str) -> None:
+    server.upstream.clear()
+    for i in range(BURSTS):
+        bridge.send_many([f"{base}/fresh/burst-{i}"] * BURST_SIZE, max_in_flight=BURST_SIZE)
+    stats = bridge.cache.stats()
+    print(
+        f"{BURSTS} bursts of {BURST_SIZE} identical GETs -> {sum(server.upstream.values())} upstream requests "
+        f"({stats['coalesced']} coalesced, {stats['hits']} hits)"
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.upstream = Counter()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = _workload(base)
+    print(f"{REQUESTS} GETs over {URLS} URLs, {SERVER_DELAY * 1e3:.0f} ms server delay, max-age {MAX_AGE}s")
+
+    for label, cache_bytes in (("no cache", 0), ("cache", 32 * 1024 * 1024)):
+        bridge = LegacyBridge(cache_bytes=cache_bytes)
+        try:
+            _replay(label, bridge, server, urls)
+        finally:
+            bridge.close()
+
+    bridge = LegacyBridge(max_per_host=BURST_SIZE, max_in_flight=BURST_SIZE)
+    try:
+        _bursts(bridge, server, base)
+    finally:
+        bridge.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
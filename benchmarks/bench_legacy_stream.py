@@ -0,0 +1,118 @@
+"""
+LegacyBridge Streaming Benchmark
+================================
+
+Downloads a large body from a local stand-in server three ways and reports
+throughput and peak RSS growth (sampled with psutil while the transfer
+runs):
+
+* ``send_http`` (the buffered path: the whole body decoded into a str),
+* ``download`` streaming raw chunks to a file,
+* ``download`` with chunked encryption through ``CryptoEngine``.
+
+The buffered path is only run at ``BUFFERED_SIZE`` since its memory grows
+with the body; the streaming paths use ``SIZE``.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_legacy_stream
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+
+from interconnect.legacy_bridge import LegacyBridge
+from security.crypto_engine import CryptoEngine
+
+SIZE = 1024 * 1024 * 1024
+BUFFERED_SIZE = 128 * 1024 * 1024
+SERVER_CHUNK = b"\x5a" * (1024 * 1024)
+CHUNK_SIZE = 256 * 1024
+SAMPLE_INTERVAL = 0.01
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        size = int(self.path.rsplit("/", 1)[1])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        view = memoryview(SERVER_CHUNK)
+        while size > 0:
+            self.wfile.write(view[:size])
+            size -= len(SERVER_CHUNK)
+
+    def log_message(self, *args):
+        pass
+
+
+class _PeakRSS:
+    """Samples the process RSS in a background thread and keeps the peak."""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.baseline = self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def _run(label, size, transfer):
+    with _PeakRSS() as rss:
+        started = time.perf_counter()
+        ok = transfer()
+        elapsed = time.perf_counter() - started
+    assert ok, f"{label} failed"
+    print(
+        f"{label:<28} {size / 2**20:>6.0f} MiB   {size / 2**20 / elapsed:>7.1f} MiB/s   "
+        f"peak RSS +{(rss.peak - rss.baseline) / 2**20:>7.1f} MiB"
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    bridge = LegacyBridge(crypto=CryptoEngine())
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "body.bin")
+            _run("download (streamed)", BUFFERED_SIZE,
+                 lambda: bridge.download(f"{base}/blob/{BUFFERED_SIZE}", path, chunk_size=CHUNK_SIZE))
+            _run("download (streamed)", SIZE,
+                 lambda: bridge.download(f"{base}/blob/{SIZE}", path, chunk_size=CHUNK_SIZE))
+            _run("download (encrypted)", SIZE,
+                 lambda: bridge.download(f"{base}/blob/{SIZE}", path, chunk_size=CHUNK_SIZE, encrypt=True))
+            # Last: freed heap is not always returned to the OS, which would hide later peaks
+            _run("send_http (buffered)", BUFFERED_SIZE,
+                 lambda: bridge.send_http(f"{base}/blob/{BUFFERED_SIZE}") is not None)
+    finally:
+        bridge.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
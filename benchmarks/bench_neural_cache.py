@@ -0,0 +1,64 @@
+"""
+NeuralNet Prediction Cache Benchmark
+====================================
+
+Replays a Zipf-distributed query workload (with interleaved reinforcement)
+against ``NeuralNet.predict`` with the prediction cache disabled and at a
+few sizes, reporting throughput, hit rate and invalidation counts.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_neural_cache
+"""
+
+import logging
+import random
+import time
+
+import numpy as np
+
+from interconnect.neural_net import NeuralNet
+
+PATTERNS = 100_000
+DISTINCT_QUERIES = 20_000
+QUERIES = 100_000
+ZIPF_S = 1.1
+REINFORCE_EVERY = 50
+CACHE_SIZES = [0, 1_024, 8_192]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(8)
+    words = [f"w{i}" for i in range(2_000)] + ["user", "login", "stream"]
+    patterns = list({":".join(rng.choice(words) for _ in range(3)) for _ in range(PATTERNS)})
+
+    universe = []
+    for _ in range(DISTINCT_QUERIES):
+        p = rng.choice(patterns)
+        i = rng.randrange(len(p) - 2)
+        universe.append(p[i:i + rng.randint(3, 8)])
+    ranks = np.random.default_rng(8).zipf(ZIPF_S, QUERIES * 2)
+    queries = [universe[r - 1] for r in ranks[ranks <= DISTINCT_QUERIES][:QUERIES]]
+    events = [(rng.choice(patterns), rng.random() < 0.5) for _ in range(QUERIES // REINFORCE_EVERY)]
+
+    print(f"patterns={len(patterns):,}, queries={len(queries):,} over {len(set(queries)):,} distinct, "
+          f"1 reinforce per {REINFORCE_EVERY}")
+    print(f"{'cache':>6} {'queries/s':>11} {'hit rate':>9} {'evictions':>10} {'invalidated':>12}")
+    for size in CACHE_SIZES:
+        np.random.seed(0)
+        nn = NeuralNet(cache_size=size)
+        nn.learn_batch(patterns)
+        t0 = time.perf_counter()
+        for i, q in enumerate(queries):
+            nn.predict(q)
+            if i % REINFORCE_EVERY == 0:
+                nn.reinforce(*events[i // REINFORCE_EVERY])
+        elapsed = time.perf_counter() - t0
+        stats = nn.cache.stats
+        print(f"{size:>6} {len(queries) / elapsed:>11,.0f} {stats['hits'] / len(queries):>8.1%} "
+              f"{stats['evictions']:>10,} {stats['invalidations']:>12,}")
+
+
+if __name__ == "__main__":
+    main()
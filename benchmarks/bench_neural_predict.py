@@ -0,0 +1,61 @@
+"""
+NeuralNet Prediction Benchmark
+==============================
+
+Learns a large store of synthetic ``a:b:c`` patterns and compares the
+original linear ``in`` scan against the substring index for queries of
+increasing selectivity, plus incremental ``learn_pattern`` cost.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_neural_predict
+"""
+
+import logging
+import random
+import time
+
+from interconnect.neural_net import NeuralNet
+
+PATTERNS = 500_000
+VOCABULARY = 5_000
+QUERIES = ["user", ":u17", "stream:w42", "w3:w7", "w1234:w99:w5"]
+LINEAR_REPEAT = 3
+INDEX_REPEAT = 200
+
+
+def _linear(nn: NeuralNet, query: str) -> str:
+    """The original scan, kept here for comparison."""
+    matches = [p for p in nn.patterns if query in p]
+    return max(matches, key=lambda x: nn.weights.get(x, 0)) if matches else ""
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(11)
+    words = ["user", "stream", "login", "sync"] + [f"w{i}" for i in range(VOCABULARY)]
+    nn = NeuralNet(cache_size=0)  # measure the index, not the prediction cache
+
+    t0 = time.perf_counter()
+    while len(nn.patterns) < PATTERNS:
+        nn.learn_pattern(":".join(rng.choice(words) for _ in range(3)) + f":u{rng.randrange(100)}")
+    learn = time.perf_counter() - t0
+    print(f"patterns={len(nn.patterns):,}, learn {learn / PATTERNS * 1e6:.1f} us/pattern")
+
+    print(f"{'query':>14} {'matches':>8} {'linear':>12} {'indexed':>12} {'speed-up':>9}")
+    for query in QUERIES:
+        matches = sum(1 for _ in nn.index.search(query))
+        t0 = time.perf_counter()
+        for _ in range(LINEAR_REPEAT):
+            _linear(nn, query)
+        linear = (time.perf_counter() - t0) / LINEAR_REPEAT
+        t0 = time.perf_counter()
+        for _ in range(INDEX_REPEAT):
+            nn.predict_top(query, 1)
+        indexed = (time.perf_counter() - t0) / INDEX_REPEAT
+        print(f"{query:>14} {matches:>8,} {linear * 1e3:>9.2f} ms {indexed * 1e3:>9.3f} ms "
+              f"{linear / indexed:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+NeuralNet Pattern Store Benchmark
+=================================
+
+Measures pattern-store memory per pattern (the original list + weight
+dict, a list + id dict + float32 layout, and the hash-sorted
+``PatternIds`` + float32 store) and replays 10M reinforcement events
+through ``reinforce_batch`` against the per-event ``reinforce`` loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_neural_store
+"""
+
+import logging
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from interconnect.neural_net import NeuralNet, PatternIds
+
+PATTERNS = 200_000
+EVENTS = 10_000_000
+BATCH = 1_000_000
+STRING_EVENTS = 1_000_000
+LOOP_EVENTS = 200_000
+
+
+def _traced(fn) -> int:
+    tracemalloc.start()
+    kept = fn()  # noqa: F841 (held while measuring)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    names = [f"svc{i % 97}:user{i}:route" for i in range(PATTERNS)]
+
+    def legacy():
+        patterns, weights = [], {}
+        for p in names:
+            patterns.append(p)
+            weights[p] = random.uniform(0.5, 1.0)
+        return patterns, weights
+
+    def id_dict():
+        return list(names), {p: i for i, p in enumerate(names)}, np.zeros(PATTERNS, np.float32)
+
+    def store():
+        patterns = []
+        ids = PatternIds(patterns)
+        for i, p in enumerate(names):
+            patterns.append(p)
+            ids[p] = i
+        ids.compact()
+        return patterns, ids, np.zeros(PATTERNS, np.float32)
+
+    layouts = [("list + weight dict", _traced(legacy)),
+               ("list + id dict + float32", _traced(id_dict)),
+               ("list + PatternIds + float32", _traced(store))]
+    nn = NeuralNet()
+    t0 = time.perf_counter()
+    nn.learn_batch(names)
+    learn = time.perf_counter() - t0
+    print(f"patterns={PATTERNS:,}, learn_batch {learn:.2f} s (includes substring index)")
+    for label, size in layouts:
+        print(f"store    : {label:<30} {size / PATTERNS:6.1f} B/pattern (excluding strings)")
+
+    rng = np.random.default_rng(2)
+    t0 = time.perf_counter()
+    for _ in range(EVENTS // BATCH):
+        ids = rng.integers(0, PATTERNS, BATCH)
+        nn.reinforce_batch(ids, rng.random(BATCH) < 0.5)
+    replay = time.perf_counter() - t0
+    print(f"replay   : {EVENTS:,} id events in {replay:.2f} s ({EVENTS / replay / 1e6:.1f} M events/s)")
+
+    picks = [names[i] for i in rng.integers(0, PATTERNS, STRING_EVENTS)]
+    outcomes = rng.random(STRING_EVENTS) < 0.5
+    t0 = time.perf_counter()
+    nn.reinforce_batch(picks, outcomes)
+    strings = time.perf_counter() - t0
+    print(f"replay   : {STRING_EVENTS:,} string events in {strings:.2f} s")
+
+    t0 = time.perf_counter()
+    for p, ok in zip(picks[:LOOP_EVENTS], outcomes[:LOOP_EVENTS].tolist()):
+        nn.reinforce(p, ok)
+    loop = time.perf_counter() - t0
+    print(f"reinforce: per-event loop {LOOP_EVENTS / loop / 1e6:.2f} M events/s "
+          f"(~{EVENTS / LOOP_EVENTS * loop:.0f} s for {EVENTS:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+QuantumInternet Entanglement Graph Benchmark
+============================================
+
+Loads 100k nodes and 1M entanglement links, then reports pair-lookup
+latency, repeater-chain route search (cold and cached) and the cost of
+link removal with route invalidation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_quantum_graph
+"""
+
+import random
+import statistics
+import time
+
+from interconnect.quantum_internet import EntanglementGraph
+
+NODES = 100_000
+LINKS = 1_000_000
+LOOKUPS = 1_000_000
+ROUTES = 2_000
+
+
+def main() -> None:
+    rng = random.Random(5)
+    names = [f"q{i}" for i in range(NODES)]
+    graph = EntanglementGraph(max_routes=ROUTES)
+
+    t0 = time.perf_counter()
+    while len(graph) < LINKS:
+        graph.add(names[rng.randrange(NODES)], names[rng.randrange(NODES)])
+    build = time.perf_counter() - t0
+
+    probes = [(rng.choice(names), rng.choice(names)) for _ in range(LOOKUPS)]
+    t0 = time.perf_counter()
+    for a, b in probes:
+        graph.linked(a, b)
+    lookup = (time.perf_counter() - t0) / LOOKUPS
+
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(ROUTES)]
+    t0 = time.perf_counter()
+    hops = [len(graph.route(a, b) or ()) - 1 for a, b in pairs]
+    cold = (time.perf_counter() - t0) / ROUTES
+
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        graph.route(a, b)
+    cached = (time.perf_counter() - t0) / ROUTES
+
+    used = [graph.route(a, b) for a, b in pairs[:100]]
+    t0 = time.perf_counter()
+    for path in used:
+        graph.remove(path[0], path[1])
+    removal = (time.perf_counter() - t0) / len(used)
+
+    print(f"nodes={NODES:,} links={len(graph):,}")
+    print(f"build            : {build:8.2f} s")
+    print(f"pair lookup      : {lookup * 1e6:8.3f} us")
+    print(f"route (cold)     : {cold * 1e3:8.3f} ms, mean {statistics.mean(hops):.2f} swaps")
+    print(f"route (cached)   : {cached * 1e6:8.3f} us")
+    print(f"link removal     : {removal * 1e6:8.3f} us, "
+          f"{graph.stats['routes_invalidated']} routes invalidated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Topology Bulk Load Benchmark
+============================
+
+Writes a 1M-node quantum topology (plus 1M entanglement links) to JSONL
+and CSV, bulk-loads it, and compares against the per-call public API on
+a 100k-node slice.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_topology_bulk
+"""
+
+import logging
+import os
+import random
+import tempfile
+import time
+
+from interconnect.quantum_internet import QuantumInternet
+from utils.topology import export_topology, load_topology, write_records
+
+NODES = 1_000_000
+LINKS = 1_000_000
+API_SLICE = 100_000
+
+
+def _records(rng: random.Random):
+    for i in range(NODES):
+        yield "quantum", "node", (f"q{i}",)
+    for _ in range(LINKS):
+        yield "quantum", "entangle", (f"q{rng.randrange(NODES)}", f"q{rng.randrange(NODES)}")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ("jsonl", "csv"):
+            path = os.path.join(tmp, f"topology.{ext}")
+            write_records(path, _records(random.Random(1)))
+
+            qi = QuantumInternet()
+            t0 = time.perf_counter()
+            counts = load_topology(path, quantum=qi)
+            load = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            export_topology(os.path.join(tmp, f"export.{ext}"), quantum=qi)
+            export = time.perf_counter() - t0
+            print(f"{ext:>5}: load {load:6.2f} s, export {export:6.2f} s, "
+                  f"{os.path.getsize(path) / 2**20:6.1f} MiB, {counts}")
+
+        # Per-call API with the CLI's INFO file logging, written to a scratch file
+        logging.basicConfig(
+            filename=os.path.join(tmp, "infinity.log"),
+            level=logging.INFO,
+            format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+        )
+        rng = random.Random(1)
+        qi = QuantumInternet()
+        t0 = time.perf_counter()
+        for i in range(API_SLICE):
+            qi.add_node(f"q{i}")
+        for _ in range(API_SLICE):
+            qi.entangle(f"q{rng.randrange(API_SLICE)}", f"q{rng.randrange(API_SLICE)}")
+        api = time.perf_counter() - t0
+        print(f"  api: {api:6.2f} s for {API_SLICE:,} nodes + links "
+              f"(~{api * NODES / API_SLICE:.0f} s extrapolated to {NODES:,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,61 +21,329 @@ Author: Mohamed Orhan Zeinel
 """
 
 import logging
-import random
-from typing import Dict, List, Any
+import time
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
+# channel → sample rate (Hz)
+DEFAULT_CHANNELS: Dict[str, float] = {"eeg": 256.0, "ecg": 256.0}
+
+# EEG band → (low, high) Hz
+BANDS: Dict[str, tuple] = {"theta": (4.0, 8.0), "alpha": (8.0, 13.0), "beta": (13.0, 30.0)}
+FEATURES = ("theta", "alpha", "beta", "hr")
+UNITS = {"theta": "µV²", "alpha": "µV²", "beta": "µV²", "hr": "bpm"}
+
+
+class SignalStore:
+    """
+    Columnar ring buffers for sampled bio-signals.
+
+    Each channel owns one float32 matrix with a row per user and
+    ``2 * capacity`` columns, where ``capacity = seconds * rate``. Every
+    sample is written at its ring position and mirrored ``capacity``
+    columns later, so the latest ``n <= capacity`` samples are always one
+    contiguous slice: windows are zero-copy read-only views. Timestamps
+    are derived from the channel rate and the time of each user's latest
+    sample, so they cost no memory per sample. Memory is fixed per user.
+    """
+
+    def __init__(self, channels: Optional[Dict[str, float]] = None, seconds: float = 8.0, users: int = 64):
+        self.rates = dict(channels or DEFAULT_CHANNELS)
+        self.capacity = {ch: int(rate * seconds) for ch, rate in self.rates.items()}
+        self.slots: Dict[str, int] = {}
+        self._data = {ch: np.zeros((users, 2 * cap), dtype=np.float32) for ch, cap in self.capacity.items()}
+        self._written = {ch: np.zeros(users, dtype=np.int64) for ch in self.rates}
+        self._last_time = {ch: np.zeros(users, dtype=np.float64) for ch in self.rates}
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def add_user(self, user_id: str) -> int:
+        """Reserve a row for ``user_id`` (idempotent); returns the row."""
+        row = self.slots.get(user_id)
+        if row is not None:
+            return row
+        row = self.slots[user_id] = len(self.slots)
+        if row >= len(self._written[next(iter(self.rates))]):
+            for ch in self.rates:
+                self._data[ch] = np.concatenate([self._data[ch], np.zeros_like(self._data[ch])])
+                self._written[ch] = np.concatenate([self._written[ch], np.zeros_like(self._written[ch])])
+                self._last_time[ch] = np.concatenate([self._last_time[ch], np.zeros_like(self._last_time[ch])])
+        return row
+
+    def ingest(self, user_id: str, channel: str, samples: Sequence[float],
+               timestamp: Optional[float] = None) -> int:
+        """
+        Append a block of samples; returns how many were stored.
+
+        ``timestamp`` is the time of the block's last sample; by default
+        the clock advances by ``len(samples) / rate`` (starting from now).
+        """
+        row = self.slots[user_id]
+        block = np.asarray(samples, dtype=np.float32).ravel()
+        cap = self.capacity[channel]
+        if len(block) > cap:
+            block = block[-cap:]
+        n = len(block)
+        data = self._data[channel][row]
+        written = self._written[channel]
+        total = int(written[row])
+        pos = total % cap
+        first = min(n, cap - pos)
+        data[pos:pos + first] = block[:first]
+        data[pos + cap:pos + cap + first] = block[:first]
+        if n > first:
+            data[:n - first] = block[first:]
+            data[cap:cap + n - first] = block[first:]
+        written[row] = total + n
+        last = self._last_time[channel]
+        if timestamp is None:
+            previous = float(last[row])
+            timestamp = (previous or time.time() - n / self.rates[channel]) + n / self.rates[channel]
+        last[row] = timestamp
+        return n
+
+    def ingest_many(self, channel: str, user_ids: Sequence[str], blocks: np.ndarray,
+                    timestamp: Optional[float] = None) -> int:
+        """Append one equal-length block per (distinct) user, rows of ``blocks``, in one write."""
+        rows = np.fromiter((self.slots[u] for u in user_ids), dtype=np.int64, count=len(user_ids))
+        blocks = np.asarray(blocks, dtype=np.float32)
+        cap = self.capacity[channel]
+        if blocks.shape[1] > cap:
+            blocks = blocks[:, -cap:]
+        n = blocks.shape[1]
+        written = self._written[channel]
+        cols = (written[rows] % cap)[:, None] + np.arange(n)
+        cols %= cap
+        data = self._data[channel]
+        data[rows[:, None], cols] = blocks
+        data[rows[:, None], cols + cap] = blocks
+        written[rows] += n
+        last = self._last_time[channel]
+        if timestamp is None:
+            start = np.where(last[rows] > 0, last[rows], time.time() - n / self.rates[channel])
+            last[rows] = start + n / self.rates[channel]
+        else:
+            last[rows] = timestamp
+        return n * len(rows)
+
+    def totals(self, channel: str) -> np.ndarray:
+        """Samples ever written per user row (read-only view)."""
+        view = self._written[channel][:len(self.slots)]
+        view.flags.writeable = False
+        return view
+
+    def windows(self, channel: str, rows: np.ndarray, n: int) -> np.ndarray:
+        """Latest ``n`` samples of many rows gathered into one ``(rows, n)`` array."""
+        cap = self.capacity[channel]
+        end = self._written[channel][rows] % cap + cap
+        cols = end[:, None] - n + np.arange(n)
+        return self._data[channel][rows[:, None], cols]
+
+    def count(self, user_id: str, channel: str) -> int:
+        """Samples currently held (at most the channel capacity)."""
+        return int(min(self._written[channel][self.slots[user_id]], self.capacity[channel]))
+
+    def window(self, user_id: str, channel: str, n: Optional[int] = None) -> np.ndarray:
+        """Zero-copy read-only view of the latest ``n`` samples, oldest first."""
+        row = self.slots[user_id]
+        cap = self.capacity[channel]
+        held = self.count(user_id, channel)
+        n = held if n is None else min(n, held)
+        end = int(self._written[channel][row] % cap) + cap
+        view = self._data[channel][row, end - n:end]
+        view.flags.writeable = False
+        return view
+
+    def timestamps(self, user_id: str, channel: str, n: Optional[int] = None) -> np.ndarray:
+        """Timestamps matching :meth:`window` (derived from the sample rate)."""
+        held = self.count(user_id, channel)
+        n = held if n is None else min(n, held)
+        last = self._last_time[channel][self.slots[user_id]]
+        return last - np.arange(n - 1, -1, -1) / self.rates[channel]
+
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self._data.values())
+
+
+class FeatureExtractor:
+    """
+    Streaming, batched feature stage over a :class:`SignalStore`.
+
+    Every ``hop_seconds`` of new data, a user's EEG band powers (theta,
+    alpha, beta) are re-estimated with Welch's method: Hann-windowed,
+    50%-overlapping one-second segments of the latest ``window_seconds``,
+    for all due users in one ``rfft`` call. Heart rate comes from the ECG
+    channel's autocorrelation (computed through the same FFT machinery,
+    after decimating to ~64 Hz) over ``ecg_seconds``, taking the strongest
+    lag between 40 and 200 bpm with a parabolic sub-sample refinement.
+    Results are cached in ``values`` (one float32 row per user, NaN until
+    enough data has arrived).
+    """
+
+    def __init__(self, store: SignalStore, eeg_channel: str = "eeg", ecg_channel: str = "ecg",
+                 window_seconds: float = 2.0, ecg_seconds: float = 5.0, hop_seconds: float = 0.25,
+                 chunk_users: int = 1024):
+        self.store = store
+        self.eeg_channel = eeg_channel
+        self.ecg_channel = ecg_channel
+        self.window_seconds = window_seconds
+        self.ecg_seconds = ecg_seconds
+        self.hop_seconds = hop_seconds
+        self.chunk_users = chunk_users
+        self.values = np.full((0, len(FEATURES)), np.nan, dtype=np.float32)
+        self._computed_at: Dict[str, np.ndarray] = {}
+
+    def value(self, user_id: str, feature: str) -> float:
+        row = self.store.slots[user_id]
+        return float(self.values[row, FEATURES.index(feature)]) if row < len(self.values) else float("nan")
+
+    def update(self) -> int:
+        """Refresh every user with a hop's worth of new samples; returns rows updated."""
+        users = len(self.store)
+        if len(self.values) < users:
+            grown = np.full((users, len(FEATURES)), np.nan, dtype=np.float32)
+            grown[:len(self.values)] = self.values
+            self.values = grown
+        updated = 0
+        if self.eeg_channel in self.store.rates:
+            updated += self._update(self.eeg_channel, self.window_seconds, self._band_powers, slice(0, 3))
+        if self.ecg_channel in self.store.rates:
+            updated += self._update(self.ecg_channel, self.ecg_seconds, self._heart_rate, slice(3, 4))
+        return updated
+
+    def _update(self, channel: str, seconds: float, compute, columns: slice) -> int:
+        store, rate = self.store, self.store.rates[channel]
+        n = min(int(seconds * rate), store.capacity[channel])
+        written = store.totals(channel)
+        done = self._computed_at.get(channel)
+        if done is None or len(done) < len(written):
+            grown = np.full(len(written), -(1 << 62), dtype=np.int64)
+            if done is not None:
+                grown[:len(done)] = done
+            done = self._computed_at[channel] = grown
+        due = np.flatnonzero((written >= n) & (written - done >= int(self.hop_seconds * rate)))
+        for start in range(0, len(due), self.chunk_users):
+            rows = due[start:start + self.chunk_users]
+            self.values[rows, columns] = compute(store.windows(channel, rows, n), rate)
+            done[rows] = written[rows]
+        return len(due)
+
+    @staticmethod
+    def _band_powers(x: np.ndarray, rate: float) -> np.ndarray:
+        seg = int(rate)
+        if x.shape[1] < seg:
+            seg = x.shape[1]
+        segments = sliding_window_view(x, seg, axis=1)[:, ::max(1, seg // 2)]
+        segments = segments - segments.mean(axis=2, keepdims=True)
+        taper = np.hanning(seg).astype(np.float32)
+        spectrum = np.abs(np.fft.rfft(segments * taper, axis=2)) ** 2
+        psd = spectrum.mean(axis=1) * (2.0 / (rate * (taper ** 2).sum()))
+        freqs = np.fft.rfftfreq(seg, 1.0 / rate)
+        df = freqs[1] - freqs[0]
+        return np.stack([psd[:, (freqs >= lo) & (freqs < hi)].sum(axis=1) * df
+                         for lo, hi in BANDS.values()], axis=1)
+
+    @staticmethod
+    def _heart_rate(x: np.ndarray, rate: float) -> np.ndarray:
+        # Block-average down to ~64 Hz; the parabolic peak fit below keeps
+        # sub-sample lag resolution, so HR accuracy is unaffected.
+        factor = max(1, int(rate // 64))
+        if factor > 1:
+            x = x[:, :x.shape[1] - x.shape[1] % factor].reshape(len(x), -1, factor).mean(axis=2)
+            rate /= factor
+        x = x - x.mean(axis=1, keepdims=True)
+        n = x.shape[1]
+        spectrum = np.fft.rfft(x, 2 * n, axis=1)
+        acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, axis=1)[:, :n]
+        lo, hi = int(rate * 60 / 200), min(n - 2, int(rate * 60 / 40))
+        lag = lo + np.argmax(acf[:, lo:hi + 1], axis=1)
+        rows = np.arange(len(x))
+        left, peak, right = acf[rows, lag - 1], acf[rows, lag], acf[rows, lag + 1]
+        curve = left - 2 * peak + right
+        shift = np.where(curve < 0, 0.5 * (left - right) / np.where(curve < 0, curve, -1), 0.0)
+        bpm = 60.0 * rate / (lag + shift)
+        periodic = peak > 0.3 * np.maximum(acf[:, 0], 1e-12)
+        return np.where(periodic, bpm, np.nan)[:, None]
+
 
 class BioNet:
     """
     BioNet: A biological interface simulator for Internet ∞.
-    It allows registration of biological IDs and simulates
-    signals like brainwaves or vital signs.
+    It allows registration of biological IDs, ingests sampled
+    signals like brainwaves or vital signs, and derives features.
     """
 
-    def __init__(self, name: str = "BioNet"):
+    def __init__(self, name: str = "BioNet", channels: Optional[Dict[str, float]] = None, seconds: float = 8.0,
+                 hop_seconds: float = 0.25):
         self.name = name
         self.bio_ids: Dict[str, str] = {}       # user_id → signal_hash
-        self.signals: Dict[str, List[str]] = {} # user_id → list of signals
+        self.store = SignalStore(channels, seconds)  # user_id/channel → sampled time series
+        self.features = FeatureExtractor(self.store, hop_seconds=hop_seconds)
         logger.info(f"🧬 {self.name} initialized")
 
     def register_bio_id(self, user_id: str, signal_hash: str) -> bool:
         """Register a biological ID for a user."""
         if user_id not in self.bio_ids:
             self.bio_ids[user_id] = signal_hash
-            # Generate synthetic biological signals
-            self.signals[user_id] = [
-                f"theta:{random.randint(4,7)}Hz",
-                f"alpha:{random.randint(8,12)}Hz",
-                f"beta:{random.randint(13,30)}Hz",
-                f"hr:{random.randint(60,100)}bpm"
-            ]
+            self.store.add_user(user_id)
             logger.info(f"🧠 Bio-ID registered: {user_id} → {signal_hash[:8]}...")
             return True
         logger.warning(f"⚠️ Bio-ID already exists: {user_id}")
         return False
 
+    def ingest(self, user_id: str, channel: str, samples: Sequence[float],
+               timestamp: Optional[float] = None) -> int:
+        """Append a block of raw samples for a user's channel; returns samples stored."""
+        if user_id not in self.bio_ids:
+            logger.error(f"❌ No bio-ID registered for user: {user_id}")
+            return 0
+        if channel not in self.store.rates:
+            logger.error(f"❌ Unknown signal channel: {channel}")
+            return 0
+        return self.store.ingest(user_id, channel, samples, timestamp)
+
+    def window(self, user_id: str, channel: str, n: Optional[int] = None) -> np.ndarray:
+        """Latest ``n`` samples of a user's channel as a zero-copy view."""
+        return self.store.window(user_id, channel, n)
+
+    def update_features(self) -> int:
+        """Recompute cached features for users with new data; returns rows updated."""
+        updated = self.features.update()
+        logger.debug(f"🧪 BioNet features refreshed for {updated} channel windows")
+        return updated
+
     def get_biological_signal(self, user_id: str) -> List[str]:
-        """Retrieve biological signals for a registered user."""
-        if user_id not in self.signals:
+        """Retrieve the latest computed signal features for a registered user."""
+        if user_id not in self.bio_ids:
             logger.error(f"❌ No signals found for user: {user_id}")
             return []
-        signal_data = self.signals[user_id]
+        signal_data = []
+        for feature in FEATURES:
+            value = self.features.value(user_id, feature)
+            if value == value:  # skip NaN (not enough data yet)
+                signal_data.append(f"{feature}:{value:.2f}{UNITS[feature]}")
         logger.info(f"📡 BioNet signals for {user_id}: {signal_data}")
         return signal_data
 
     def map_signal_to_network(self, user_id: str, signal_type: str) -> Dict[str, Any]:
-        """Map a biological signal into a simulated network packet."""
-        signals = self.get_biological_signal(user_id)
-        selected = [s for s in signals if s.startswith(signal_type)]
-        if not selected:
+        """Map a cached biological feature into a simulated network packet."""
+        if user_id not in self.bio_ids or signal_type not in FEATURES:
             logger.warning(f"⚠️ Signal type {signal_type} not found for {user_id}")
             return {"status": "error", "reason": "signal not found"}
+        value = self.features.value(user_id, signal_type)
+        if value != value:
+            logger.warning(f"⚠️ Signal {signal_type} not yet available for {user_id}")
+            return {"status": "error", "reason": "signal not available"}
 
         packet = {
             "user_id": user_id,
-            "signal": selected[0],
+            "signal": f"{signal_type}:{value:.2f}{UNITS[signal_type]}",
+            "value": value,
             "mapped_to": f"packet::{signal_type}::{user_id}",
         }
         logger.info(f"🔗 Signal mapped to network: {packet}")
@@ -85,5 +353,7 @@ class BioNet:
         """Return the current state of registered users and signals."""
         return {
             "bio_ids": list(self.bio_ids.keys()),
-            "signals": {uid: sigs for uid, sigs in self.signals.items()},
+            "features": list(FEATURES),
+            "channels": dict(self.store.rates),
+            "buffer_bytes": self.store.nbytes(),
         }
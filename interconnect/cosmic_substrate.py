@@ -20,51 +20,673 @@ Scientific Relevance:
 Author: Mohamed Orhan Zeinel  
 """
 
+import asyncio
 import logging
+import mmap
+import os
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple
+from urllib.parse import quote
+
+import numpy as np
 
 
 logger = logging.getLogger(__name__)
 
+# total length, timestamp, sender/target/message byte lengths, flags
+_RECORD = struct.Struct("<IdHHIB")
+_MAX_NAME = 0xFFFF
+_ENCRYPTED = 1
+
+
+class _Segment:
+    """One fixed-capacity, mmap-backed slice of a channel log."""
+
+    __slots__ = (
+        "base", "path", "mm", "size", "capacity", "count", "min_ts", "max_ts",
+        "created", "sparse_ts", "sparse_pos", "senders", "sealed",
+    )
+
+    def __init__(self, base: int, path: Optional[str], capacity: int):
+        self.base = base
+        self.path = path
+        self.capacity = capacity
+        self.size = 0
+        self.count = 0
+        self.min_ts = self.max_ts = 0.0
+        self.created = time.time()
+        self.sparse_ts = array("d")
+        self.sparse_pos = array("I")
+        self.senders: Dict[str, array] = {}
+        self.sealed = False
+        if path is None:
+            self.mm = mmap.mmap(-1, capacity)
+        else:
+            with open(path, "w+b") as f:
+                f.truncate(capacity)
+                self.mm = mmap.mmap(f.fileno(), capacity)
+
+    @classmethod
+    def open(cls, base: int, path: str, index_interval: int) -> "_Segment":
+        """Map an existing segment file read-only and rebuild its index."""
+        seg = cls.__new__(cls)
+        seg.base, seg.path, seg.sealed = base, path, True
+        seg.count, seg.size = 0, 0
+        seg.min_ts = seg.max_ts = 0.0
+        seg.sparse_ts, seg.sparse_pos, seg.senders = array("d"), array("I"), {}
+        with open(path, "rb") as f:
+            length = os.fstat(f.fileno()).st_size
+            seg.mm = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ) if length else None
+        seg.capacity = length
+        pos = 0
+        while pos + _RECORD.size <= length:
+            total, ts, slen, _, _, _ = _RECORD.unpack_from(seg.mm, pos)
+            if total == 0:
+                break
+            start = pos + _RECORD.size
+            seg._index(pos, ts, seg.mm[start:start + slen].decode("utf-8"), index_interval)
+            pos += total
+        seg.size = pos
+        seg.created = seg.min_ts
+        seg.unmap()
+        return seg
+
+    def _index(self, pos: int, ts: float, sender: str, index_interval: int) -> None:
+        if not self.count:
+            self.min_ts = ts
+        if self.count % index_interval == 0:
+            self.sparse_ts.append(ts)
+            self.sparse_pos.append(pos)
+        offsets = self.senders.get(sender)
+        if offsets is None:
+            offsets = self.senders[sender] = array("I")
+        offsets.append(pos)
+        self.max_ts = ts
+        self.count += 1
+
+    def seal(self) -> None:
+        """Trim a file-backed segment to its used size and unmap it until read."""
+        self.sealed = True
+        if self.path is None:
+            return
+        self.unmap()
+        with open(self.path, "r+b") as f:
+            f.truncate(self.size)
+        self.capacity = self.size
+
+    def map(self) -> Optional[mmap.mmap]:
+        """Map a sealed file-backed segment read-only if it is not mapped."""
+        if self.mm is None and self.path is not None and self.size:
+            with open(self.path, "rb") as f:
+                self.mm = mmap.mmap(f.fileno(), self.size, access=mmap.ACCESS_READ)
+        return self.mm
+
+    def unmap(self) -> None:
+        """Release the mapping (and its file descriptor) of a file-backed segment."""
+        if self.path is not None and self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+    def close(self, delete: bool = False) -> None:
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+        if delete and self.path is not None:
+            os.remove(self.path)
+
+
+class ChannelLog:
+    """
+    Append-only, segmented log of the pulses on one channel.
+
+    Records use a compact binary layout (``_RECORD`` header followed by
+    UTF-8 sender, target and message) and are written into fixed-capacity
+    segments that are memory-mapped, either over files in ``directory``
+    or anonymously when no directory is given. A segment rolls over when
+    full or older than ``segment_seconds``; whole sealed segments are then
+    dropped once the log exceeds ``retention_bytes`` or they are older than
+    ``retention_seconds``. Rolling and retention run on append and on
+    :meth:`expire`, which readers call too, so idle channels still age out.
+    Each segment keeps its time bounds, a sparse time index and per-sender
+    record offsets, so time-range and sender queries touch only the
+    records they return, and counts/sizes come from segment metadata alone.
+
+    Only the active segment stays mapped for writing. Sealed file-backed
+    segments are unmapped and remapped on demand, with at most
+    ``max_mapped`` of them kept open (LRU), which bounds the file
+    descriptors a long-lived log holds.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_bytes: int = 16 << 20,
+        segment_seconds: Optional[float] = 3600.0,
+        retention_bytes: Optional[int] = 1 << 30,
+        retention_seconds: Optional[float] = None,
+        index_interval: int = 64,
+        max_mapped: int = 8,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.retention_bytes = retention_bytes
+        self.retention_seconds = retention_seconds
+        self.index_interval = index_interval
+        self.max_mapped = max_mapped
+        self.segments: List[_Segment] = []
+        self._mapped: "OrderedDict[int, _Segment]" = OrderedDict()
+        self.next_offset = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".seg"):
+                    seg = _Segment.open(int(name[:-4]), os.path.join(directory, name), index_interval)
+                    self.segments.append(seg)
+                    self.next_offset = seg.base + seg.count
+
+    def __len__(self) -> int:
+        return sum(seg.count for seg in self.segments)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(seg.size for seg in self.segments)
+
+    def append(self, sender: str, message: str, target: str = "broadcast",
+               encrypted: bool = False, timestamp: Optional[float] = None) -> int:
+        """Append one pulse and return its log offset."""
+        s, t, m = sender.encode("utf-8"), target.encode("utf-8"), message.encode("utf-8")
+        if len(s) > _MAX_NAME or len(t) > _MAX_NAME:
+            raise ValueError(f"Pulse sender and target are limited to {_MAX_NAME} UTF-8 bytes")
+        total = _RECORD.size + len(s) + len(t) + len(m)
+        ts = time.time() if timestamp is None else timestamp
+
+        seg = self.segments[-1] if self.segments else None
+        if seg is not None:
+            ts = max(ts, seg.max_ts)  # keep each segment time-ordered for the sparse index
+        if (
+            seg is None
+            or seg.sealed
+            or seg.size + total > seg.capacity
+            or (self.segment_seconds is not None and ts - seg.created >= self.segment_seconds)
+        ):
+            seg = self._roll(max(total, self.segment_bytes))
+
+        pos = seg.size
+        _RECORD.pack_into(seg.mm, pos, total, ts, len(s), len(t), len(m), _ENCRYPTED if encrypted else 0)
+        start = pos + _RECORD.size
+        seg.mm[start:pos + total] = s + t + m
+        seg.size += total
+        seg._index(pos, ts, sender, self.index_interval)
+        self.next_offset += 1
+        return self.next_offset - 1
+
+    def read(self, since: Optional[float] = None, until: Optional[float] = None,
+             sender: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield records in ``[since, until]``, optionally from one sender only."""
+        self.expire()
+        lo = -float("inf") if since is None else since
+        hi = float("inf") if until is None else until
+        for seg in list(self.segments):
+            if not seg.count or seg.max_ts < lo or seg.min_ts > hi:
+                continue
+            # Records are time-ordered within a segment, so offsets are too
+            first = seg.sparse_pos[max(bisect_left(seg.sparse_ts, lo) - 1, 0)]
+            mm = self._map(seg)
+            if sender is not None:
+                offsets = seg.senders.get(sender, array("I"))
+                for k in range(bisect_left(offsets, first), len(offsets)):
+                    if mm.closed:  # evicted by another reader in the meantime
+                        mm = self._map(seg)
+                    record = self._decode(mm, offsets[k])
+                    if record["time"] > hi:
+                        break
+                    if record["time"] >= lo:
+                        yield self._public(record)
+                continue
+            pos = first
+            while pos < seg.size:
+                if mm.closed:
+                    mm = self._map(seg)
+                record = self._decode(mm, pos)
+                if record["time"] > hi:
+                    break
+                pos += record["length"]
+                if record["time"] >= lo:
+                    yield self._public(record)
+
+    def metadata(self) -> List[Dict[str, Any]]:
+        """Per-segment metadata (no records are read)."""
+        self.expire()
+        return [
+            {"base": seg.base, "records": seg.count, "bytes": seg.size,
+             "first": seg.min_ts, "last": seg.max_ts, "sealed": seg.sealed}
+            for seg in self.segments
+        ]
+
+    def expire(self) -> None:
+        """Roll an over-age active segment and apply retention, as append would."""
+        seg = self.segments[-1] if self.segments else None
+        if (
+            seg is not None
+            and not seg.sealed
+            and seg.count
+            and self.segment_seconds is not None
+            and time.time() - seg.created >= self.segment_seconds
+        ):
+            seg.seal()
+        self._enforce_retention()
+
+    def close(self) -> None:
+        for seg in self.segments:
+            if not seg.sealed:
+                seg.seal()
+            seg.close()
+        self.segments = []
+        self._mapped.clear()
+
+    def _roll(self, capacity: int) -> _Segment:
+        if self.segments and not self.segments[-1].sealed:
+            self.segments[-1].seal()
+        path = None
+        if self.directory is not None:
+            path = os.path.join(self.directory, f"{self.next_offset:020d}.seg")
+        seg = _Segment(self.next_offset, path, capacity)
+        self.segments.append(seg)
+        self._enforce_retention()
+        return seg
+
+    def _enforce_retention(self) -> None:
+        now = time.time()
+        # The active (unsealed) segment is never dropped
+        while self.segments and self.segments[0].sealed:
+            oldest = self.segments[0]
+            too_big = self.retention_bytes is not None and self.size_bytes > self.retention_bytes
+            too_old = self.retention_seconds is not None and now - oldest.max_ts > self.retention_seconds
+            if not (too_big or too_old):
+                break
+            self._mapped.pop(oldest.base, None)
+            self.segments.pop(0).close(delete=True)
+
+    def _map(self, seg: _Segment) -> mmap.mmap:
+        """Mapping of ``seg``, keeping at most ``max_mapped`` sealed files mapped."""
+        if seg.path is None or not seg.sealed:
+            return seg.mm
+        if seg.base in self._mapped:
+            self._mapped.move_to_end(seg.base)
+        else:
+            self._mapped[seg.base] = seg
+            while len(self._mapped) > max(self.max_mapped, 1):
+                self._mapped.popitem(last=False)[1].unmap()
+        return seg.map()
+
+    @staticmethod
+    def _decode(mm: mmap.mmap, pos: int) -> Dict[str, Any]:
+        total, ts, slen, tlen, mlen, flags = _RECORD.unpack_from(mm, pos)
+        start = pos + _RECORD.size
+        body = mm[start:start + slen + tlen + mlen]
+        return {
+            "length": total,
+            "time": ts,
+            "from": body[:slen].decode("utf-8"),
+            "to": body[slen:slen + tlen].decode("utf-8"),
+            "message": body[slen + tlen:].decode("utf-8"),
+            "encrypted": bool(flags & _ENCRYPTED),
+        }
+
+    @staticmethod
+    def _public(record: Dict[str, Any]) -> Dict[str, Any]:
+        record.pop("length")
+        record["timestamp"] = datetime.fromtimestamp(record.pop("time")).isoformat()
+        return record
+
+
+class TrustEngine:
+    """
+    EigenTrust-style global trust over the resonance graph.
+
+    Direct trust scores form a sparse, row-normalized matrix stored as
+    flat edge arrays (source, destination, weight). Global trust is its
+    stationary vector with a uniform teleport of ``damping``, computed by
+    power iteration where each step is one ``np.bincount`` sparse mat-vec.
+    Changes only mark the vector dirty; the next lookup re-converges from
+    the previous vector (warm start), which typically takes a handful of
+    iterations. Lookups in between are O(1) array reads, and
+    ``refresh_interval`` lets callers accept slightly stale scores to
+    batch bursts of changes into one recompute.
+
+    :meth:`personal_score` answers "how much does this source trust that
+    node": the same walk, but teleporting back to the source only
+    (personalized PageRank), so nodes with no trust path from the source
+    score 0. Per-source vectors are cached (LRU of ``max_sources``); an
+    edge change only marks them stale, and a stale vector is re-converged
+    from its previous value on its next lookup (also subject to
+    ``refresh_interval``), so one change never recomputes every source.
+    """
+
+    def __init__(self, damping: float = 0.15, tol: float = 1e-9, max_iter: int = 100,
+                 refresh_interval: float = 0.0, max_sources: int = 1024):
+        self.damping = damping
+        self.tol = tol
+        self.max_iter = max_iter
+        self.refresh_interval = refresh_interval
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._edges: Dict[Tuple[int, int], int] = {}
+        self._src = np.zeros(1024, dtype=np.int64)
+        self._dst = np.zeros(1024, dtype=np.int64)
+        self._weight = np.zeros(1024, dtype=np.float64)
+        self._trust = np.zeros(0)
+        self._scaled = np.zeros(0)
+        self._dirty = False
+        self._computed_at = 0.0
+        self.max_sources = max_sources
+        self._version = 0
+        # source -> [raw vector, scaled vector, edge version, computed at]
+        self._personal: "OrderedDict[int, list]" = OrderedDict()
+        self.stats: Dict[str, int] = {"recomputes": 0, "iterations": 0,
+                                      "personal_recomputes": 0, "personal_iterations": 0}
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def add_node(self, node: str) -> int:
+        """Register ``node`` and return its index."""
+        i = self.index.get(node)
+        if i is None:
+            i = self.index[node] = len(self.names)
+            self.names.append(node)
+            self._dirty = True
+        return i
+
+    def set_trust(self, node1: str, node2: str, score: float) -> None:
+        """Set the direct trust ``node1`` places in ``node2``."""
+        edge = (self.add_node(node1), self.add_node(node2))
+        pos = self._edges.get(edge)
+        if pos is None:
+            pos = self._edges[edge] = len(self._edges)
+            if pos == len(self._src):
+                self._src = np.resize(self._src, 2 * pos)
+                self._dst = np.resize(self._dst, 2 * pos)
+                self._weight = np.resize(self._weight, 2 * pos)
+            self._src[pos], self._dst[pos] = edge
+        self._weight[pos] = score
+        self._dirty = True
+        self._version += 1
+
+    def remove_trust(self, node1: str, node2: str) -> None:
+        """Drop a direct trust edge (kept as a zero-weight tombstone)."""
+        pos = self._edges.get((self.index.get(node1), self.index.get(node2)))
+        if pos is not None:
+            self._weight[pos] = 0.0
+            self._dirty = True
+            self._version += 1
+
+    def score(self, node: str) -> float:
+        """Global trust of ``node`` on the 0–100 scale (100 = most trusted)."""
+        if self._dirty and time.monotonic() - self._computed_at >= self.refresh_interval:
+            self.recompute()
+        i = self.index.get(node)
+        if i is None or i >= len(self._scaled):
+            return 0.0
+        return float(self._scaled[i])
+
+    def personal_score(self, source: str, node: str) -> float:
+        """
+        Trust ``source`` places in ``node`` on the 0–100 scale, where 100 is
+        the node ``source`` trusts most; 0 when no trust path leads there.
+        """
+        s, i = self.index.get(source), self.index.get(node)
+        if s is None or i is None or s == i:
+            return 0.0
+        entry = self._personal.get(s)
+        if entry is None or (entry[2] != self._version
+                             and time.monotonic() - entry[3] >= self.refresh_interval):
+            entry = self._personalize(s, entry[0] if entry is not None else None)
+        else:
+            self._personal.move_to_end(s)
+        scaled = entry[1]
+        return float(scaled[i]) if i < len(scaled) else 0.0
+
+    def _personalize(self, s: int, previous: Optional[np.ndarray] = None) -> list:
+        n = len(self.names)
+        src, dst, norm, dangling = self._matrix()
+        restart = np.zeros(n)
+        restart[s] = 1.0
+        trust = restart.copy()
+        if previous is not None:
+            # Warm start: nodes added since keep zero mass
+            trust[:len(previous)] = previous
+        for iteration in range(1, self.max_iter + 1):
+            spread = np.bincount(dst, weights=norm * trust[src], minlength=n)
+            # Mass that cannot move on (and the teleport) returns to the source
+            nxt = (1 - self.damping) * spread + ((1 - self.damping) * trust[dangling].sum() + self.damping) * restart
+            delta = np.abs(nxt - trust).sum()
+            trust = nxt
+            if delta < self.tol:
+                break
+        scaled = trust.copy()
+        scaled[s] = 0.0
+        top = scaled.max()
+        if top > 0:
+            scaled *= 100.0 / top
+        entry = self._personal[s] = [trust, scaled, self._version, time.monotonic()]
+        self._personal.move_to_end(s)
+        if len(self._personal) > self.max_sources:
+            self._personal.popitem(last=False)
+        self.stats["personal_recomputes"] += 1
+        self.stats["personal_iterations"] += iteration
+        return entry
+
+    def _matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Edge arrays with row-normalized weights, plus the dangling-node mask."""
+        n, m = len(self.names), len(self._edges)
+        src, dst, weight = self._src[:m], self._dst[:m], self._weight[:m]
+        out = np.bincount(src, weights=weight, minlength=n)
+        norm = np.divide(weight, out[src], out=np.zeros(m), where=out[src] > 0)
+        return src, dst, norm, out == 0
+
+    def recompute(self) -> None:
+        """Re-converge the global trust vector from the previous one."""
+        n = len(self.names)
+        if not n:
+            return
+        src, dst, norm, dangling = self._matrix()
+
+        trust = np.full(n, 1.0 / n)
+        k = len(self._trust)
+        if k:
+            trust[:k] = self._trust * (k / n)
+        teleport = self.damping / n
+        for iteration in range(1, self.max_iter + 1):
+            spread = np.bincount(dst, weights=norm * trust[src], minlength=n)
+            nxt = (1 - self.damping) * (spread + trust[dangling].sum() / n) + teleport
+            delta = np.abs(nxt - trust).sum()
+            trust = nxt
+            if delta < self.tol:
+                break
+
+        self._trust = trust
+        self._scaled = 100.0 * trust / trust.max()
+        self._dirty = False
+        self._computed_at = time.monotonic()
+        self.stats["recomputes"] += 1
+        self.stats["iterations"] += iteration
+
+
+class PulseMulticaster:
+    """
+    Fan-out of channel pulses into bounded per-node asyncio inboxes.
+
+    One payload object is shared by reference across all receivers and
+    delivered in batches of ``batch_size``, yielding to the event loop
+    between batches so large channels do not starve other tasks. When an
+    inbox is full, ``policy`` decides what happens:
+
+        - ``"drop_oldest"``: evict the oldest pulse (the reader lags but
+          always sees the freshest traffic).
+        - ``"drop_new"``: discard the incoming pulse for that reader.
+        - ``"block"``: apply backpressure (async delivery only). All full
+          inboxes of a pulse are waited on concurrently, for at most
+          ``block_timeout`` seconds in total; those still full then drop.
+    """
+
+    POLICIES = ("drop_oldest", "drop_new", "block")
+
+    def __init__(self, inbox_size: int = 256, policy: str = "drop_oldest",
+                 batch_size: int = 1024, block_timeout: float = 0.1):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown multicast policy: {policy}")
+        self.inbox_size = inbox_size
+        self.policy = policy
+        self.batch_size = batch_size
+        self.block_timeout = block_timeout
+        self.inboxes: Dict[str, asyncio.Queue] = {}
+        self.stats: Dict[str, int] = {"delivered": 0, "dropped": 0, "lagged": 0}
+
+    def inbox(self, node: str) -> asyncio.Queue:
+        """Return (creating on demand) the bounded inbox of ``node``."""
+        queue = self.inboxes.get(node)
+        if queue is None:
+            queue = self.inboxes[node] = asyncio.Queue(self.inbox_size)
+        return queue
+
+    def deliver_nowait(self, members: Iterable[str], payload: Dict[str, Any]) -> Dict[str, int]:
+        """Deliver without awaiting; ``block`` degrades to ``drop_new``."""
+        counts = {"delivered": 0, "dropped": 0, "lagged": 0}
+        for node in members:
+            self._offer(node, payload, counts)
+        self._account(counts)
+        return counts
+
+    async def deliver(self, members: Iterable[str], payload: Dict[str, Any]) -> Dict[str, int]:
+        """Deliver in batches, yielding to the loop and honouring backpressure."""
+        counts = {"delivered": 0, "dropped": 0, "lagged": 0}
+        members = list(members)
+        blocked: List[str] = []
+        for start in range(0, len(members), self.batch_size):
+            for node in members[start:start + self.batch_size]:
+                if not self._offer(node, payload, counts):
+                    blocked.append(node)
+            await asyncio.sleep(0)
+        if blocked:
+            waits = [asyncio.ensure_future(self.inbox(node).put(payload)) for node in blocked]
+            done, pending = await asyncio.wait(waits, timeout=self.block_timeout)
+            for wait in pending:
+                wait.cancel()
+            counts["delivered"] += len(done)
+            counts["dropped"] += len(pending)
+        self._account(counts)
+        return counts
+
+    def _offer(self, node: str, payload: Dict[str, Any], counts: Dict[str, int]) -> bool:
+        """Try a non-blocking put; returns False if the caller should block."""
+        queue = self.inbox(node)
+        if not queue.full():
+            queue.put_nowait(payload)
+            counts["delivered"] += 1
+            return True
+        if self.policy == "drop_oldest":
+            queue.get_nowait()
+            queue.put_nowait(payload)
+            counts["delivered"] += 1
+            counts["lagged"] += 1
+            return True
+        if self.policy == "block":
+            try:
+                asyncio.get_running_loop()
+                return False
+            except RuntimeError:
+                pass
+        counts["dropped"] += 1
+        return True
+
+    def _account(self, counts: Dict[str, int]) -> None:
+        for key, value in counts.items():
+            self.stats[key] += value
+
 
 class CosmicSubstrate:
     """
     CosmicSubstrate: A communication medium based on resonance fields.
     """
 
-    def __init__(self, name: str = "CosmicSubstrate"):
+    def __init__(self, name: str = "CosmicSubstrate", log_dir: Optional[str] = None,
+                 multicast: Optional[PulseMulticaster] = None):
         self.name = name
+        self.log_dir = log_dir
         self.nodes: Dict[str, Dict[str, Any]] = {}
         self.channels: Dict[str, Dict[str, Any]] = {}
         self.trust_scores: Dict[str, Dict[str, int]] = {}
-        self.channel_logs: Dict[str, List[Dict[str, Any]]] = {}
+        self.channel_logs: Dict[str, ChannelLog] = {}
+        self.trust_engine = TrustEngine()
+        self.multicast = multicast or PulseMulticaster()
+        self.log_sweep_interval = 60.0
+        self._next_sweep = time.monotonic() + self.log_sweep_interval
+        self._deliveries: Set[asyncio.Task] = set()
         logger.info(f"🌌 {self.name} initialized successfully.")
 
     def add_node(self, node_name: str) -> None:
         """Register a node in the cosmic substrate."""
         if node_name not in self.nodes:
-            self.nodes[node_name] = {"channels": [], "trust": 50}
-            self.trust_scores[node_name] = {}
+            self._register(node_name)
             logger.info(f"✨ Node registered: {node_name}")
 
+    def add_nodes(self, node_names: Iterable[str]) -> int:
+        """Bulk :meth:`add_node` without per-node logging; returns nodes added."""
+        added = 0
+        for node_name in node_names:
+            if node_name and node_name not in self.nodes:
+                self._register(node_name)
+                added += 1
+        return added
+
     def create_channel(self, channel_name: str) -> None:
         """Create a cosmic resonance channel."""
-        if channel_name not in self.channels:
-            self.channels[channel_name] = {"nodes": [], "encrypted": False}
-            self.channel_logs[channel_name] = []
+        if channel_name and channel_name not in self.channels:
+            self._open_channel(channel_name)
             logger.info(f"📡 Channel created: {channel_name}")
 
+    def create_channels(self, channel_names: Iterable[str]) -> int:
+        """Bulk :meth:`create_channel` without per-channel logging; returns channels created."""
+        created = 0
+        for channel_name in channel_names:
+            if channel_name and channel_name not in self.channels:
+                self._open_channel(channel_name)
+                created += 1
+        return created
+
+    def _register(self, node_name: str) -> None:
+        self.nodes[node_name] = {"channels": set(), "trust": 50}
+        self.trust_scores[node_name] = {}
+        self.trust_engine.add_node(node_name)
+
+    def _open_channel(self, channel_name: str) -> None:
+        self.channels[channel_name] = {"nodes": set(), "encrypted": False}
+        directory = os.path.join(self.log_dir, self._log_name(channel_name)) if self.log_dir else None
+        self.channel_logs[channel_name] = ChannelLog(directory)
+
+    @staticmethod
+    def _log_name(channel_name: str) -> str:
+        """Directory name of a channel's log, one per distinct channel name."""
+        name = quote(channel_name, safe="")
+        # quote() keeps dots, so "." and ".." would escape into log_dir itself
+        # or its parent; "%2E" never comes out of quote() for any other name
+        return name.replace(".", "%2E") if name.strip(".") == "" else name
+
     def join_channel(self, node_name: str, channel_name: str) -> bool:
         """Add a node to a resonance channel."""
         if node_name not in self.nodes or channel_name not in self.channels:
             logger.error("❌ Node or channel not found.")
             return False
 
-        if channel_name not in self.nodes[node_name]["channels"]:
-            self.nodes[node_name]["channels"].append(channel_name)
-        if node_name not in self.channels[channel_name]["nodes"]:
-            self.channels[channel_name]["nodes"].append(node_name)
+        self.nodes[node_name]["channels"].add(channel_name)
+        self.channels[channel_name]["nodes"].add(node_name)
 
         logger.info(f"🔗 Node {node_name} joined channel {channel_name}")
         return True
@@ -78,6 +700,8 @@ class CosmicSubstrate:
         trust = 85  # Default resonance trust level
         self.trust_scores[node1][node2] = trust
         self.trust_scores[node2][node1] = trust
+        self.trust_engine.set_trust(node1, node2, trust)
+        self.trust_engine.set_trust(node2, node1, trust)
         logger.info(f"🌈 Resonance established: {node1} ↔ {node2} (Trust={trust})")
         return True
 
@@ -89,14 +713,59 @@ class CosmicSubstrate:
         target: Optional[str] = None,
         encrypted: bool = False,
     ) -> Dict[str, Any]:
-        """Send a cosmic pulse (message)."""
+        """
+        Send a cosmic pulse (message).
+
+        Channel pulses are multicast to every other member's inbox. Inside a
+        running event loop delivery is scheduled as a task; otherwise it
+        happens immediately without blocking.
+        """
+        payload, members = self._emit(sender, message, channel, target, encrypted)
+        if members:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.multicast.deliver_nowait(members, payload)
+            else:
+                task = loop.create_task(self.multicast.deliver(members, payload))
+                self._deliveries.add(task)
+                task.add_done_callback(self._deliveries.discard)
+        return payload
+
+    async def send_pulse_async(
+        self,
+        sender: str,
+        message: str,
+        channel: Optional[str] = None,
+        target: Optional[str] = None,
+        encrypted: bool = False,
+    ) -> Dict[str, Any]:
+        """Like :meth:`send_pulse`, but waits until multicast delivery completes."""
+        payload, members = self._emit(sender, message, channel, target, encrypted)
+        if members:
+            await self.multicast.deliver(members, payload)
+        return payload
+
+    async def receive(self, node_name: str) -> Dict[str, Any]:
+        """Wait for the next pulse delivered to ``node_name``."""
+        return await self.multicast.inbox(node_name).get()
+
+    def _emit(
+        self,
+        sender: str,
+        message: str,
+        channel: Optional[str],
+        target: Optional[str],
+        encrypted: bool,
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """Validate, log and record a pulse; returns it with its multicast receivers."""
         if sender not in self.nodes:
-            return {"status": "error", "message": "Sender not found"}
+            return {"status": "error", "message": "Sender not found"}, []
 
         # Trust check
-        if target and self.trust_scores.get(sender, {}).get(target, 0) < 30:
+        if target and self.trust(sender, target) < 30:
             logger.warning(f"⚠️ Low trust: {sender} → {target}")
-            return {"status": "low_trust"}
+            return {"status": "low_trust"}, []
 
         payload = {
             "from": sender,
@@ -107,11 +776,59 @@ class CosmicSubstrate:
             "timestamp": datetime.now().isoformat(),
         }
 
+        members: List[str] = []
         if channel and channel in self.channel_logs:
-            self.channel_logs[channel].append(payload)
+            try:
+                self.channel_logs[channel].append(sender, message, payload["to"], encrypted)
+            except ValueError as e:
+                logger.error(f"❌ {e}")
+                return {"status": "error", "message": str(e)}, []
+            if time.monotonic() >= self._next_sweep:
+                self.expire_logs()
+            receivers = self.channels[channel]["nodes"]
+            if target:
+                members = [target] if target in receivers else []
+            else:
+                members = [node for node in receivers if node != sender]
 
         logger.info(f"✨ Cosmic pulse transmitted: {payload}")
-        return payload
+        return payload, members
+
+    def channel_history(
+        self,
+        channel_name: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sender: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return logged pulses of a channel within a time range / from a sender."""
+        log = self.channel_logs.get(channel_name)
+        if log is None:
+            return []
+        return list(log.read(
+            since.timestamp() if since else None,
+            until.timestamp() if until else None,
+            sender,
+        ))
+
+    def trust(self, sender: str, target: str) -> float:
+        """Direct trust if a resonance exists, otherwise trust propagated from the sender."""
+        direct = self.trust_scores.get(sender, {}).get(target)
+        if direct is not None:
+            return direct
+        return self.trust_engine.personal_score(sender, target)
+
+    def expire_logs(self) -> None:
+        """Apply rolling and retention to every channel log, idle ones included."""
+        for log in self.channel_logs.values():
+            log.expire()
+        self._next_sweep = time.monotonic() + self.log_sweep_interval
+
+    def close(self) -> None:
+        """Seal and unmap all channel logs."""
+        for log in self.channel_logs.values():
+            log.close()
+        logger.info(f"🌌 {self.name} closed.")
 
     def show_state(self) -> Dict[str, Any]:
         """Return the current state of the cosmic substrate."""
@@ -17,13 +17,450 @@ network traffic is not only fast and secure, but also **sustainable**.
 Author: Mohamed Orhan Zeinel  
 """
 
+import heapq
 import logging
+import math
+import sys
+from array import array
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from utils.ipv4 import ip_to_int, parse_cidr
 
 
 logger = logging.getLogger(__name__)
 
+_NO_MATCH = float("inf")
+
+# Per-packet status codes returned by GreenNet.send_packets
+PACKET_NO_ROUTE = 0
+PACKET_SENT = 1
+PACKET_BLOCKED = 2
+
+
+class FirewallMatcher:
+    """
+    Compiled matcher for GreenNet firewall rules.
+
+    Node-name targets are resolved with a single hash lookup, and all
+    content targets are folded into one Aho–Corasick automaton so a
+    payload is scanned exactly once regardless of the number of rules.
+    Each automaton state remembers the lowest rule index that ends there,
+    which preserves the original first-match-wins semantics.
+
+    New content targets can change the failure links of existing states,
+    so compiling them means one BFS over the whole trie (O(total target
+    length)). Added rules therefore wait in a pending list, checked with a
+    substring test only when no earlier rule matched, and are compiled by
+    the first match that finds ``relink_batch`` or more of them. Bulk adds
+    cost one rebuild; adds interleaved with traffic cost one rebuild per
+    ``relink_batch`` rules, and matching pays fewer than ``relink_batch``
+    substring tests on top of the automaton scan.
+    """
+
+    def __init__(self, relink_batch: int = 64):
+        self.relink_batch = relink_batch
+        self.rules: List[Dict[str, Any]] = []
+        self._node_index: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: List[float] = [_NO_MATCH]
+        self._best: List[float] = [_NO_MATCH]
+        # Indices of rules not yet compiled into the automaton, ascending
+        self._pending: List[int] = []
+        self.relinks = 0
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, rule: Dict[str, Any]) -> None:
+        """Register one rule; its content target is compiled with the next batch."""
+        index = len(self.rules)
+        self.rules.append(rule)
+        self._node_index.setdefault(rule["target"], index)
+        self._pending.append(index)
+
+    def sync(self, rules: List[Dict[str, Any]]) -> None:
+        """Bring the matcher up to date with an append-only rule list."""
+        compiled = len(self.rules)
+        if compiled > len(rules) or (compiled and rules[compiled - 1] is not self.rules[-1]):
+            self.__init__(self.relink_batch)
+            compiled = 0
+        for rule in rules[compiled:]:
+            self.add(rule)
+
+    def match(self, node: str, data: str) -> Optional[Dict[str, Any]]:
+        """Return the first rule matching ``node`` or ``data``, if any."""
+        pending = self._pending
+        if pending and (len(pending) >= self.relink_batch or not isinstance(data, str)):
+            # A full batch, or a payload only the automaton can scan (not a str)
+            self._compile()
+        found = self._node_index.get(node, _NO_MATCH)
+        found = min(found, self._best[0])
+
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        for ch in data:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best[state] < found:
+                found = best[state]
+
+        # Uncompiled rules all come after compiled ones
+        for index in self._pending:
+            if index >= found:
+                break
+            if self.rules[index]["target"] in data:
+                found = index
+                break
+
+        return None if found == _NO_MATCH else self.rules[int(found)]
+
+    def _compile(self) -> None:
+        """Insert the pending targets into the trie and relink it."""
+        goto, own = self._goto, self._own
+        for index in self._pending:
+            state = 0
+            for ch in self.rules[index]["target"]:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    self._fail.append(0)
+                    own.append(_NO_MATCH)
+                    self._best.append(_NO_MATCH)
+                state = nxt
+            if index < own[state]:
+                own[state] = index
+        self._pending = []
+        self._link()
+
+    def _link(self) -> None:
+        """Recompute failure links and suffix-best indices (BFS over the trie)."""
+        goto, fail, own, best = self._goto, self._fail, self._own, self._best
+        best[0] = own[0]
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            best[child] = min(own[child], best[0])
+            queue.append(child)
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(ch, 0)
+                fail[child] = f
+                best[child] = min(own[child], best[f])
+                queue.append(child)
+        self.relinks += 1
+
+
+class RoutingTable:
+    """
+    Longest-prefix-match IPv4 routing table.
+
+    Prefixes live in a level-compressed 16-8-8 multibit trie: a 65,536-slot
+    root indexed by the top 16 bits, then 256-slot blocks for bits 16–24
+    and 24–32, allocated only where longer prefixes exist. Every slot is
+    three entries in flat ``array`` columns (next hop id, prefix length,
+    child block), so a full-table-sized set of prefixes costs a few bytes
+    per slot and a lookup is at most three indexed reads.
+    """
+
+    _ROOT = 1 << 16
+    _BLOCK = 256
+
+    def __init__(self):
+        self._hop = array("i", [-1]) * self._ROOT
+        self._len = array("B", [0]) * self._ROOT
+        self._child = array("i", [-1]) * self._ROOT
+        self._hop_ids: Dict[str, int] = {}
+        self._hops: List[str] = []
+        # Distinct prefixes, keyed by ``network << 6 | plen``, for counting,
+        # exact lookups and deletion (the trie itself is leaf-pushed)
+        self._prefixes: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def insert(self, prefix: str, next_hop: str) -> None:
+        """Insert or replace ``prefix`` (CIDR notation) → ``next_hop``."""
+        network, plen = parse_cidr(prefix)
+        self.insert_int(network, plen, next_hop)
+
+    def insert_int(self, network: int, plen: int, next_hop: str) -> None:
+        """Insert an integer-encoded prefix."""
+        hop_id = self._hop_ids.get(next_hop)
+        if hop_id is None:
+            hop_id = self._hop_ids[next_hop] = len(self._hops)
+            self._hops.append(next_hop)
+        self._prefixes[network << 6 | plen] = hop_id
+
+        start, span = self._span(network, plen)
+        hop, length = self._hop, self._len
+        for slot in range(start, start + span):
+            if hop[slot] < 0 or length[slot] <= plen:
+                hop[slot] = hop_id
+                length[slot] = plen
+
+    def remove(self, prefix: str) -> bool:
+        """Delete ``prefix`` (CIDR notation); returns False if it was absent."""
+        network, plen = parse_cidr(prefix)
+        return self.remove_int(network, plen)
+
+    def remove_int(self, network: int, plen: int) -> bool:
+        """
+        Delete an integer-encoded prefix. Slots it owned fall back to the
+        longest remaining prefix stored at the same trie level (shorter
+        prefixes at higher levels are already consulted by lookups).
+        """
+        if self._prefixes.pop(network << 6 | plen, None) is None:
+            return False
+        floor = 0 if plen <= 16 else 17 if plen <= 24 else 25
+        fallback, fallback_len = -1, 0
+        for shorter in range(plen - 1, floor - 1, -1):
+            mask = (0xFFFFFFFF << (32 - shorter)) & 0xFFFFFFFF
+            hop_id = self._prefixes.get((network & mask) << 6 | shorter)
+            if hop_id is not None:
+                fallback, fallback_len = hop_id, shorter
+                break
+        start, span = self._span(network, plen)
+        hop, length = self._hop, self._len
+        for slot in range(start, start + span):
+            if hop[slot] >= 0 and length[slot] == plen:
+                hop[slot] = fallback
+                length[slot] = fallback_len
+        return True
+
+    def get_int(self, network: int, plen: int) -> Optional[str]:
+        """Next hop of exactly this prefix (no longest-prefix matching)."""
+        hop_id = self._prefixes.get(network << 6 | plen)
+        return None if hop_id is None else self._hops[hop_id]
+
+    def prefixes(self) -> Iterator[Tuple[int, int, str]]:
+        """Iterate ``(network, plen, next_hop)`` for every stored prefix."""
+        hops = self._hops
+        for key, hop_id in self._prefixes.items():
+            yield key >> 6, key & 63, hops[hop_id]
+
+    def lookup(self, address: str) -> Optional[str]:
+        """Return the next hop of the longest prefix covering ``address``."""
+        return self.lookup_int(ip_to_int(address))
+
+    def lookup_int(self, address: int) -> Optional[str]:
+        """Longest-prefix match for an integer-encoded address."""
+        hop, child = self._hop, self._child
+        slot = address >> 16
+        best = hop[slot]
+        block = child[slot]
+        if block >= 0:
+            slot = block + ((address >> 8) & 255)
+            if hop[slot] >= 0:
+                best = hop[slot]
+            block = child[slot]
+            if block >= 0:
+                slot = block + (address & 255)
+                if hop[slot] >= 0:
+                    best = hop[slot]
+        return self._hops[best] if best >= 0 else None
+
+    def load(self, path: str) -> int:
+        """
+        Bulk-load prefixes from a text file with one ``prefix next_hop``
+        pair per line (whitespace or comma separated, ``#`` comments).
+        Returns the number of entries read.
+        """
+        loaded = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].replace(",", " ").split()
+                if not line:
+                    continue
+                if len(line) != 2:
+                    raise ValueError(f"Malformed route entry: {' '.join(line)}")
+                network, plen = parse_cidr(line[0])
+                self.insert_int(network, plen, line[1])
+                loaded += 1
+        logger.info(f"📥 Loaded {loaded} prefixes from {path}")
+        return loaded
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the trie columns, prefix index and next hops in bytes."""
+        size = sys.getsizeof
+        columns = sum(col.itemsize * len(col) for col in (self._hop, self._len, self._child))
+        # Hop ids are small ints shared with the interpreter's cache, so the
+        # index is the dict table plus its int keys; names are held twice by reference
+        index = size(self._prefixes) + sum(map(size, self._prefixes))
+        hops = size(self._hops) + size(self._hop_ids) + sum(map(size, self._hops))
+        return columns + index + hops
+
+    def _span(self, network: int, plen: int) -> Tuple[int, int]:
+        """First slot and slot count covered by a prefix at its trie level."""
+        if plen <= 16:
+            return network >> 16, 1 << (16 - plen)
+        block = self._descend(network >> 16)
+        if plen <= 24:
+            return block + ((network >> 8) & 255), 1 << (24 - plen)
+        block = self._descend(block + ((network >> 8) & 255))
+        return block + (network & 255), 1 << (32 - plen)
+
+    def _descend(self, slot: int) -> int:
+        """Return the child block under ``slot``, allocating it on demand."""
+        block = self._child[slot]
+        if block < 0:
+            block = len(self._hop)
+            self._child[slot] = block
+            self._hop.extend(array("i", [-1]) * self._BLOCK)
+            self._len.extend(array("B", [0]) * self._BLOCK)
+            self._child.extend(array("i", [-1]) * self._BLOCK)
+        return block
+
+
+class PathEngine:
+    """
+    Energy-weighted multi-hop path engine.
+
+    Links carry an energy cost and a latency; their routing weight is
+    ``energy_weight * energy + latency_weight * latency``. Shortest-path
+    trees are computed per source with heap-based Dijkstra and kept in a
+    bounded LRU. A link change only touches the cached trees it can affect:
+    a lighter (or new) link re-relaxes from its head when it shortens that
+    node's distance, and a heavier (or removed) link that is a tree edge
+    re-settles just the subtree hanging below it.
+    """
+
+    def __init__(self, energy_weight: float = 1.0, latency_weight: float = 0.0, max_trees: int = 64):
+        self.energy_weight = energy_weight
+        self.latency_weight = latency_weight
+        self.max_trees = max_trees
+        self.links: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._adj: Dict[str, Dict[str, float]] = {}
+        self._radj: Dict[str, Dict[str, float]] = {}
+        self._trees: "OrderedDict[str, Tuple[Dict[str, float], Dict[str, Optional[str]]]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"trees_built": 0, "trees_repaired": 0, "cache_hits": 0}
+
+    def add_node(self, node: str) -> None:
+        """Register a node without links."""
+        if node not in self._adj:
+            self._adj[node] = {}
+            self._radj[node] = {}
+
+    def set_link(self, a: str, b: str, energy: float, latency: float = 0.0, bidirectional: bool = True) -> None:
+        """Add a link or update its energy/latency."""
+        if energy < 0 or latency < 0:
+            raise ValueError("Link energy and latency must be non-negative")
+        self._set_arc(a, b, energy, latency)
+        if bidirectional:
+            self._set_arc(b, a, energy, latency)
+
+    def remove_link(self, a: str, b: str, bidirectional: bool = True) -> None:
+        """Remove a link (no-op if it does not exist)."""
+        self._remove_arc(a, b)
+        if bidirectional:
+            self._remove_arc(b, a)
+
+    def path(self, source: str, target: str) -> Optional[Tuple[List[str], float]]:
+        """Return ``(hops, cost)`` of the cheapest path, or None if unreachable."""
+        if source not in self._adj or target not in self._adj:
+            return None
+        dist, parent = self._tree(source)
+        if target not in dist:
+            return None
+        hops = [target]
+        while hops[-1] != source:
+            hops.append(parent[hops[-1]])
+        hops.reverse()
+        return hops, dist[target]
+
+    def _tree(self, source: str) -> Tuple[Dict[str, float], Dict[str, Optional[str]]]:
+        tree = self._trees.get(source)
+        if tree is not None:
+            self._trees.move_to_end(source)
+            self.stats["cache_hits"] += 1
+            return tree
+
+        tree = ({source: 0.0}, {source: None})
+        self._relax(*tree, [(0.0, source)])
+        self._trees[source] = tree
+        if len(self._trees) > self.max_trees:
+            self._trees.popitem(last=False)
+        self.stats["trees_built"] += 1
+        return tree
+
+    def _relax(self, dist: Dict[str, float], parent: Dict[str, Optional[str]], heap: List[Tuple[float, str]]) -> None:
+        """Dijkstra from the seeded heap, improving ``dist``/``parent`` in place."""
+        adj = self._adj
+        pop, push, get, inf = heapq.heappop, heapq.heappush, dist.get, math.inf
+        heapq.heapify(heap)
+        while heap:
+            d, u = pop(heap)
+            if d > get(u, inf):
+                continue
+            for v, w in adj[u].items():
+                nd = d + w
+                if nd < get(v, inf):
+                    dist[v] = nd
+                    parent[v] = u
+                    push(heap, (nd, v))
+
+    def _set_arc(self, a: str, b: str, energy: float, latency: float) -> None:
+        self.add_node(a)
+        self.add_node(b)
+        weight = self.energy_weight * energy + self.latency_weight * latency
+        old = self._adj[a].get(b)
+        self.links[(a, b)] = (energy, latency)
+        self._adj[a][b] = self._radj[b][a] = weight
+        if old is None or weight < old:
+            self._repair_decrease(a, b, weight)
+        elif weight > old:
+            self._repair_increase(a, b)
+
+    def _remove_arc(self, a: str, b: str) -> None:
+        if self._adj.get(a, {}).pop(b, None) is None:
+            return
+        del self._radj[b][a]
+        del self.links[(a, b)]
+        self._repair_increase(a, b)
+
+    def _repair_decrease(self, a: str, b: str, weight: float) -> None:
+        for dist, parent in self._trees.values():
+            if a in dist and dist[a] + weight < dist.get(b, math.inf):
+                dist[b] = dist[a] + weight
+                parent[b] = a
+                self._relax(dist, parent, [(dist[b], b)])
+                self.stats["trees_repaired"] += 1
+
+    def _repair_increase(self, a: str, b: str) -> None:
+        adj, radj = self._adj, self._radj
+        for dist, parent in self._trees.values():
+            if parent.get(b) != a:
+                continue
+            subtree, stack = {b}, [b]
+            while stack:
+                u = stack.pop()
+                for v in adj[u]:
+                    if v not in subtree and parent.get(v) == u:
+                        subtree.add(v)
+                        stack.append(v)
+            for v in subtree:
+                del dist[v], parent[v]
+            heap = []
+            for v in subtree:
+                best, via = math.inf, None
+                for u, w in radj[v].items():
+                    if u in dist and dist[u] + w < best:
+                        best, via = dist[u] + w, u
+                if via is not None:
+                    dist[v], parent[v] = best, via
+                    heap.append((best, v))
+            self._relax(dist, parent, heap)
+            self.stats["trees_repaired"] += 1
+
 
 class GreenNet:
     """
@@ -33,22 +470,99 @@ class GreenNet:
     def __init__(self, name: str = "GreenNet"):
         self.name = name
         self.routes: Dict[str, str] = {}
+        self.routing_table = RoutingTable()
+        # Nodes registered at each host address, oldest first
+        self._hosts: Dict[int, Dict[str, None]] = {}
         self.analytics: Dict[str, Any] = {"sent": 0, "blocked": 0}
         self.firewall_rules = []
+        self._matcher = FirewallMatcher()
+        self.topology = PathEngine()
         logger.info(f"🌱 {self.name} initialized successfully.")
 
     def add_route(self, node: str, address: str) -> bool:
         """Register a new route in the GreenNet table."""
-        if not self._validate_ip(address):
+        try:
+            encoded = ip_to_int(address)
+        except ValueError:
             logger.error(f"❌ Invalid IP address: {address}")
             return False
-        self.routes[node] = address
+        self._set_route(node, address, encoded)
         logger.info(f"➕ Added route: {node} → {address}")
         return True
 
-    def send_packet(self, node: str, data: str) -> bool:
-        """Send a packet to a registered node if allowed by firewall."""
-        if node not in self.routes:
+    def add_routes(self, routes: Iterable[Tuple[str, str]]) -> int:
+        """Bulk :meth:`add_route` without per-route logging; returns routes accepted."""
+        added = 0
+        for node, address in routes:
+            try:
+                encoded = ip_to_int(address)
+            except (ValueError, AttributeError):
+                continue
+            self._set_route(node, address, encoded)
+            added += 1
+        return added
+
+    def _set_route(self, node: str, address: str, encoded: int) -> None:
+        previous = self.routes.get(node)
+        if previous is not None and previous != address:
+            old = ip_to_int(previous)
+            holders = self._hosts.get(old, {})
+            holders.pop(node, None)
+            if not holders:
+                self._hosts.pop(old, None)
+            # Hand the old /32 to the latest node still there, or drop it,
+            # unless another route took it over in the meantime
+            if self.routing_table.get_int(old, 32) == node:
+                if holders:
+                    self.routing_table.insert_int(old, 32, next(reversed(holders)))
+                else:
+                    self.routing_table.remove_int(old, 32)
+        self.routes[node] = address
+        self._hosts.setdefault(encoded, {})[node] = None
+        self.routing_table.insert_int(encoded, 32, node)
+
+    def add_prefix_route(self, prefix: str, node: str) -> bool:
+        """Route a whole CIDR prefix (e.g. ``10.0.0.0/8``) to ``node``."""
+        try:
+            self.routing_table.insert(prefix, node)
+        except ValueError as e:
+            logger.error(f"❌ Invalid prefix: {e}")
+            return False
+        logger.info(f"➕ Added prefix route: {prefix} → {node}")
+        return True
+
+    def resolve(self, address: str) -> Optional[str]:
+        """Return the node owning ``address`` by longest-prefix match."""
+        try:
+            return self.routing_table.lookup(address)
+        except ValueError:
+            logger.error(f"❌ Invalid IP address: {address}")
+            return None
+
+    def add_link(self, node1: str, node2: str, energy: float, latency: float = 0.0) -> bool:
+        """Add or update a bidirectional link with its energy cost and latency."""
+        try:
+            self.topology.set_link(node1, node2, energy, latency)
+        except ValueError as e:
+            logger.error(f"❌ Invalid link {node1} ↔ {node2}: {e}")
+            return False
+        logger.info(f"🔗 Link set: {node1} ↔ {node2} (energy={energy}, latency={latency})")
+        return True
+
+    def send_packet(self, node: str, data: str, source: Optional[str] = None) -> bool:
+        """
+        Send a packet to a registered node if allowed by firewall.
+
+        When ``source`` is given the packet travels over the cheapest
+        multi-hop path in the link topology instead of a direct route.
+        """
+        route = None
+        if source is not None:
+            route = self.topology.path(source, node)
+            if route is None:
+                logger.error(f"❌ No GreenNet path from {source} to {node}.")
+                return False
+        elif node not in self.routes:
             logger.error(f"❌ Node {node} not found in GreenNet routes.")
             return False
 
@@ -58,9 +572,71 @@ class GreenNet:
             return False
 
         self.analytics["sent"] += 1
-        logger.info(f"📦 Packet sent to {node} ({self.routes[node]}): {data}")
+        if route is not None:
+            hops, cost = route
+            logger.info(f"📦 Packet sent to {node} via {' → '.join(hops)} (energy={cost:.2f}): {data}")
+        else:
+            logger.info(f"📦 Packet sent to {node} ({self.routes[node]}): {data}")
         return True
 
+    def send_packets(self, packets: Iterable[Tuple[str, str]]) -> bytearray:
+        """
+        Send many ``(node, data)`` packets in one call.
+
+        Routes are resolved once per destination and the firewall runs once
+        per distinct ``(node, data)`` pair. Analytics and logging are updated
+        once for the whole batch. Returns one status byte per packet, in input
+        order: ``PACKET_SENT``, ``PACKET_BLOCKED`` or ``PACKET_NO_ROUTE``.
+        """
+        self._matcher.sync(self.firewall_rules)
+        match = self._matcher.match
+        routes = self.routes
+
+        results = bytearray()
+        append = results.append
+        verdicts: Dict[Tuple[str, str], int] = {}
+        destinations: Dict[str, bool] = {}
+
+        for packet in packets:
+            try:
+                verdict = verdicts.get(packet)
+            except TypeError:  # unhashable packets (e.g. lists) are decided uncached
+                node, data = packet
+                try:
+                    routed = node in routes
+                except TypeError:
+                    routed = False
+                append(self._verdict(node, data, match) if routed else PACKET_NO_ROUTE)
+                continue
+            if verdict is None:
+                node, data = packet
+                routed = destinations.get(node)
+                if routed is None:
+                    routed = destinations[node] = node in routes
+                verdict = verdicts[packet] = self._verdict(node, data, match) if routed else PACKET_NO_ROUTE
+            append(verdict)
+
+        sent = results.count(PACKET_SENT)
+        blocked = results.count(PACKET_BLOCKED)
+        unroutable = len(results) - sent - blocked
+        self.analytics["sent"] += sent
+        self.analytics["blocked"] += blocked
+
+        if unroutable:
+            logger.error(f"❌ {unroutable} packets had no GreenNet route.")
+        if blocked:
+            logger.warning(f"🚫 {blocked} packets blocked by firewall.")
+        logger.info(
+            f"📦 Batch sent: {sent}/{len(results)} packets "
+            f"to {sum(destinations.values())} nodes"
+        )
+        return results
+
+    @staticmethod
+    def _verdict(node: str, data: str, match) -> int:
+        rule = match(node, data)
+        return PACKET_BLOCKED if rule is not None and rule["action"] == "block" else PACKET_SENT
+
     def add_firewall_rule(self, rule_type: str, target: str, action: str = "block") -> None:
         """Add a firewall rule for traffic filtering."""
         rule = {
@@ -70,6 +646,7 @@ class GreenNet:
             "created": datetime.now().isoformat()
         }
         self.firewall_rules.append(rule)
+        self._matcher.sync(self.firewall_rules)
         logger.info(f"🛡️ Firewall rule added: {rule_type} '{target}' → {action}")
 
     def show_state(self) -> Dict[str, Any]:
@@ -77,6 +654,8 @@ class GreenNet:
         return {
             "name": self.name,
             "routes": self.routes,
+            "prefixes": len(self.routing_table),
+            "links": len(self.topology.links),
             "analytics": self.analytics,
             "firewall_rules": len(self.firewall_rules)
         }
@@ -87,12 +666,14 @@ class GreenNet:
 
     def _validate_ip(self, address: str) -> bool:
         """Validate IPv4 address format."""
-        parts = address.split(".")
-        return len(parts) == 4 and all(p.isdigit() and 0 <= int(p) <= 255 for p in parts)
+        try:
+            ip_to_int(address)
+        except ValueError:
+            return False
+        return True
 
     def _is_blocked(self, node: str, data: str) -> bool:
         """Check if traffic should be blocked by firewall."""
-        for rule in self.firewall_rules:
-            if rule["target"] == node or rule["target"] in data:
-                return rule["action"] == "block"
-        return False
+        self._matcher.sync(self.firewall_rules)
+        rule = self._matcher.match(node, data)
+        return rule is not None and rule["action"] == "block"
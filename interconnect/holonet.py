@@ -18,67 +18,611 @@ Scientific Relevance:
 Author: Mohamed Orhan Zeinel
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any
+import math
+import struct
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
 
 
 logger = logging.getLogger(__name__)
 
 
+Position = Tuple[float, float, float]
+
+# Wire frame: magic, version, flags, stream id, seq, base keyframe seq, body length
+_FRAME = struct.Struct("<2sBBIIII")
+_RUN = struct.Struct("<II")
+_LENGTH = struct.Struct("<I")
+FRAME_MAGIC = b"HF"
+FRAME_VERSION = 1
+FLAG_KEYFRAME = 0x01
+FLAG_DELTA = 0x02
+
+
+def pack_frame(flags: int, stream: int, seq: int, base: int, body: bytes) -> bytes:
+    """Serialize one wire frame (header + body)."""
+    return _FRAME.pack(FRAME_MAGIC, FRAME_VERSION, flags, stream, seq, base, len(body)) + body
+
+
+def parse_frame(buf: Union[bytes, memoryview]) -> Tuple[int, int, int, int, memoryview]:
+    """Parse a wire frame without copying; returns ``(flags, stream, seq, base, body)``."""
+    view = memoryview(buf)
+    magic, version, flags, stream, seq, base, length = _FRAME.unpack_from(view)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("Not a HoloNet frame")
+    body = view[_FRAME.size:_FRAME.size + length]
+    if len(body) != length:
+        raise ValueError("Truncated HoloNet frame")
+    return flags, stream, seq, base, body
+
+
+class FrameCodec:
+    """
+    Encoder for hologram frame streams (one stream per room and sender).
+
+    The first frame of a stream, every ``keyframe_interval``-th frame, and
+    any frame whose delta would exceed ``max_delta_ratio`` of its size are
+    sent whole as keyframes. Other frames are deltas against the stream's
+    last keyframe: a new length plus ``(offset, length, bytes)`` runs
+    found by a NumPy byte comparison, with runs closer than ``merge_gap``
+    merged. Deltas never depend on each other, so dropped deltas do not
+    break decoding.
+    """
+
+    def __init__(self, keyframe_interval: int = 60, max_delta_ratio: float = 0.5, merge_gap: int = 8):
+        self.keyframe_interval = keyframe_interval
+        self.max_delta_ratio = max_delta_ratio
+        self.merge_gap = merge_gap
+        self.streams: Dict[Tuple[str, Optional[str]], int] = {}
+        # stream id -> [last seq, keyframe seq, keyframe payload]
+        self._state: Dict[int, List[Any]] = {}
+        # Ids are never reused, so receivers cannot confuse a forgotten stream
+        self._last_stream = 0
+        self.stats: Dict[str, int] = {"keyframes": 0, "deltas": 0, "raw_bytes": 0, "wire_bytes": 0}
+
+    def stream_id(self, room: str, sender: Optional[str]) -> int:
+        key = (room, sender)
+        stream = self.streams.get(key)
+        if stream is None:
+            self._last_stream += 1
+            stream = self.streams[key] = self._last_stream
+            self._state[stream] = [0, 0, None]
+        return stream
+
+    def forget(self, room: str, sender: Optional[str]) -> None:
+        """Drop the stream state of ``sender`` in ``room`` (its next frame is a keyframe)."""
+        stream = self.streams.pop((room, sender), None)
+        if stream is not None:
+            del self._state[stream]
+
+    def forget_room(self, room: str) -> None:
+        """Drop the stream state of every sender in ``room``."""
+        for key in [key for key in self.streams if key[0] == room]:
+            self.forget(*key)
+
+    def encode(self, room: str, sender: Optional[str], payload: bytes) -> Tuple[bytes, bool]:
+        """Encode ``payload``; returns the wire frame and whether it is a keyframe."""
+        stream = self.stream_id(room, sender)
+        state = self._state[stream]
+        seq = state[0] = state[0] + 1
+        body = None
+        if state[2] is not None and seq - state[1] < self.keyframe_interval:
+            if payload == state[2]:
+                body = _LENGTH.pack(len(payload))  # static scene: empty delta
+            else:
+                body = self._delta(np.frombuffer(state[2], dtype=np.uint8), payload)
+        if body is None:
+            state[1], state[2] = seq, payload
+            wire = pack_frame(FLAG_KEYFRAME, stream, seq, seq, payload)
+            self.stats["keyframes"] += 1
+        else:
+            wire = pack_frame(FLAG_DELTA, stream, seq, state[1], body)
+            self.stats["deltas"] += 1
+        self.stats["raw_bytes"] += len(payload)
+        self.stats["wire_bytes"] += len(wire)
+        return wire, body is None
+
+    def _delta(self, key: np.ndarray, payload: bytes) -> Optional[bytes]:
+        current = np.frombuffer(payload, dtype=np.uint8)
+        n = min(len(key), len(current))
+        changed = np.flatnonzero(key[:n] != current[:n])
+        if len(current) > n:
+            changed = np.concatenate([changed, np.arange(n, len(current))])
+        limit = self.max_delta_ratio * len(current)
+        parts = [_LENGTH.pack(len(current))]
+        if len(changed):
+            breaks = np.flatnonzero(np.diff(changed) > self.merge_gap)
+            starts = changed[np.concatenate(([0], breaks + 1))].tolist()
+            ends = (changed[np.concatenate((breaks, [len(changed) - 1]))] + 1).tolist()
+            if len(starts) * _RUN.size + sum(ends) - sum(starts) > limit:
+                return None
+            for start, end in zip(starts, ends):
+                parts.append(_RUN.pack(start, end - start))
+                parts.append(payload[start:end])
+        return b"".join(parts)
+
+
+class FrameDecoder:
+    """
+    Receiver-side decoder: keeps each stream's last keyframe and applies
+    deltas to it. Keyframe bodies are returned (and retained) as zero-copy
+    memoryviews, so buffers passed in must not be reused afterwards.
+    """
+
+    def __init__(self):
+        self._keyframes: Dict[int, Tuple[int, memoryview]] = {}
+        self.stats: Dict[str, int] = {"keyframes": 0, "deltas": 0, "missing_base": 0}
+
+    def decode(self, buf: Union[bytes, memoryview]) -> Optional[Union[memoryview, bytearray]]:
+        """Return the frame's payload, or None if its keyframe was never seen."""
+        flags, stream, seq, base, body = parse_frame(buf)
+        if flags & FLAG_KEYFRAME:
+            self._keyframes[stream] = (seq, body)
+            self.stats["keyframes"] += 1
+            return body
+        known = self._keyframes.get(stream)
+        if known is None or known[0] != base:
+            self.stats["missing_base"] += 1
+            return None
+        key = known[1]
+        (length,) = _LENGTH.unpack_from(body)
+        out = bytearray(length)
+        n = min(length, len(key))
+        out[:n] = key[:n]
+        pos = _LENGTH.size
+        while pos < len(body):
+            offset, size = _RUN.unpack_from(body, pos)
+            pos += _RUN.size
+            out[offset:offset + size] = body[pos:pos + size]
+            pos += size
+        self.stats["deltas"] += 1
+        return out
+
+
+class SpatialGrid:
+    """
+    Uniform 3D grid of participant positions.
+
+    Space is cut into cubes of ``cell_size``; each non-empty cell holds the
+    set of users inside it. Moving a user only touches the index when it
+    crosses a cell boundary, and a radius query visits just the cells
+    overlapping the query sphere's bounding box (27 when the radius equals
+    the cell size) before an exact distance check.
+    """
+
+    def __init__(self, cell_size: float = 10.0):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.positions: Dict[str, Position] = {}
+        self._cell_of: Dict[str, Tuple[int, int, int]] = {}
+        self._cells: Dict[Tuple[int, int, int], Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, user: object) -> bool:
+        return user in self.positions
+
+    def _cell(self, position: Position) -> Tuple[int, int, int]:
+        size = self.cell_size
+        return (math.floor(position[0] / size), math.floor(position[1] / size), math.floor(position[2] / size))
+
+    def move(self, user: str, position: Position) -> None:
+        """Insert ``user`` or update its position."""
+        position = (float(position[0]), float(position[1]), float(position[2]))
+        self.positions[user] = position
+        cell = self._cell(position)
+        old = self._cell_of.get(user)
+        if old == cell:
+            return
+        if old is not None:
+            self._discard(user, old)
+        self._cell_of[user] = cell
+        members = self._cells.get(cell)
+        if members is None:
+            members = self._cells[cell] = set()
+        members.add(user)
+
+    def remove(self, user: str) -> None:
+        cell = self._cell_of.pop(user, None)
+        if cell is not None:
+            del self.positions[user]
+            self._discard(user, cell)
+
+    def _discard(self, user: str, cell: Tuple[int, int, int]) -> None:
+        members = self._cells[cell]
+        members.discard(user)
+        if not members:
+            del self._cells[cell]
+
+    def query(self, center: Position, radius: float) -> List[str]:
+        """Users within ``radius`` of ``center`` (inclusive)."""
+        size, cells, positions = self.cell_size, self._cells, self.positions
+        cx, cy, cz = center
+        r2 = radius * radius
+        x0, x1 = math.floor((cx - radius) / size), math.floor((cx + radius) / size)
+        y0, y1 = math.floor((cy - radius) / size), math.floor((cy + radius) / size)
+        z0, z1 = math.floor((cz - radius) / size), math.floor((cz + radius) / size)
+        found = []
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                for z in range(z0, z1 + 1):
+                    members = cells.get((x, y, z))
+                    if not members:
+                        continue
+                    for user in members:
+                        px, py, pz = positions[user]
+                        if (px - cx) ** 2 + (py - cy) ** 2 + (pz - cz) ** 2 <= r2:
+                            found.append(user)
+        return found
+
+
+class Frame:
+    """One encoded broadcast frame, shared by reference by every receiver."""
+
+    __slots__ = ("room", "sender", "seq", "payload", "keyframe", "created")
+
+    def __init__(self, room: str, sender: Optional[str], seq: int, payload: bytes, keyframe: bool = True):
+        self.room = room
+        self.sender = sender
+        self.seq = seq
+        self.payload = payload
+        self.keyframe = keyframe
+        self.created = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"Frame({self.room!r}, {self.sender!r}, seq={self.seq}, {len(self.payload)} bytes)"
+
+
+class FrameQueue:
+    """
+    Bounded single-consumer frame queue for one participant.
+
+    ``offer`` never blocks. When the queue is full, the ``"coalesce"``
+    policy makes room without ever evicting a keyframe, since later
+    deltas of its stream (room, sender) depend on it:
+
+    * a new keyframe replaces every pending frame of its own stream;
+    * a new delta replaces a pending delta of its own stream;
+    * otherwise the oldest pending delta of any stream is evicted;
+    * if only keyframes are pending, the new frame is dropped.
+
+    ``"drop"`` discards the new frame whenever the queue is full.
+    """
+
+    def __init__(self, maxsize: int = 4):
+        self.maxsize = maxsize
+        self._frames: Deque[Frame] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def offer(self, frame: Frame, policy: str = "coalesce") -> str:
+        """Enqueue ``frame``; returns ``"queued"``, ``"coalesced"`` or ``"dropped"``."""
+        frames = self._frames
+        outcome = "queued"
+        if len(frames) >= self.maxsize:
+            if policy != "coalesce":
+                return "dropped"
+            if not self._make_room(frame):
+                return "dropped"
+            outcome = "coalesced"
+        frames.append(frame)
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+        return outcome
+
+    def _make_room(self, frame: Frame) -> bool:
+        frames = self._frames
+        stream = (frame.room, frame.sender)
+        if frame.keyframe:
+            same = [f for f in frames if (f.room, f.sender) == stream]
+            if same:
+                for stale in same:
+                    frames.remove(stale)
+                return True
+        else:
+            for stale in frames:
+                if not stale.keyframe and (stale.room, stale.sender) == stream:
+                    frames.remove(stale)
+                    return True
+        for stale in frames:
+            if not stale.keyframe:
+                frames.remove(stale)
+                return True
+        return False
+
+    def get_nowait(self) -> Frame:
+        if not self._frames:
+            raise asyncio.QueueEmpty
+        return self._frames.popleft()
+
+    def drain(self) -> List[Frame]:
+        """Take every pending frame, oldest first."""
+        frames = list(self._frames)
+        self._frames.clear()
+        return frames
+
+    async def wait(self) -> None:
+        """Wait until at least one frame is pending."""
+        while not self._frames:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+
+class FrameBroadcaster:
+    """
+    Fan-out of encoded frames into bounded per-participant queues, one
+    per (room, user).
+
+    Publishing never stalls a room: slow consumers are handled by the
+    queue ``policy`` (see :class:`FrameQueue`). Each room keeps counters
+    and a window of recent publish→receive latencies, reported by
+    :meth:`room_stats`.
+    """
+
+    POLICIES = ("coalesce", "drop")
+
+    def __init__(self, queue_size: int = 4, policy: str = "coalesce",
+                 batch_size: int = 1024, latency_window: int = 4096):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown frame policy: {policy}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self.batch_size = batch_size
+        self.latency_window = latency_window
+        self.queues: Dict[Tuple[str, str], FrameQueue] = {}
+        self._rooms: Dict[str, Dict[str, Any]] = {}
+
+    def queue(self, room: str, user: str) -> FrameQueue:
+        """Return (creating on demand) the frame queue of ``user`` in ``room``."""
+        queue = self.queues.get((room, user))
+        if queue is None:
+            queue = self.queues[(room, user)] = FrameQueue(self.queue_size)
+        return queue
+
+    def remove(self, room: str, user: str) -> None:
+        """Drop the queue of ``user`` in ``room`` with any frames still pending."""
+        self.queues.pop((room, user), None)
+
+    def remove_room(self, room: str) -> None:
+        """Drop every queue and the counters of ``room``."""
+        for key in [key for key in self.queues if key[0] == room]:
+            del self.queues[key]
+        self._rooms.pop(room, None)
+
+    def _room(self, room: str) -> Dict[str, Any]:
+        stats = self._rooms.get(room)
+        if stats is None:
+            stats = self._rooms[room] = {
+                "frames": 0, "queued": 0, "coalesced": 0, "dropped": 0,
+                "latency": deque(maxlen=self.latency_window),
+            }
+        return stats
+
+    def publish(self, frame: Frame, receivers: Iterable[str]) -> Dict[str, int]:
+        """Offer ``frame`` to every receiver without blocking."""
+        counts = {"queued": 0, "coalesced": 0, "dropped": 0}
+        queue, policy, room = self.queue, self.policy, frame.room
+        for user in receivers:
+            counts[queue(room, user).offer(frame, policy)] += 1
+        self._account(frame.room, counts)
+        return counts
+
+    async def publish_async(self, frame: Frame, receivers: Iterable[str]) -> Dict[str, int]:
+        """Like :meth:`publish`, yielding to the loop every ``batch_size`` receivers."""
+        counts = {"queued": 0, "coalesced": 0, "dropped": 0}
+        receivers = list(receivers)
+        queue, policy, room = self.queue, self.policy, frame.room
+        for start in range(0, len(receivers), self.batch_size):
+            for user in receivers[start:start + self.batch_size]:
+                counts[queue(room, user).offer(frame, policy)] += 1
+            await asyncio.sleep(0)
+        self._account(frame.room, counts)
+        return counts
+
+    def _account(self, room: str, counts: Dict[str, int]) -> None:
+        stats = self._room(room)
+        stats["frames"] += 1
+        for key, value in counts.items():
+            stats[key] += value
+
+    async def receive(self, room: str, user: str) -> Frame:
+        """Wait for the next frame delivered to ``user`` in ``room``."""
+        queue = self.queue(room, user)
+        await queue.wait()
+        frame = queue.get_nowait()
+        self._room(frame.room)["latency"].append(time.monotonic() - frame.created)
+        return frame
+
+    async def receive_many(self, room: str, user: str) -> List[Frame]:
+        """Wait for frames, then take every pending one in a single wake-up."""
+        queue = self.queue(room, user)
+        await queue.wait()
+        frames = queue.drain()
+        now = time.monotonic()
+        for frame in frames:
+            self._room(frame.room)["latency"].append(now - frame.created)
+        return frames
+
+    def room_stats(self, room: str) -> Dict[str, Any]:
+        """Counters plus latency percentiles (ms) over the recent window."""
+        stats = dict(self._room(room))
+        latency = np.fromiter(stats.pop("latency"), dtype=np.float64) * 1e3
+        offered = stats["queued"] + stats["coalesced"] + stats["dropped"]
+        stats["drop_rate"] = (stats["coalesced"] + stats["dropped"]) / offered if offered else 0.0
+        if len(latency):
+            p50, p99 = np.percentile(latency, [50, 99])
+            stats.update(latency_p50_ms=float(p50), latency_p99_ms=float(p99),
+                         latency_max_ms=float(latency.max()))
+        return stats
+
+
 class HoloNet:
     """
     HoloNet: A lightweight holographic communication simulator
     for Internet ∞. It models hologram rooms and participant flows.
     """
 
-    def __init__(self, name: str = "HoloNet"):
+    def __init__(self, name: str = "HoloNet", broadcaster: Optional[FrameBroadcaster] = None,
+                 codec: Optional[FrameCodec] = None):
         self.name = name
         self.holograms: Dict[str, Dict[str, Any]] = {}
-        self.participants: Dict[str, List[str]] = {}
+        self.participants: Dict[str, Set[str]] = {}
+        self.spaces: Dict[str, SpatialGrid] = {}
+        self.broadcaster = broadcaster or FrameBroadcaster()
+        self.codec = codec or FrameCodec()
+        self._seq: Dict[str, int] = {}
         logger.info(f"🕸️ {self.name} initialized")
 
-    def create_hologram(self, room_name: str) -> bool:
-        """Create a new holographic space (room)."""
+    def create_hologram(self, room_name: str, interest_radius: Optional[float] = None) -> bool:
+        """
+        Create a new holographic space (room).
+
+        With an ``interest_radius``, a participant's broadcasts reach only
+        those within that distance of them; otherwise the whole room.
+        """
         if room_name not in self.holograms:
-            self.holograms[room_name] = {"dimensions": "3D", "resolution": "high"}
-            self.participants[room_name] = []
+            self.holograms[room_name] = {
+                "dimensions": "3D", "resolution": "high", "interest_radius": interest_radius,
+            }
+            self.participants[room_name] = set()
+            self.spaces[room_name] = SpatialGrid(interest_radius or 10.0)
             logger.info(f"🌀 Hologram room created: {room_name}")
             return True
         logger.warning(f"⚠️ Hologram room already exists: {room_name}")
         return False
 
-    def add_participant(self, user: str, room_name: str) -> bool:
-        """Add a participant to a hologram room."""
+    def remove_hologram(self, room_name: str) -> bool:
+        """Close a hologram room, dropping its queues and stream state."""
+        if self.holograms.pop(room_name, None) is None:
+            return False
+        del self.participants[room_name]
+        del self.spaces[room_name]
+        self._seq.pop(room_name, None)
+        self.broadcaster.remove_room(room_name)
+        self.codec.forget_room(room_name)
+        logger.info(f"🗑️ Hologram room removed: {room_name}")
+        return True
+
+    def add_participant(self, user: str, room_name: str, position: Position = (0.0, 0.0, 0.0)) -> bool:
+        """Add a participant to a hologram room at ``position``."""
         if room_name not in self.holograms:
             logger.error(f"❌ Room not found: {room_name}")
             return False
         if user not in self.participants[room_name]:
-            self.participants[room_name].append(user)
+            self.participants[room_name].add(user)
+            self.spaces[room_name].move(user, position)
             logger.info(f"👥 {user} joined hologram room: {room_name}")
             return True
         logger.warning(f"⚠️ {user} is already in room: {room_name}")
         return False
 
-    def broadcast_vr_message(self, room_name: str, message: str) -> Dict[str, Any]:
-        """Broadcast a VR/AR message to all participants in a hologram room."""
+    def remove_participant(self, user: str, room_name: str) -> bool:
+        """Remove a participant from a hologram room."""
+        if user not in self.participants.get(room_name, ()):
+            return False
+        self.participants[room_name].discard(user)
+        self.spaces[room_name].remove(user)
+        self.broadcaster.remove(room_name, user)
+        self.codec.forget(room_name, user)
+        logger.info(f"👋 {user} left hologram room: {room_name}")
+        return True
+
+    def move_participant(self, user: str, room_name: str, position: Position) -> bool:
+        """Update a participant's position (cheap; called every tick)."""
+        if user not in self.participants.get(room_name, ()):
+            return False
+        self.spaces[room_name].move(user, position)
+        return True
+
+    def broadcast_vr_message(
+        self, room_name: str, message: Union[str, bytes], sender: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Broadcast a VR/AR message to the participants of a hologram room.
+
+        The message is encoded once into a binary wire :class:`Frame`
+        (a keyframe or a delta, see :class:`FrameCodec`) and offered to
+        every receiver's queue by reference; receivers decode it with a
+        :class:`FrameDecoder`. Receivers are the room minus
+        the sender, limited to the sender's interest radius when the room
+        has one.
+        """
+        frame = self._frame(room_name, message, sender)
+        if frame is None:
+            return {"status": "error", "message": "room not found"}
+        receivers = self._receivers(room_name, sender)
+        counts = self.broadcaster.publish(frame, receivers)
+        return self._report(frame, message, receivers, counts)
+
+    async def broadcast_vr_message_async(
+        self, room_name: str, message: Union[str, bytes], sender: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Like :meth:`broadcast_vr_message`, yielding to the loop on large rooms."""
+        frame = self._frame(room_name, message, sender)
+        if frame is None:
+            return {"status": "error", "message": "room not found"}
+        receivers = self._receivers(room_name, sender)
+        counts = await self.broadcaster.publish_async(frame, receivers)
+        return self._report(frame, message, receivers, counts)
+
+    async def receive(self, user: str, room_name: str) -> Frame:
+        """Wait for the next frame delivered to ``user`` in ``room_name``."""
+        return await self.broadcaster.receive(room_name, user)
+
+    def _frame(self, room_name: str, message: Union[str, bytes], sender: Optional[str]) -> Optional[Frame]:
         if room_name not in self.holograms:
             logger.error(f"❌ Room not found: {room_name}")
-            return {"status": "error", "message": "room not found"}
+            return None
+        seq = self._seq[room_name] = self._seq.get(room_name, 0) + 1
+        payload = message.encode("utf-8") if isinstance(message, str) else bytes(message)
+        wire, keyframe = self.codec.encode(room_name, sender, payload)
+        return Frame(room_name, sender, seq, wire, keyframe)
+
+    def _receivers(self, room_name: str, sender: Optional[str]) -> List[str]:
+        radius = self.holograms[room_name]["interest_radius"]
+        space = self.spaces[room_name]
+        if radius is not None and sender in space:
+            nearby = space.query(space.positions[sender], radius)
+        else:
+            nearby = self.participants[room_name]
+        return [user for user in nearby if user != sender]
 
-        receivers = self.participants.get(room_name, [])
-        logger.info(
-            f"📡 [HoloNet:{room_name}] Broadcast → {len(receivers)} users: {message}"
-        )
+    def _report(self, frame: Frame, message: Union[str, bytes], receivers: List[str],
+                counts: Dict[str, int]) -> Dict[str, Any]:
+        if logger.isEnabledFor(logging.DEBUG):  # per-frame hot path
+            logger.debug(
+                f"📡 [HoloNet:{frame.room}] {'Keyframe' if frame.keyframe else 'Delta'} #{frame.seq} "
+                f"({len(frame.payload)} bytes) → "
+                f"{len(receivers)} users {counts}"
+            )
         return {
-            "room": room_name,
+            "room": frame.room,
             "message": message,
             "receivers": receivers,
             "count": len(receivers),
+            "seq": frame.seq,
+            "keyframe": frame.keyframe,
+            **counts,
         }
 
     def show_state(self) -> Dict[str, Any]:
         """Return the state of all holographic rooms and participants."""
         return {
             "holograms": list(self.holograms.keys()),
-            "participants": {room: users for room, users in self.participants.items()},
+            "participants": {room: sorted(users) for room, users in self.participants.items()},
+            "streams": {room: self.broadcaster.room_stats(room) for room in self.holograms},
+            "codec": dict(self.codec.stats),
         }
@@ -2,36 +2,590 @@
 LegacyBridge
 ============
 Bridge between Internet ∞ and the classical legacy Internet (HTTP/HTTPS).
+
+Requests go through a pooled keep-alive session: one ``HTTPAdapter``
+(keeping up to ``max_per_host`` idle connections per host) shared by
+thread-local sessions, so sequential calls reuse connections and
+``send_many`` can run requests concurrently, bounded by its in-flight
+limit.
+
+GET responses pass through a ``ResponseCache`` that follows
+``Cache-Control``/``Expires`` for freshness and revalidates stale entries
+with ``If-None-Match``/``If-Modified-Since``. Concurrent GETs for the same
+URL share one upstream fetch.
+
+Large bodies can be streamed instead (``stream_http``/``download``): raw
+chunks go straight to a file or ``StatePersistence`` storage, optionally
+encrypted chunk by chunk through the ``crypto`` engine, so memory use does
+not grow with the body size.
 """
 
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
 import requests  # lightweight HTTP client
+from requests.adapters import HTTPAdapter
+
+from utils.persistence import write_atomic
 
 logger = logging.getLogger(__name__)
 
+# A request for send_many: a URL (GET), (url, method[, data]) or a dict of send_http kwargs
+RequestSpec = Union[str, Tuple[Any, ...], Dict[str, Any]]
+
+CHUNK_SIZE = 256 * 1024
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def cache_control(value: str) -> Dict[str, Optional[str]]:
+    """Parse a ``Cache-Control`` header into ``{directive: argument}``."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if sep else None
+    return directives
+
+
+def freshness_lifetime(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """
+    Seconds a response stays fresh from ``now``, or None if it must not be
+    stored. ``no-cache`` responses are stored but always revalidated; with
+    no explicit freshness a response is treated as immediately stale.
+    """
+    directives = cache_control(headers.get("Cache-Control", ""))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    try:
+        age = float(headers.get("Age") or 0)
+    except ValueError:
+        age = 0.0
+    if "max-age" in directives:
+        try:
+            return max(0.0, int(directives["max-age"]) - age)
+        except (TypeError, ValueError):
+            return 0.0
+    if "Expires" in headers:
+        expires = _http_date(headers["Expires"])
+        if expires is None:
+            return 0.0  # an invalid Expires means "already expired"
+        date = _http_date(headers.get("Date")) or now
+        return max(0.0, expires - date - age)
+    return 0.0
+
+
+def _copy(chunks: Iterable[bytes], f: BinaryIO) -> int:
+    written = 0
+    for chunk in chunks:
+        f.write(chunk)
+        written += len(chunk)
+    return written
+
+
+class CachedResponse:
+    """
+    A stored GET response (status, text and validators). ``vary`` maps the
+    request headers named by the response's ``Vary`` to the values they
+    had when it was fetched.
+    """
+
+    __slots__ = ("url", "status_code", "text", "etag", "last_modified", "expires", "size", "vary")
+
+    def __init__(self, url: str, status_code: int, text: str, etag: Optional[str],
+                 last_modified: Optional[str], expires: float, size: int,
+                 vary: Optional[Dict[str, Optional[str]]] = None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+        self.size = size
+        self.vary = vary
+
+    def fresh(self, now: float) -> bool:
+        return now < self.expires
+
+    def matches(self, headers: Optional[Mapping[str, str]]) -> bool:
+        """Whether a request with ``headers`` may use this response."""
+        if not self.vary:
+            return True
+        headers = headers or {}
+        return all(headers.get(name) == value for name, value in self.vary.items())
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU of GET responses with HTTP freshness rules.
+
+    Entries are evicted least-recently-used once either ``max_bytes``
+    (body size) or ``max_entries`` is exceeded. Stale entries that carry an
+    ``ETag`` or ``Last-Modified`` are kept for conditional revalidation.
+    With ``persistence`` (a ``StatePersistence``) every stored response is
+    also written as a JSON file into its directory, and memory misses fall
+    back to that tier, so entries survive eviction and restarts. The disk
+    tier is its own LRU, bounded by ``disk_bytes`` and ``disk_entries``.
+    Responses with ``Vary`` are only reused for requests whose varied
+    headers match (``Vary: *`` is never stored). All methods are
+    thread-safe.
+    """
+
+    OUTCOMES = ("hits", "revalidated", "coalesced", "misses")
+
+    PREFIX = "http-cache-"
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 4096,
+                 persistence=None, latency_window: int = 4096,
+                 disk_bytes: int = 256 * 1024 * 1024, disk_entries: int = 65_536):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.persistence = persistence
+        self.disk_bytes = disk_bytes
+        self.disk_entries = disk_entries
+        self.bytes = 0
+        self.disk_used = 0
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = dict.fromkeys(
+            self.OUTCOMES + ("stores", "evictions", "invalidations", "disk_hits", "disk_evictions"), 0
+        )
+        self._latency = {outcome: deque(maxlen=latency_window) for outcome in self.OUTCOMES}
+        if persistence is not None:
+            self._scan_disk()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _filename(url: str) -> str:
+        return f"{ResponseCache.PREFIX}{hashlib.sha256(url.encode()).hexdigest()[:32]}.json"
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.persistence.base_dir, filename)
+
+    def _scan_disk(self) -> None:
+        """Index cache files left by earlier runs, oldest first."""
+        found = []
+        for name in os.listdir(self.persistence.base_dir):
+            if name.startswith(self.PREFIX) and name.endswith(".json"):
+                try:
+                    st = os.stat(self._path(name))
+                except OSError:
+                    continue
+                found.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(found):
+            self._disk[name] = size
+            self.disk_used += size
+        self._remove_files(self._trim_disk())
+
+    def lookup(self, url: str, headers: Optional[Mapping[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Return the stored response for ``url`` (fresh or stale) usable by a
+        request with ``headers``, if any.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry if entry.matches(headers) else None
+        if self.persistence is None:
+            return None
+        filename = self._filename(url)
+        try:
+            with open(self._path(filename), "r", encoding="utf-8") as f:
+                entry = CachedResponse(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+        if entry.url != url:
+            return None
+        with self._lock:
+            self.counters["disk_hits"] += 1
+            if filename in self._disk:
+                self._disk.move_to_end(filename)
+            self._insert(entry)
+        return entry if entry.matches(headers) else None
+
+    def store(self, url: str, response: requests.Response, now: float) -> Optional[CachedResponse]:
+        """Cache a 200 response if its headers allow it; returns the entry."""
+        if response.status_code != 200:
+            return None
+        headers = response.headers
+        lifetime = freshness_lifetime(headers, now)
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if lifetime is None or not (lifetime or etag or last_modified):
+            return None
+        vary = None
+        if headers.get("Vary"):
+            names = [name.strip().lower() for name in headers["Vary"].split(",") if name.strip()]
+            if "*" in names:
+                return None
+            sent = response.request.headers if response.request is not None else {}
+            vary = {name: sent.get(name) for name in names}
+        entry = CachedResponse(url, response.status_code, response.text, etag, last_modified,
+                               now + lifetime, len(response.content), vary)
+        self._save(entry)
+        return entry
+
+    def refresh(self, entry: CachedResponse, headers: Mapping[str, str], now: float) -> CachedResponse:
+        """Apply a 304 response: new freshness and validators, same body."""
+        lifetime = freshness_lifetime(headers, now)
+        fresh = CachedResponse(entry.url, entry.status_code, entry.text,
+                               headers.get("ETag", entry.etag),
+                               headers.get("Last-Modified", entry.last_modified),
+                               now + (lifetime or 0.0), entry.size, entry.vary)
+        self._save(fresh)
+        return fresh
+
+    def _save(self, entry: CachedResponse) -> None:
+        with self._lock:
+            self.counters["stores"] += 1
+            self._insert(entry)
+        if self.persistence is None:
+            return
+        # Written directly (not via StatePersistence.save, which prints)
+        filename = self._filename(entry.url)
+        size = write_atomic(self._path(filename), (json.dumps(entry.to_dict()).encode(),))
+        with self._lock:
+            self.disk_used += size - self._disk.pop(filename, 0)
+            self._disk[filename] = size
+            doomed = self._trim_disk()
+        self._remove_files(doomed)
+
+    def _trim_disk(self) -> List[str]:
+        """Drop least-recently-used files from the disk index; returns their names."""
+        doomed = []
+        while self._disk and (self.disk_used > self.disk_bytes or len(self._disk) > self.disk_entries):
+            name, size = self._disk.popitem(last=False)
+            self.disk_used -= size
+            self.counters["disk_evictions"] += 1
+            doomed.append(name)
+        return doomed
+
+    def _remove_files(self, names: Iterable[str]) -> None:
+        for name in names:
+            try:
+                os.remove(self._path(name))
+            except FileNotFoundError:
+                pass
+
+    def _insert(self, entry: CachedResponse) -> None:
+        entries = self._entries
+        old = entries.pop(entry.url, None)
+        if old is not None:
+            self.bytes -= old.size
+        if entry.size > self.max_bytes or self.max_entries <= 0:
+            return
+        entries[entry.url] = entry
+        self.bytes += entry.size
+        while self.bytes > self.max_bytes or len(entries) > self.max_entries:
+            _, evicted = entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.counters["evictions"] += 1
+
+    def invalidate(self, url: str) -> bool:
+        """Forget ``url`` in memory and on disk."""
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry is not None:
+                self.bytes -= entry.size
+                self.counters["invalidations"] += 1
+        if self.persistence is not None:
+            filename = self._filename(url)
+            with self._lock:
+                self.disk_used -= self._disk.pop(filename, 0)
+            self._remove_files((filename,))
+        return entry is not None
+
+    def record(self, outcome: str, started: float) -> None:
+        with self._lock:
+            self.counters[outcome] += 1
+            self._latency[outcome].append(time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, hit rate and per-outcome latency percentiles (ms)."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.counters, entries=len(self._entries), bytes=self.bytes)
+            latency = {outcome: list(samples) for outcome, samples in self._latency.items()}
+        total = sum(stats[outcome] for outcome in self.OUTCOMES)
+        stats["hit_rate"] = stats["hits"] / total if total else 0.0
+        # Requests answered without downloading their own copy of the body
+        stats["saved_rate"] = (total - stats["misses"]) / total if total else 0.0
+        for outcome, samples in latency.items():
+            if samples:
+                p50, p99 = np.percentile(np.array(samples) * 1e3, [50, 99])
+                stats[f"{outcome}_p50_ms"] = float(p50)
+                stats[f"{outcome}_p99_ms"] = float(p99)
+        return stats
+
+
 class LegacyBridge:
-    def __init__(self, firewall=None, persistence=None, crypto=None):
+    def __init__(self, firewall=None, persistence=None, crypto=None,
+                 max_per_host: int = 10, max_hosts: int = 32, max_in_flight: int = 16,
+                 timeout: float = 5, cache_bytes: int = 32 * 1024 * 1024, cache_entries: int = 4096,
+                 cache_to_disk: bool = False):
         self.firewall = firewall
         self.persistence = persistence
         self.crypto = crypto
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        # Non-blocking pool: a stream the caller never finishes holds its
+        # connection, so a blocking checkout (requests has no pool timeout)
+        # could stall every later request; extra connections are simply
+        # discarded instead of kept alive. Concurrency is capped by send_many.
+        self._adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=max_per_host, pool_block=False)
+        self._local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.cache = ResponseCache(cache_bytes, cache_entries, persistence if cache_to_disk else None)
+        self._inflight: Dict[str, Future] = {}
         logger.info("✅ LegacyBridge initialized")
 
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+        return session
+
     def send_http(self, url: str, method: str = "GET", data: dict = None):
         """
         Send a simple HTTP request to legacy internet.
         """
+        logger.info(f"🌐 Sending {method} request to {url}")
+        response = self._request(url, method, data)
+        if response is None:
+            return None
+        logger.info(f"✅ Response [{response.status_code}]: {response.text[:80]}...")
+        return response.text
+
+    def _request(self, url: str, method: str = "GET", data: dict = None):
         try:
-            logger.info(f"🌐 Sending {method} request to {url}")
             if method.upper() == "GET":
-                response = requests.get(url, timeout=5)
-            elif method.upper() == "POST":
-                response = requests.post(url, json=data, timeout=5)
+                return self._get(url)
+            if method.upper() == "POST":
+                # An unsafe method invalidates what we hold for the target
+                self.cache.invalidate(url)
+                return self._session().post(url, json=data, timeout=self.timeout)
+            logger.warning(f"⚠️ Unsupported method: {method}")
+            return None
+        except Exception as e:
+            logger.error(f"❌ LegacyBridge request failed: {e}")
+            return None
+
+    def _get(self, url: str):
+        """GET through the cache, sharing one upstream fetch per URL."""
+        started = time.perf_counter()
+        cache = self.cache
+        sent = self._session().headers
+        entry = cache.lookup(url, sent)
+        if entry is not None and entry.fresh(time.time()):
+            cache.record("hits", started)
+            return entry
+        with self._lock:
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = self._inflight[url] = Future()
+        if not leader:
+            response = future.result()
+            cache.record("coalesced", started)
+            return response
+        try:
+            # The previous leader may have stored it since our lookup
+            entry = cache.lookup(url, sent)
+            if entry is not None and entry.fresh(time.time()):
+                cache.record("hits", started)
+                future.set_result(entry)
+                return entry
+            headers = entry.validators() if entry is not None else {}
+            response = self._session().get(url, headers=headers, timeout=self.timeout)
+            now = time.time()
+            if response.status_code == 304 and entry is not None:
+                response = cache.refresh(entry, response.headers, now)
+                cache.record("revalidated", started)
             else:
-                logger.warning(f"⚠️ Unsupported method: {method}")
-                return None
+                response = cache.store(url, response, now) or response
+                cache.record("misses", started)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[url]
+
+    def _fetch(self, url: str, method: str = "GET", data: dict = None) -> Optional[str]:
+        """send_many worker: like send_http without per-request INFO logging."""
+        response = self._request(url, method, data)
+        return None if response is None else response.text
 
-            logger.info(f"✅ Response [{response.status_code}]: {response.text[:80]}...")
-            return response.text
+    def stream_http(self, url: str, method: str = "GET", data: dict = None,
+                    chunk_size: int = CHUNK_SIZE, encrypt: bool = False) -> Iterator[bytes]:
+        """
+        Yield the response body as raw byte chunks without buffering it.
+
+        The request is sent when iteration starts and its connection goes
+        back to the pool once the iterator is exhausted, closed or garbage
+        collected; until then it stays checked out, but abandoned streams
+        never block other requests. With
+        ``encrypt=True`` the chunks are passed through the crypto engine's
+        ``encrypt_stream``. Streams bypass the response cache; network
+        errors and non-2xx statuses are raised to the caller.
+        """
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported method: {method}")
+        if encrypt and self.crypto is None:
+            raise ValueError("LegacyBridge has no crypto engine to encrypt with")
+        chunks = self._stream(url, method.upper(), data, chunk_size)
+        return self.crypto.encrypt_stream(chunks) if encrypt else chunks
+
+    def _stream(self, url: str, method: str, data: Optional[dict], chunk_size: int) -> Iterator[bytes]:
+        if method == "POST":
+            self.cache.invalidate(url)
+        with self._session().request(method, url, json=data, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
+    def download(self, url: str, dest: Union[str, BinaryIO] = None, filename: str = None,
+                 method: str = "GET", data: dict = None, chunk_size: int = CHUNK_SIZE,
+                 encrypt: bool = False) -> Optional[int]:
+        """
+        Stream a response body to ``dest`` (a path or writable binary file)
+        or to ``filename`` in the persistence storage. Returns the number of
+        bytes written (ciphertext when ``encrypt``), or None on failure.
+        """
+        if (dest is None) == (filename is None):
+            raise ValueError("Pass exactly one of dest or filename")
+        if filename is not None and self.persistence is None:
+            raise ValueError("LegacyBridge has no persistence to store into")
+        logger.info(f"📥 Streaming {method} {url} to {filename or dest}")
+        try:
+            chunks = self.stream_http(url, method, data, chunk_size, encrypt)
+            if filename is not None:
+                written = self.persistence.save_stream(filename, chunks)
+            elif isinstance(dest, (str, os.PathLike)):
+                written = write_atomic(os.fspath(dest), chunks)
+            else:
+                written = _copy(chunks, dest)
         except Exception as e:
-            logger.error(f"❌ LegacyBridge request failed: {e}")
+            logger.error(f"❌ LegacyBridge download failed: {e}")
+            return None
+        logger.info(f"✅ Downloaded {written} bytes from {url}")
+        return written
+
+    def send_many(
+        self,
+        requests_: Iterable[RequestSpec],
+        max_in_flight: Optional[int] = None,
+        as_completed: bool = False,
+    ) -> Union[List[Optional[str]], Iterator[Tuple[int, Optional[str]]]]:
+        """
+        Send many requests concurrently over the pooled session.
+
+        At most ``max_in_flight`` requests are outstanding at once (and
+        never more than ``max_per_host`` connections to one host). Returns
+        the response texts in input order, or with ``as_completed=True``
+        an iterator of ``(index, text)`` pairs as responses arrive. Failed
+        requests yield None, as with :meth:`send_http`.
+        """
+        limit = max(1, min(max_in_flight or self.max_in_flight, self.max_in_flight))
+        stream = self._run_many(requests_, limit)
+        if as_completed:
+            return stream
+        results: Dict[int, Optional[str]] = dict(stream)
+        logger.info(f"🌐 LegacyBridge completed {len(results)} requests ({limit} in flight)")
+        return [results[i] for i in range(len(results))]
+
+    def _run_many(self, requests_: Iterable[RequestSpec], limit: int) -> Iterator[Tuple[int, Optional[str]]]:
+        executor = self._pool()
+        specs = enumerate(requests_)
+        pending: Dict[Future, int] = {}
+
+        def submit() -> bool:
+            for index, spec in specs:
+                kwargs = self._spec(spec)
+                if kwargs is None:
+                    future = Future()
+                    future.set_result(None)
+                else:
+                    future = executor.submit(self._fetch, **kwargs)
+                pending[future] = index
+                return True
+            return False
+
+        while len(pending) < limit and submit():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                submit()
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.error(f"❌ LegacyBridge request {index} failed: {e}")
+                    text = None
+                yield index, text
+
+    _SPEC_FIELDS = ("url", "method", "data")
+
+    @classmethod
+    def _spec(cls, spec: RequestSpec) -> Optional[Dict[str, Any]]:
+        """send_http kwargs for a send_many spec, or None (logged) if malformed."""
+        if isinstance(spec, str):
+            return {"url": spec}
+        if isinstance(spec, dict):
+            kwargs = spec
+        elif isinstance(spec, (tuple, list)) and 1 <= len(spec) <= len(cls._SPEC_FIELDS):
+            kwargs = dict(zip(cls._SPEC_FIELDS, spec))
+        else:
+            kwargs = None
+        if kwargs is None or "url" not in kwargs or not set(kwargs) <= set(cls._SPEC_FIELDS):
+            logger.error(f"❌ Malformed LegacyBridge request spec: {spec!r}")
             return None
+        return kwargs
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_in_flight, thread_name_prefix="legacy-bridge")
+            return self._executor
+
+    def close(self) -> None:
+        """Stop worker threads and close pooled connections."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self._adapter.close()
@@ -20,59 +20,424 @@ Author: Mohamed Orhan Zeinel
 
 import logging
 import random
-from typing import Dict, Any, List
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 
 logger = logging.getLogger(__name__)
 
 
+class PatternIds:
+    """
+    Compact pattern → id map over a shared pattern list.
+
+    Most ids live in two parallel NumPy arrays ordered by the patterns'
+    ``hash()`` (int64 hash, uint32 id), found by binary search and
+    confirmed against the pattern list, so a pattern costs 12 bytes
+    instead of a dict slot plus a boxed int. Recent inserts wait in a
+    small dict that is merged in once it outgrows ``1/16`` of the table.
+    """
+
+    MERGE_MIN = 4096
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self._hashes = np.empty(0, dtype=np.int64)
+        self._ids = np.empty(0, dtype=np.uint32)
+        self._recent: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._recent)
+
+    def __contains__(self, pattern: object) -> bool:
+        return self.get(pattern) is not None
+
+    def __getitem__(self, pattern: str) -> int:
+        pid = self.get(pattern)
+        if pid is None:
+            raise KeyError(pattern)
+        return pid
+
+    def __setitem__(self, pattern: str, pid: int) -> None:
+        """Record a new pattern's id (patterns are never re-assigned)."""
+        self._recent[pattern] = pid
+        if len(self._recent) > max(self.MERGE_MIN, len(self._hashes) >> 4):
+            self.compact()
+
+    def get(self, pattern: object, default: Optional[int] = None) -> Optional[int]:
+        pid = self._recent.get(pattern)
+        if pid is not None:
+            return pid
+        h = hash(pattern)
+        hashes, ids, patterns = self._hashes, self._ids, self.patterns
+        i = int(hashes.searchsorted(h))
+        while i < len(hashes) and hashes[i] == h:
+            pid = int(ids[i])
+            if patterns[pid] == pattern:
+                return pid
+            i += 1
+        return default
+
+    def get_many(self, patterns: Sequence[str]) -> np.ndarray:
+        """Ids of ``patterns`` (``-1`` for unknown), resolved with one vectorized search."""
+        n = len(patterns)
+        result = np.full(n, -1, dtype=np.int64)
+        if len(self._hashes) and n:
+            wanted = np.fromiter(map(hash, patterns), dtype=np.int64, count=n)
+            pos = np.minimum(self._hashes.searchsorted(wanted), len(self._hashes) - 1)
+            hit = self._hashes[pos] == wanted
+            result[hit] = self._ids[pos[hit]]
+        # Confirm candidates; misses and hash collisions take the scalar path
+        known = self.patterns
+        for k, (pid, pattern) in enumerate(zip(result.tolist(), patterns)):
+            if pid < 0 or known[pid] != pattern:
+                result[k] = self.get(pattern, -1)
+        return result
+
+    def compact(self) -> None:
+        """Merge recent inserts into the sorted arrays."""
+        if not self._recent:
+            return
+        recent = self._recent
+        hashes = np.concatenate([self._hashes, np.fromiter(map(hash, recent), dtype=np.int64, count=len(recent))])
+        ids = np.concatenate([self._ids, np.fromiter(recent.values(), dtype=np.uint32, count=len(recent))])
+        order = np.argsort(hashes, kind="stable")
+        self._hashes, self._ids = hashes[order], ids[order]
+        self._recent = {}
+
+
+class PatternIndex:
+    """
+    Substring index over learned patterns.
+
+    Every distinct 1-, 2- and 3-gram of a pattern maps to an ``array('I')``
+    of pattern ids (ascending, since ids are assigned on insert). A query
+    of up to three characters is answered exactly by its own posting list;
+    a longer one intersects its trigrams' lists (rarest first, by binary
+    search) and verifies the survivors with ``in``. Cost therefore scales with the
+    candidate count instead of the total pattern text, and learning a
+    pattern only appends to its grams' lists.
+    """
+
+    GRAM = 3
+
+    def __init__(self):
+        self.patterns: List[str] = []
+        self.ids = PatternIds(self.patterns)
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self.ids
+
+    def add(self, pattern: str) -> int:
+        """Index ``pattern`` (if new) and return its id."""
+        pid = self.ids.get(pattern)
+        if pid is not None:
+            return pid
+        pid = self.ids[pattern] = len(self.patterns)
+        self.patterns.append(pattern)
+        postings = self._postings
+        grams = set()
+        for n in range(1, self.GRAM + 1):
+            grams.update(pattern[i:i + n] for i in range(len(pattern) - n + 1))
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is None:
+                ids = postings[gram] = array("I")
+            ids.append(pid)
+        return pid
+
+    def matches(self, query: str) -> np.ndarray:
+        """Ascending ids of every pattern containing ``query``."""
+        if not query:
+            return np.arange(len(self.patterns), dtype=np.int64)
+        postings = self._postings
+        if len(query) <= self.GRAM:
+            ids = postings.get(query)
+            return np.frombuffer(ids, dtype=np.uint32).astype(np.int64) if ids else np.empty(0, np.int64)
+        lists = []
+        for i in range(len(query) - self.GRAM + 1):
+            ids = postings.get(query[i:i + self.GRAM])
+            if ids is None:
+                return np.empty(0, np.int64)
+            lists.append(ids)
+        lists.sort(key=len)
+        candidates = np.frombuffer(lists[0], dtype=np.uint32).astype(np.int64)
+        for ids in lists[1:]:
+            if len(candidates) <= 16:
+                break
+            # Both lists are sorted: keep candidates present in the next rarest
+            other = np.frombuffer(ids, dtype=np.uint32)
+            pos = np.searchsorted(other, candidates)
+            pos[pos == len(other)] = 0
+            candidates = candidates[other[pos] == candidates]
+            del other
+        patterns = self.patterns
+        return candidates[[query in patterns[pid] for pid in candidates.tolist()]]
+
+    def search(self, query: str) -> Iterator[int]:
+        """Iterate the ids of every pattern containing ``query``."""
+        return iter(self.matches(query).tolist())
+
+    def top(self, query: str, k: int, weights: np.ndarray) -> List[int]:
+        """Ids of the ``k`` heaviest matches, earliest-learned first on ties."""
+        ids = self.matches(query)
+        if not len(ids) or k <= 0:
+            return []
+        w = weights[ids]
+        if len(ids) > k:
+            # ids arrive ascending, so boundary ties keep the earliest ones
+            kth = np.partition(w, len(w) - k)[len(w) - k]
+            above = w > kth
+            keep = above | ((w == kth) & (np.cumsum(w == kth) <= k - int(above.sum())))
+            ids, w = ids[keep], w[keep]
+        return ids[np.lexsort((ids, -w))].tolist()
+
+
+class PatternStore(Mapping):
+    """
+    Compact pattern → weight mapping.
+
+    Patterns get dense ids from a :class:`PatternIndex` (looked up through
+    :class:`PatternIds`); weights live in a float32 NumPy array indexed by
+    id (grown by doubling). Beyond the pattern list a pattern costs about
+    16 bytes instead of a dict slot and a boxed float. Behaves like the
+    former ``Dict[str, float]``.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.index = PatternIndex()
+        self._weights = np.zeros(capacity, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index.patterns)
+
+    def __contains__(self, pattern: object) -> bool:
+        return pattern in self.index.ids
+
+    def __getitem__(self, pattern: str) -> float:
+        return float(self._weights[self.index.ids[pattern]])
+
+    def __setitem__(self, pattern: str, weight: float) -> None:
+        pid = self.index.add(pattern)
+        self._reserve(pid + 1)
+        self._weights[pid] = weight
+
+    def update(self, weights: Dict[str, float]) -> None:
+        for pattern, weight in weights.items():
+            self[pattern] = weight
+
+    @property
+    def array(self) -> np.ndarray:
+        """Live float32 view of the weights, indexed by pattern id."""
+        return self._weights[:len(self.index)]
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._weights):
+            grown = np.zeros(max(size, 2 * len(self._weights)), dtype=np.float32)
+            grown[:len(self._weights)] = self._weights
+            self._weights = grown
+
+    def ids(self, patterns: Sequence[str]) -> np.ndarray:
+        """Map patterns to ids (``-1`` for unknown) in one pass."""
+        return self.index.ids.get_many(patterns)
+
+    def add_many(self, patterns: Iterable[str], weights: np.ndarray) -> int:
+        """Add unseen patterns with the matching ``weights``; returns the count added."""
+        index, start = self.index, len(self.index)
+        fresh = [p for p in dict.fromkeys(patterns) if p not in index.ids]
+        self._reserve(start + len(fresh))
+        for pattern in fresh:
+            index.add(pattern)
+        index.ids.compact()
+        self._weights[start:start + len(fresh)] = weights[:len(fresh)]
+        return len(fresh)
+
+
+class PredictionCache:
+    """
+    Bounded LRU (with optional TTL) of top-k results keyed by query.
+
+    An entry keeps the largest ``k`` computed for its query, so smaller
+    requests are served by slicing. A query's result can only change when
+    a pattern containing it is learned or reinforced, so
+    :meth:`invalidate` drops exactly the cached queries that are
+    substrings of the touched pattern, choosing between enumerating the
+    pattern's substrings and scanning the cache, whichever is smaller.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, int, List[Tuple[str, float]]]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, query: str, k: int) -> Optional[List[Tuple[str, float]]]:
+        entry = self._entries.get(query)
+        if entry is not None:
+            expires, cached_k, result = entry
+            if expires < time.monotonic():
+                del self._entries[query]
+                self.stats["expired"] += 1
+            elif k <= cached_k or len(result) < cached_k:
+                self._entries.move_to_end(query)
+                self.stats["hits"] += 1
+                return result[:k]
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, query: str, k: int, result: List[Tuple[str, float]]) -> None:
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[query] = (expires, k, result)
+        self._entries.move_to_end(query)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, pattern: str) -> int:
+        """Drop cached queries whose result may include ``pattern``."""
+        entries = self._entries
+        if not entries:
+            return 0
+        n = len(pattern)
+        if n * (n + 1) // 2 < len(entries):
+            keys = {pattern[i:j] for i in range(n) for j in range(i + 1, n + 1)}
+            keys.add("")
+            doomed = [q for q in keys if q in entries]
+        else:
+            doomed = [q for q in entries if q in pattern]
+        for q in doomed:
+            del entries[q]
+        self.stats["invalidations"] += len(doomed)
+        return len(doomed)
+
+    def invalidate_ids(self, index: PatternIndex, touched: np.ndarray) -> int:
+        """Batch form: drop cached queries matching any id flagged in ``touched``."""
+        doomed = [q for q in self._entries if touched[index.matches(q)].any()]
+        for q in doomed:
+            del self._entries[q]
+        self.stats["invalidations"] += len(doomed)
+        return len(doomed)
+
+
 class NeuralNet:
     """
     NeuralNet: A lightweight adaptive intelligence simulator
     for Internet ∞. It learns patterns and predicts outcomes.
     """
 
-    def __init__(self, name: str = "NeuralNet"):
+    def __init__(self, name: str = "NeuralNet", cache_size: int = 4096, cache_ttl: Optional[float] = None):
         self.name = name
-        self.patterns: List[str] = []
-        self.weights: Dict[str, float] = {}
+        self.weights = PatternStore()
+        self.index = self.weights.index
+        self.patterns: List[str] = self.index.patterns
+        # Writes through learn_*/reinforce* keep the cache exact; direct
+        # ``weights[...]`` assignment bypasses it.
+        self.cache = PredictionCache(cache_size, cache_ttl)
         logger.info(f"🧠 {self.name} initialized")
 
     def learn_pattern(self, pattern: str) -> bool:
         """Learn a new communication or user pattern."""
-        if pattern not in self.patterns:
-            self.patterns.append(pattern)
+        if pattern not in self.weights:
             self.weights[pattern] = random.uniform(0.5, 1.0)
+            self.cache.invalidate(pattern)
             logger.info(f"🧩 Learned new pattern: {pattern}")
             return True
         logger.warning(f"⚠️ Pattern already known: {pattern}")
         return False
 
+    def learn_batch(self, patterns: Iterable[str]) -> int:
+        """Learn many patterns at once; returns how many were new."""
+        patterns = list(patterns)
+        start = len(self.patterns)
+        learned = self.weights.add_many(patterns, np.random.uniform(0.5, 1.0, len(patterns)))
+        if learned and len(self.cache):
+            touched = np.zeros(len(self.patterns), dtype=bool)
+            touched[start:] = True
+            self.cache.invalidate_ids(self.index, touched)
+        logger.info(f"🧩 Learned {learned} new patterns ({len(patterns) - learned} already known)")
+        return learned
+
     def predict(self, input_pattern: str) -> str:
         """Predict the best matching pattern given input."""
-        matches = [p for p in self.patterns if input_pattern in p]
-        if not matches:
+        top = self.predict_top(input_pattern, 1)
+        if not top:
             logger.warning(f"❓ Unknown input pattern: {input_pattern}")
             return "Unknown pattern"
 
-        best = max(matches, key=lambda x: self.weights.get(x, 0))
+        best = top[0][0]
         prediction = f"Prediction: {best} (confidence={self.weights[best]:.2f})"
         logger.info(f"🔮 {prediction}")
         return prediction
 
+    def predict_top(self, input_pattern: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(pattern, weight)`` matches, best first."""
+        result = self.cache.get(input_pattern, k)
+        if result is None:
+            weights = self.weights.array
+            ids = self.index.top(input_pattern, k, weights)
+            result = [(self.patterns[pid], float(weights[pid])) for pid in ids]
+            self.cache.put(input_pattern, k, result)
+        return result
+
     def reinforce(self, pattern: str, success: bool) -> None:
         """Reinforce (reward or penalize) learned patterns."""
-        if pattern in self.weights:
+        pid = self.index.ids.get(pattern)
+        if pid is not None:
             delta = 0.05 if success else -0.05
-            self.weights[pattern] = max(0.0, min(1.0, self.weights[pattern] + delta))
+            weights = self.weights.array
+            weights[pid] = max(0.0, min(1.0, float(weights[pid]) + delta))
+            self.cache.invalidate(pattern)
             logger.info(
-                f"🔧 Reinforced pattern: {pattern} → {self.weights[pattern]:.2f}"
+                f"🔧 Reinforced pattern: {pattern} → {weights[pid]:.2f}"
             )
 
+    def reinforce_batch(
+        self, patterns: Union[Sequence[str], np.ndarray], outcomes: Sequence[bool]
+    ) -> int:
+        """
+        Apply many reinforcement events in one vectorized update.
+
+        ``patterns`` may be pattern strings or ids from ``weights.ids``;
+        unknown patterns are ignored. Deltas for a repeated pattern are
+        summed before clipping to [0, 1]. Returns the events applied.
+        """
+        if isinstance(patterns, np.ndarray) and patterns.dtype.kind in "iu":
+            ids = patterns.astype(np.int64, copy=False)
+        else:
+            ids = self.weights.ids(list(patterns))
+        deltas = np.where(np.asarray(outcomes, dtype=bool), 0.05, -0.05)
+        weights = self.weights.array
+        known = (ids >= 0) & (ids < len(weights))
+        total = np.bincount(ids[known], weights=deltas[known], minlength=len(weights))
+        np.clip(weights + total, 0.0, 1.0, out=weights, casting="unsafe")
+        applied = int(known.sum())
+        if applied and len(self.cache):
+            self.cache.invalidate_ids(self.index, total != 0)
+        logger.info(f"🔧 Reinforced {applied} events across {len(weights)} patterns")
+        return applied
+
     def show_state(self) -> Dict[str, Any]:
         """Return current learned patterns and weights."""
         return {
             "patterns": self.patterns,
-            "weights": self.weights,
+            "weights": dict(self.weights.items()),
             "total_learned": len(self.patterns),
+            "cache": dict(self.cache.stats),
         }
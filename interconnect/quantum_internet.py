@@ -18,72 +18,594 @@ could adopt quantum communication as a default layer.
 Author: Mohamed Orhan Zeinel  
 """
 
+import json
 import logging
-import secrets
+import queue
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
+Payload = Union[str, bytes, bytearray, memoryview]
+
+
+def xor_keystream(data: Union[bytes, bytearray, memoryview], key: bytes, offset: int = 0) -> bytes:
+    """
+    XOR ``data`` with the repeating ``key`` starting at keystream ``offset``.
+
+    The whole buffer is XORed as one big integer, so the work happens in
+    C regardless of payload size (no per-byte Python loop).
+    """
+    data = memoryview(data).cast("B")
+    n = len(data)
+    if not n:
+        return b""
+    shift = offset % len(key)
+    stream = (key[shift:] + key[:shift]) * (n // len(key) + 1)
+    return (int.from_bytes(data, "little") ^ int.from_bytes(stream[:n], "little")).to_bytes(n, "little")
+
+
+def xor_keystream_chunks(chunks: Iterable[Union[bytes, bytearray, memoryview]], key: bytes) -> Iterator[bytes]:
+    """Streaming :func:`xor_keystream` that carries the key offset across chunks."""
+    offset = 0
+    for chunk in chunks:
+        yield xor_keystream(chunk, key, offset)
+        offset += memoryview(chunk).nbytes
+
+
+class KeyPoolExhausted(RuntimeError):
+    """Raised when a key must rotate but no replacement key can be produced."""
+
+
+class KeyPool:
+    """
+    Per-pair pools of pre-generated QKD keys.
+
+    ``generate(count)`` returns up to ``count`` fresh keys in one call, so
+    refills can run a single batched handshake.
+
+    Each node pair has one active key plus a queue of spare keys. The
+    active key rotates once it has protected ``byte_budget`` bytes or
+    ``max_messages`` messages, or when it is older than ``ttl`` seconds;
+    retired keys are simply dropped. Whenever a pool falls to
+    ``low_water`` spares it is topped back up to ``size`` by a background
+    worker, so senders only generate a key inline if a pool runs dry. If
+    that inline generation fails too, :meth:`take` raises
+    :class:`KeyPoolExhausted` rather than reuse an exhausted key.
+
+    The worker only holds a weak reference to the pool and exits on
+    :meth:`close` or once the pool is garbage collected.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[int], List[str]],
+        size: int = 32,
+        low_water: int = 8,
+        byte_budget: Optional[int] = 1 << 20,
+        max_messages: Optional[int] = None,
+        ttl: float = 3600.0,
+        background: bool = True,
+    ):
+        self.generate = generate
+        self.size = size
+        self.low_water = low_water
+        self.byte_budget = byte_budget
+        self.max_messages = max_messages
+        self.ttl = ttl
+        self.background = background
+        self._spares: Dict[Tuple[str, str], Deque[Tuple[str, float]]] = {}
+        self._active: Dict[Tuple[str, str], List[Any]] = {}
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, str]]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        weakref.finalize(self, KeyPool._shutdown, self._stop, self._queue)
+        self.stats: Dict[str, int] = {"rotations": 0, "expired": 0, "inline_keys": 0, "refilled": 0}
+
+    @staticmethod
+    def pair(node1: str, node2: str) -> Tuple[str, str]:
+        """Canonical (order-independent) key for a node pair."""
+        return (node1, node2) if node1 <= node2 else (node2, node1)
+
+    def prime(self, pair: Tuple[str, str], key: str) -> None:
+        """Install ``key`` as the active key of ``pair`` and schedule a refill."""
+        with self._lock:
+            self._spares.setdefault(pair, deque())
+            self._active[pair] = [key, 0, 0, time.monotonic() + self.ttl]
+        self._schedule(pair)
+
+    def take(self, pair: Tuple[str, str], nbytes: int = 0) -> Optional[str]:
+        """
+        Return the key protecting the next ``nbytes``, rotating if needed.
+
+        When the pool has run dry the replacement key is generated with the
+        lock released, so other pairs (and the refill worker) keep going.
+        Raises :class:`KeyPoolExhausted` if that generation fails.
+        """
+        fresh: Optional[List[str]] = None
+        while True:
+            with self._lock:
+                active = self._active.get(pair)
+                if active is None:
+                    return None
+                now = time.monotonic()
+                if fresh:
+                    self._spares[pair].appendleft((fresh[0], now))
+                    self.stats["inline_keys"] += 1
+                rotate = self._exhausted(active, now, nbytes)
+                key = self._next_spare(pair, now) if rotate else None
+                if not rotate or key is not None:
+                    if rotate:
+                        if now >= active[3]:
+                            self.stats["expired"] += 1
+                        active = self._active[pair] = [key, 0, 0, now + self.ttl]
+                        self.stats["rotations"] += 1
+                    active[1] += nbytes
+                    active[2] += 1
+                    key = active[0]
+                    low = len(self._spares[pair]) <= self.low_water
+                    break
+                if fresh is not None:
+                    # The exhausted key stays exhausted; a later take retries
+                    raise KeyPoolExhausted(f"No fresh QKD key available for {pair[0]} ↔ {pair[1]}")
+            fresh = self.generate(1)
+        if low:
+            self._schedule(pair)
+        return key
+
+    def has_key(self, pair: Tuple[str, str]) -> bool:
+        """Whether ``pair`` has an active key."""
+        return pair in self._active
+
+    def spares(self, pair: Tuple[str, str]) -> int:
+        """Number of pre-generated keys waiting for ``pair``."""
+        return len(self._spares.get(pair, ()))
+
+    def refill(self, pair: Tuple[str, str]) -> None:
+        """Top the spare queue of ``pair`` up to ``size`` (keys generated unlocked)."""
+        with self._lock:
+            missing = self.size - len(self._spares.get(pair, ()))
+        fresh = self.generate(missing) if missing > 0 else []
+        with self._lock:
+            self._pending.discard(pair)
+            spares = self._spares.get(pair)
+            if spares is None:
+                return
+            created = time.monotonic()
+            spares.extend((key, created) for key in fresh[: self.size - len(spares)])
+            self.stats["refilled"] += len(fresh)
+
+    def close(self) -> None:
+        """Stop the background refill worker and wait for it to exit."""
+        KeyPool._shutdown(self._stop, self._queue)
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    @staticmethod
+    def _shutdown(stop: threading.Event, work: "queue.Queue[Optional[Tuple[str, str]]]") -> None:
+        stop.set()
+        work.put(None)
+
+    def _exhausted(self, active: List[Any], now: float, nbytes: int) -> bool:
+        used = bool(active[1] or active[2])
+        return (
+            now >= active[3]
+            or (used and self.byte_budget is not None and active[1] + nbytes > self.byte_budget)
+            or (self.max_messages is not None and active[2] >= self.max_messages)
+        )
+
+    def _next_spare(self, pair: Tuple[str, str], now: float) -> Optional[str]:
+        spares = self._spares[pair]
+        while spares:
+            key, created = spares.popleft()
+            if now < created + self.ttl:
+                return key
+            self.stats["expired"] += 1
+        return None
+
+    def _schedule(self, pair: Tuple[str, str]) -> None:
+        with self._lock:
+            if pair in self._pending:
+                return
+            self._pending.add(pair)
+        if not self.background or self._stop.is_set():
+            self.refill(pair)
+            return
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=KeyPool._run, args=(weakref.ref(self), self._queue, self._stop),
+                name="qkd-key-pool", daemon=True,
+            )
+            self._worker.start()
+        self._queue.put(pair)
+
+    @staticmethod
+    def _run(ref: "weakref.ref[KeyPool]", work: "queue.Queue[Optional[Tuple[str, str]]]",
+             stop: threading.Event) -> None:
+        # Queued refills are drained before the None sent by close()
+        while True:
+            pair = work.get()
+            pool = ref()
+            if pair is None or pool is None:
+                return
+            pool.refill(pair)
+            del pool
+
+
+def _binary_entropy(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+
+
+class BB84Simulator:
+    """
+    Vectorized BB84 key-distribution simulator.
+
+    Each run simulates ``n_qubits`` per node pair for many pairs at once,
+    with every step an array operation over a ``(pairs, n_qubits)`` bit
+    matrix: Alice's random bits and bases, Bob's random bases and
+    measurements, channel bit flips at ``error_rate``, basis sifting, QBER
+    estimation on a disclosed ``sample_fraction`` of the sifted bits, and
+    privacy amplification with a random Toeplitz hash. Error correction
+    is assumed ideal; its leakage is charged against the secure length
+    (Shor–Preskill bound ``m·(1 − 2·h(QBER))``). Pairs whose QBER exceeds
+    ``max_qber`` or whose secure length falls short of ``key_bits`` abort.
+    """
+
+    def __init__(
+        self,
+        n_qubits: int = 4096,
+        error_rate: float = 0.02,
+        sample_fraction: float = 0.1,
+        max_qber: float = 0.11,
+        key_bits: int = 128,
+        seed: Optional[int] = None,
+    ):
+        self.n_qubits = n_qubits
+        self.error_rate = error_rate
+        self.sample_fraction = sample_fraction
+        self.max_qber = max_qber
+        self.key_bits = key_bits
+        self.rng = np.random.default_rng(seed)
+        self.last_qber: np.ndarray = np.empty(0)
+        self.stats: Dict[str, int] = {"runs": 0, "qubits": 0, "sifted_bits": 0, "keys": 0, "aborted": 0}
+
+    def run(self, pairs: int = 1) -> List[Optional[str]]:
+        """Simulate ``pairs`` handshakes; returns a hex key or None (abort) per pair."""
+        rng, n = self.rng, self.n_qubits
+        alice_bits = rng.integers(0, 2, (pairs, n), dtype=np.uint8)
+        alice_bases = rng.integers(0, 2, (pairs, n), dtype=np.uint8)
+        bob_bases = rng.integers(0, 2, (pairs, n), dtype=np.uint8)
+
+        sifted = alice_bases == bob_bases
+        guesses = rng.integers(0, 2, (pairs, n), dtype=np.uint8)
+        bob_bits = np.where(sifted, alice_bits, guesses)
+        bob_bits ^= (rng.random((pairs, n)) < self.error_rate).astype(np.uint8)
+
+        sample = sifted & (rng.random((pairs, n)) < self.sample_fraction)
+        errors = (alice_bits != bob_bits) & sample
+        self.last_qber = errors.sum(axis=1) / np.maximum(sample.sum(axis=1), 1)
+
+        key_mask = sifted & ~sample
+        remaining = key_mask.sum(axis=1)
+        m = int(remaining.min()) if pairs else 0
+        secure = np.floor(m * (1 - 2 * _binary_entropy(self.last_qber)))
+        ok = (self.last_qber <= self.max_qber) & (secure >= self.key_bits)
+
+        keys: List[Optional[str]] = [None] * pairs
+        if m >= self.key_bits and ok.any():
+            # Left-pack every row's key bits, then hash the first m of them
+            order = np.argsort(~key_mask[ok], axis=1, kind="stable")[:, :m]
+            raw = np.take_along_axis(alice_bits[ok], order, axis=1)
+            seed = rng.integers(0, 2, m + self.key_bits - 1, dtype=np.uint8)
+            toeplitz = sliding_window_view(seed, m)[: self.key_bits, ::-1]
+            hashed = (raw.astype(np.float32) @ toeplitz.T.astype(np.float32)).astype(np.int64) & 1
+            packed = np.packbits(hashed.astype(np.uint8), axis=1)
+            for row, index in enumerate(np.flatnonzero(ok)):
+                keys[index] = packed[row].tobytes().hex()
+
+        produced = sum(key is not None for key in keys)
+        self.stats["runs"] += 1
+        self.stats["qubits"] += pairs * n
+        self.stats["sifted_bits"] += int(sifted.sum())
+        self.stats["keys"] += produced
+        self.stats["aborted"] += pairs - produced
+        return keys
+
+
+class EntanglementGraph:
+    """
+    Adjacency-indexed entanglement graph.
+
+    Every node maps to the set of peers it shares entanglement with, so
+    pair lookups are O(1) and a node may hold any number of links.
+    ``route`` finds the shortest repeater chain between two nodes with a
+    bidirectional BFS (fewest entanglement swaps) and caches the result.
+    Removing a link drops exactly the cached routes that used it; adding
+    a link can shorten any route, so it clears the cache.
+    """
+
+    def __init__(self, max_routes: int = 4096):
+        self.max_routes = max_routes
+        self.adjacency: Dict[str, Set[str]] = {}
+        self.link_count = 0
+        self._routes: "OrderedDict[Tuple[str, str], Optional[List[str]]]" = OrderedDict()
+        self._routes_by_link: Dict[Tuple[str, str], Set[Tuple[str, str]]] = {}
+        self.stats: Dict[str, int] = {"route_hits": 0, "route_misses": 0, "routes_invalidated": 0}
+
+    def __len__(self) -> int:
+        return self.link_count
+
+    def add_node(self, node: str) -> Set[str]:
+        """Register ``node`` and return its (live) peer set."""
+        peers = self.adjacency.get(node)
+        if peers is None:
+            peers = self.adjacency[node] = set()
+        return peers
+
+    def add(self, node1: str, node2: str) -> bool:
+        """Add a link; returns False if it already existed."""
+        peers = self.add_node(node1)
+        if node2 in peers or node1 == node2:
+            return False
+        peers.add(node2)
+        self.add_node(node2).add(node1)
+        self.link_count += 1
+        if self._routes:
+            self.stats["routes_invalidated"] += len(self._routes)
+            self._routes.clear()
+            self._routes_by_link.clear()
+        return True
+
+    def add_many(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Bulk :meth:`add` (one cache flush); returns the number of new links."""
+        adjacency = self.adjacency
+        added = 0
+        for node1, node2 in pairs:
+            peers = adjacency.get(node1)
+            if peers is None:
+                peers = adjacency[node1] = set()
+            if node2 in peers or node1 == node2:
+                continue
+            peers.add(node2)
+            other = adjacency.get(node2)
+            if other is None:
+                other = adjacency[node2] = set()
+            other.add(node1)
+            added += 1
+        self.link_count += added
+        if added and self._routes:
+            self.stats["routes_invalidated"] += len(self._routes)
+            self._routes.clear()
+            self._routes_by_link.clear()
+        return added
+
+    def remove(self, node1: str, node2: str) -> bool:
+        """Remove a link; returns False if it did not exist."""
+        peers = self.adjacency.get(node1)
+        if peers is None or node2 not in peers:
+            return False
+        peers.discard(node2)
+        self.adjacency[node2].discard(node1)
+        self.link_count -= 1
+        for key in self._routes_by_link.pop(KeyPool.pair(node1, node2), ()):
+            if key in self._routes:
+                self._forget(key)
+                self.stats["routes_invalidated"] += 1
+        return True
+
+    def linked(self, node1: str, node2: str) -> bool:
+        """Return True if the two nodes share a direct link."""
+        return node2 in self.adjacency.get(node1, ())
+
+    def links(self) -> Iterator[Tuple[str, str]]:
+        """Iterate every link once."""
+        for node, peers in self.adjacency.items():
+            for peer in peers:
+                if node < peer:
+                    yield node, peer
+
+    def route(self, source: str, target: str) -> Optional[List[str]]:
+        """Shortest repeater chain from ``source`` to ``target`` (inclusive)."""
+        key = KeyPool.pair(source, target)
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            self.stats["route_hits"] += 1
+            path = self._routes[key]
+        else:
+            self.stats["route_misses"] += 1
+            path = self._search(*key)
+            self._routes[key] = path
+            if path:
+                for i in range(len(path) - 1):
+                    self._routes_by_link.setdefault(KeyPool.pair(path[i], path[i + 1]), set()).add(key)
+            if len(self._routes) > self.max_routes:
+                self._forget(next(iter(self._routes)))
+        if path is None or path[0] == source:
+            return path
+        return path[::-1]
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        path = self._routes.pop(key)
+        for i in range(len(path or ()) - 1):
+            users = self._routes_by_link.get(KeyPool.pair(path[i], path[i + 1]))
+            if users is not None:
+                users.discard(key)
+                if not users:
+                    del self._routes_by_link[KeyPool.pair(path[i], path[i + 1])]
+
+    def _search(self, source: str, target: str) -> Optional[List[str]]:
+        """Bidirectional BFS, always expanding the smaller frontier."""
+        adjacency = self.adjacency
+        if source not in adjacency or target not in adjacency:
+            return None
+        if source == target:
+            return [source]
+        front_parent: Dict[str, Optional[str]] = {source: None}
+        back_parent: Dict[str, Optional[str]] = {target: None}
+        front, back = [source], [target]
+        while front and back:
+            forward = len(front) <= len(back)
+            frontier, seen, other = (front, front_parent, back_parent) if forward else (back, back_parent, front_parent)
+            nxt = []
+            for u in frontier:
+                for v in adjacency[u]:
+                    if v in seen:
+                        continue
+                    seen[v] = u
+                    if v in other:
+                        return self._join(v, front_parent, back_parent)
+                    nxt.append(v)
+            if forward:
+                front = nxt
+            else:
+                back = nxt
+        return None
+
+    @staticmethod
+    def _join(meet: str, front_parent: Dict[str, Optional[str]], back_parent: Dict[str, Optional[str]]) -> List[str]:
+        path, node = [], meet
+        while node is not None:
+            path.append(node)
+            node = front_parent[node]
+        path.reverse()
+        node = back_parent[meet]
+        while node is not None:
+            path.append(node)
+            node = back_parent[node]
+        return path
+
 
 class QuantumInternet:
     """
     Quantum Internet: A layer built on **entanglement and QKD**.
     """
 
-    def __init__(self, name: str = "QuantumInternet"):
+    def __init__(
+        self,
+        name: str = "QuantumInternet",
+        history_size: int = 1024,
+        history_spill: Optional[str] = None,
+        bb84: Optional[BB84Simulator] = None,
+    ):
         self.name = name
         self.nodes: Dict[str, Dict[str, Any]] = {}
-        self.entanglements: List[tuple] = []
+        self.entanglements = EntanglementGraph()
         self.qkd_keys: Dict[tuple, str] = {}
-        self.key_history: List[Dict[str, Any]] = []
+        self.key_history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self.history_spill = history_spill
+        self.bb84 = bb84 or BB84Simulator()
+        # Serializes simulator runs between handshakes and the refill worker
+        self._bb84_lock = threading.Lock()
+        self.key_pool = KeyPool(self._generate_keys)
         logger.info(f"🔮 {self.name} initialized successfully.")
 
+    def close(self) -> None:
+        """Stop the key pool's background refill worker."""
+        self.key_pool.close()
+
+    def __enter__(self) -> "QuantumInternet":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
     def add_node(self, node_name: str) -> None:
         """Register a new quantum node in the network."""
         if node_name not in self.nodes:
-            self.nodes[node_name] = {"entangled_with": None, "keys": []}
+            self._register(node_name)
             logger.info(f"➕ Quantum node added: {node_name}")
 
+    def add_nodes(self, node_names: Iterable[str]) -> int:
+        """Bulk :meth:`add_node` without per-node logging; returns nodes added."""
+        added = 0
+        for node_name in node_names:
+            if node_name and node_name not in self.nodes:
+                self._register(node_name)
+                added += 1
+        return added
+
+    def entangle_many(self, pairs: Iterable[Tuple[str, str]]) -> int:
+        """Bulk :meth:`entangle` for known nodes; returns the number of new links."""
+        nodes = self.nodes
+        return self.entanglements.add_many((a, b) for a, b in pairs if a in nodes and b in nodes)
+
     def entangle(self, node1: str, node2: str) -> bool:
         """Establish quantum entanglement between two nodes."""
         if node1 in self.nodes and node2 in self.nodes:
-            self.nodes[node1]["entangled_with"] = node2
-            self.nodes[node2]["entangled_with"] = node1
-            self.entanglements.append((node1, node2))
+            self.entanglements.add(node1, node2)
             logger.info(f"⚛️ Entanglement established: {node1} ↔ {node2}")
             return True
         logger.error("❌ Failed entanglement: nodes not found.")
         return False
 
+    def disentangle(self, node1: str, node2: str) -> bool:
+        """Tear down the entanglement link between two nodes."""
+        if self.entanglements.remove(node1, node2):
+            logger.info(f"✂️ Entanglement removed: {node1} ↔ {node2}")
+            return True
+        logger.warning(f"⚠️ No entanglement between {node1} and {node2}")
+        return False
+
     def qkd_handshake(self, node1: str, node2: str) -> Optional[str]:
         """Perform a simulated Quantum Key Distribution (BB84)."""
         if node1 not in self.nodes or node2 not in self.nodes:
             logger.error("❌ QKD handshake failed: nodes not found.")
             return None
 
-        key = secrets.token_hex(16)  # 128-bit symmetric key
-        self.qkd_keys[(node1, node2)] = key
-        self.qkd_keys[(node2, node1)] = key
-        self.key_history.append({
-            "nodes": (node1, node2),
-            "key": key,
-            "time": datetime.now().isoformat(),
-            "protocol": "BB84"
-        })
+        with self._bb84_lock:
+            key = self.bb84.run(1)[0]
+            qber = float(self.bb84.last_qber[0])
+        if key is None:
+            logger.error(f"❌ QKD handshake aborted: QBER={qber:.3f} ({node1} ↔ {node2})")
+            return None
+        self._install_key(node1, node2, key)
         logger.info(f"🔑 QKD handshake successful: {node1} ↔ {node2}")
         return key
 
-    def send_quantum_pulse(self, sender: str, message: str, target: Optional[str] = None) -> Dict[str, Any]:
-        """Send a quantum-secure message between entangled nodes."""
+    def qkd_handshake_batch(self, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[str]]:
+        """Run BB84 for many node pairs in one vectorized simulation."""
+        pairs = [(a, b) for a, b in pairs if a in self.nodes and b in self.nodes]
+        with self._bb84_lock:
+            keys = self.bb84.run(len(pairs)) if pairs else []
+        for (node1, node2), key in zip(pairs, keys):
+            if key is not None:
+                self._install_key(node1, node2, key)
+        established = sum(key is not None for key in keys)
+        logger.info(f"🔑 Batch QKD handshake: {established}/{len(pairs)} pairs established")
+        return dict(zip(pairs, keys))
+
+    def send_quantum_pulse(self, sender: str, message: Payload, target: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send a quantum-secure message between entangled nodes.
+
+        ``message`` may be text or a bytes-like payload; the encrypted
+        message keeps the input kind (``str`` in, ``str`` out, otherwise
+        ``bytes``).
+        """
         if sender not in self.nodes:
             return {"status": "error", "message": "Sender not found"}
 
-        if target and self.nodes[sender].get("entangled_with") != target:
+        route = self._route(sender, target) if target else None
+        if target and route is None:
             return {"status": "error", "message": "Nodes not entangled"}
 
-        key = self.qkd_keys.get((sender, target)) if target else None
+        size = len(message) if isinstance(message, str) else memoryview(message).nbytes
+        try:
+            key = self._session_key(sender, target, size) if target else None
+        except KeyPoolExhausted as e:
+            logger.error(f"❌ {e}")
+            return {"status": "error", "message": "No fresh QKD key"}
         encrypted = self._encrypt_message(message, key) if key else message
 
         payload = {
@@ -94,23 +616,132 @@ class QuantumInternet:
             "encrypted": bool(key),
             "timestamp": datetime.now().isoformat()
         }
+        if route and len(route) > 2:
+            payload["path"] = route
 
-        logger.info(f"📡 Quantum pulse sent: {payload}")
+        logger.info(
+            f"📡 Quantum pulse sent: {sender} → {payload['to']} "
+            f"({len(message)} {'chars' if isinstance(message, str) else 'bytes'}, encrypted={bool(key)})"
+        )
         return payload
 
+    def send_quantum_stream(
+        self, sender: str, chunks: Iterable[Union[bytes, bytearray, memoryview]], target: str
+    ) -> Dict[str, Any]:
+        """
+        Stream a large byte payload between entangled nodes.
+
+        The returned ``stream`` lazily yields encrypted chunks, so
+        multi-megabyte payloads never need to be held in memory at once.
+        Every chunk is charged against the pair's key budget as it is
+        produced: chunks are split at ``byte_budget`` and the keystream
+        restarts whenever the pool rotates to a new key mid-stream.
+        Iteration raises :class:`KeyPoolExhausted` if no fresh key is left.
+        """
+        if sender not in self.nodes:
+            return {"status": "error", "message": "Sender not found"}
+
+        route = self._route(sender, target)
+        if route is None:
+            return {"status": "error", "message": "Nodes not entangled"}
+
+        encrypted = self.key_pool.has_key(KeyPool.pair(sender, target)) or (sender, target) in self.qkd_keys
+        stream = self._encrypt_stream(sender, target, chunks) if encrypted else iter(chunks)
+
+        logger.info(f"📡 Quantum stream opened: {sender} → {target} (encrypted={encrypted})")
+        return {
+            "status": "success",
+            "from": sender,
+            "to": target,
+            "stream": stream,
+            "path": route,
+            "encrypted": encrypted,
+            "timestamp": datetime.now().isoformat()
+        }
+
     def show_state(self) -> Dict[str, Any]:
         """Return current state of the quantum internet."""
         return {
             "nodes": list(self.nodes.keys()),
-            "entanglements": self.entanglements,
+            "entanglements": list(self.entanglements.links()),
             "active_keys": len(self.qkd_keys),
-            "key_history_entries": len(self.key_history)
+            "key_history_entries": len(self.key_history),
+            "key_pool": dict(self.key_pool.stats)
         }
 
     # ======================
     # INTERNAL HELPERS
     # ======================
 
-    def _encrypt_message(self, message: str, key: str) -> str:
+    def _route(self, sender: str, target: str) -> Optional[List[str]]:
+        """Direct link or shortest entanglement-swapping chain, if any."""
+        if self.entanglements.linked(sender, target):
+            return [sender, target]
+        if target not in self.nodes:
+            return None
+        return self.entanglements.route(sender, target)
+
+    def _generate_keys(self, count: int) -> List[str]:
+        """Produce up to ``count`` fresh keys from one batched BB84 run."""
+        with self._bb84_lock:
+            keys = self.bb84.run(count)
+        return [key for key in keys if key is not None]
+
+    def _encrypt_stream(
+        self, sender: str, target: str, chunks: Iterable[Union[bytes, bytearray, memoryview]]
+    ) -> Iterator[bytes]:
+        """Encrypt ``chunks`` lazily, drawing a pool key for every piece."""
+        budget = self.key_pool.byte_budget
+        key, offset = None, 0
+        for chunk in chunks:
+            view = memoryview(chunk).cast("B")
+            step = budget if budget else len(view) or 1
+            for start in range(0, len(view), step):
+                piece = view[start:start + step]
+                current = self._session_key(sender, target, len(piece))
+                if current != key:
+                    key, offset = current, 0
+                yield xor_keystream(piece, key.encode(), offset)
+                offset += len(piece)
+
+    def _register(self, node_name: str) -> None:
+        peers = self.entanglements.add_node(node_name)
+        self.nodes[node_name] = {"entangled_with": peers, "keys": []}
+
+    def _install_key(self, node1: str, node2: str, key: str) -> None:
+        self.qkd_keys[(node1, node2)] = key
+        self.qkd_keys[(node2, node1)] = key
+        self._record_key(node1, node2, key, "BB84")
+        self.key_pool.prime(KeyPool.pair(node1, node2), key)
+
+    def _session_key(self, sender: str, target: str, nbytes: int = 0) -> Optional[str]:
+        """Draw the key for the next message from the pair's key pool."""
+        key = self.key_pool.take(KeyPool.pair(sender, target), nbytes)
+        if key is None:
+            return self.qkd_keys.get((sender, target))
+        if key != self.qkd_keys.get((sender, target)):
+            self.qkd_keys[(sender, target)] = key
+            self.qkd_keys[(target, sender)] = key
+            self._record_key(sender, target, key, "BB84-pool")
+        return key
+
+    def _record_key(self, node1: str, node2: str, key: str, protocol: str) -> None:
+        """Append to the bounded key history, spilling the oldest entry to disk."""
+        if self.history_spill and self.key_history and len(self.key_history) == self.key_history.maxlen:
+            with open(self.history_spill, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.key_history[0]) + "\n")
+        self.key_history.append({
+            "nodes": (node1, node2),
+            "key": key,
+            "time": datetime.now().isoformat(),
+            "protocol": protocol
+        })
+
+    def _encrypt_message(self, message: Payload, key: str) -> Payload:
         """Simple XOR-based encryption placeholder (replace with PQC)."""
-        return "".join(chr(ord(c) ^ ord(key[i % len(key)])) for i, c in enumerate(message))
+        if not isinstance(message, str):
+            return xor_keystream(message, key.encode())
+        # XOR code points, not UTF-8 bytes, to stay compatible with text pulses
+        wide_key = key.encode("utf-32-le")
+        wide = message.encode("utf-32-le", "surrogatepass")
+        return xor_keystream(wide, wide_key).decode("utf-32-le", "surrogatepass")
@@ -3,15 +3,93 @@ Crypto Engine
 =============
 
 Handles encryption and decryption for Internet ∞.
+
+Short text messages use Fernet (``encrypt``/``decrypt``). Bulk data uses a
+chunked AES-256-GCM stream (``encrypt_stream``/``encrypt_bytes``/
+``encrypt_file``) that works on bytes-like input without copying or
+base64-expanding it:
+
+    header   b"IS" | version (1 byte) | chunk size (4 bytes) | 16-byte random salt
+    record*  ciphertext length (4 bytes, big-endian) | ciphertext + tag
+
+Every stream is sealed under its own AES key, derived with HKDF-Expand
+from the Fernet key and the stream's salt, so one engine key covers both formats
+and nonces never repeat across streams. Record ``i`` uses the nonce
+``i (4 bytes) | last | 7 zero bytes`` where ``last`` is 1 only for the
+final record, with the header as associated data. Reordered, dropped,
+truncated or extended streams therefore fail to decrypt, and records
+longer than the declared chunk size are rejected before being read.
 """
 
-from cryptography.fernet import Fernet
+import base64
+import hmac
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Union
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from utils.persistence import write_atomic
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+
+_MAGIC = b"IS"
+_VERSION = 2
+_HEADER = struct.Struct(">2sBI16s")
+_RECORD = struct.Struct(">I")
+_NONCE = struct.Struct(">IB7x")
+_TAG_SIZE = 16
+_KDF_INFO = b"internet-infinity stream v2"
+
+# Below this many input bytes encrypt_many/decrypt_many stay on the calling thread
+_PARALLEL_MIN = 256 * 1024
+
+
+def _split(chunks: Iterable[BytesLike], chunk_size: int) -> Iterator[memoryview]:
+    """Re-slice input chunks (without copying) so none exceeds ``chunk_size``."""
+    for chunk in chunks:
+        view = memoryview(chunk).cast("B")
+        if len(view) <= chunk_size:
+            if len(view):
+                yield view
+            continue
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size]
+
+
+def _reader(data: BytesLike) -> Callable[[int], memoryview]:
+    view = memoryview(data).cast("B")
+    pos = 0
+
+    def read(n: int) -> memoryview:
+        nonlocal pos
+        piece = view[pos:pos + n]
+        pos += len(piece)
+        return piece
+
+    return read
+
+
+def _apply(fn: Callable, items: List) -> List:
+    return [fn(item) for item in items]
 
 
 class CryptoEngine:
-    def __init__(self, key: bytes = None):
+    def __init__(self, key: bytes = None, max_workers: Optional[int] = None):
         self.key = key or Fernet.generate_key()
         self.cipher = Fernet(self.key)
+        self._master = base64.urlsafe_b64decode(self.key)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
 
     def encrypt(self, message: str) -> bytes:
         return self.cipher.encrypt(message.encode())
@@ -19,5 +97,139 @@ class CryptoEngine:
     def decrypt(self, token: bytes) -> str:
         return self.cipher.decrypt(token).decode()
 
+    def _stream_cipher(self, salt: bytes) -> AESGCM:
+        # HKDF-Expand (RFC 5869) of the already uniform Fernet key, one block,
+        # with the salt in the info; a one-shot HMAC keeps per-message cost low
+        return AESGCM(hmac.digest(self._master, _KDF_INFO + salt + b"\x01", "sha256"))
+
+    def encrypt_stream(self, chunks: Iterable[BytesLike], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Encrypt a byte stream record by record, so memory use is bounded by
+        the chunk size. Input chunks larger than ``chunk_size`` are split.
+        A record is sealed only once the following chunk has been pulled
+        (the last one is flagged as final), so a held-back piece of a
+        writable buffer is copied and callers may refill one ``bytearray``
+        for every chunk; ``bytes`` input is never copied.
+        """
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise ValueError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE}")
+        salt = os.urandom(16)
+        header = _HEADER.pack(_MAGIC, _VERSION, chunk_size, salt)
+        seal, pack, nonce = self._stream_cipher(salt).encrypt, _RECORD.pack, _NONCE.pack
+        yield header
+        counter = 0
+        pending: Optional[BytesLike] = None
+        for piece in _split(chunks, chunk_size):
+            if pending is not None:
+                sealed = seal(nonce(counter, 0), pending, header)
+                yield pack(len(sealed))
+                yield sealed
+                counter += 1
+                if counter >= 1 << 32:
+                    raise ValueError("Stream too long for its nonce space")
+            pending = piece if piece.readonly else bytes(piece)
+        sealed = seal(nonce(counter, 1), b"" if pending is None else pending, header)
+        yield pack(len(sealed))
+        yield sealed
+
+    def decrypt_stream(self, source: BinaryIO) -> Iterator[bytes]:
+        """Decrypt a stream written by :meth:`encrypt_stream` from a binary file."""
+        return self._open(source.read)
+
+    def _open(self, read: Callable[[int], BytesLike]) -> Iterator[bytes]:
+        header = bytes(read(_HEADER.size))
+        if len(header) < _HEADER.size:
+            raise InvalidToken("Truncated encrypted stream")
+        magic, version, chunk_size, salt = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION or not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            raise InvalidToken("Not an encrypted stream")
+        limit = chunk_size + _TAG_SIZE
+        open_, nonce = self._stream_cipher(salt).decrypt, _NONCE.pack
+        counter = 0
+        length = read(_RECORD.size)
+        while True:
+            if len(length) < _RECORD.size:
+                raise InvalidToken("Truncated encrypted stream")
+            (size,) = _RECORD.unpack(length)
+            if not _TAG_SIZE <= size <= limit:
+                raise InvalidToken(f"Encrypted stream record {counter} has an invalid length")
+            sealed = read(size)
+            if len(sealed) < size:
+                raise InvalidToken("Truncated encrypted stream")
+            # Only a record with nothing after it may carry the final flag
+            length = read(_RECORD.size)
+            last = not len(length)
+            try:
+                plain = open_(nonce(counter, last), sealed, header)
+            except InvalidTag:
+                raise InvalidToken(f"Encrypted stream record {counter} failed authentication") from None
+            if plain:
+                yield plain
+            if last:
+                return
+            counter += 1
+
+    def encrypt_bytes(self, data: Union[str, BytesLike], chunk_size: int = CHUNK_SIZE) -> bytes:
+        """Encrypt one payload into the chunked stream format."""
+        if isinstance(data, str):
+            data = data.encode()
+        return b"".join(self.encrypt_stream((data,), chunk_size))
+
+    def decrypt_bytes(self, token: BytesLike) -> bytes:
+        return b"".join(self._open(_reader(token)))
+
+    def encrypt_file(self, src: str, dst: str, chunk_size: int = CHUNK_SIZE) -> int:
+        """Encrypt ``src`` into ``dst`` in bounded memory; returns bytes written."""
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            chunks = iter(partial(fin.read, chunk_size), b"")
+            return sum(fout.write(part) for part in self.encrypt_stream(chunks, chunk_size))
+
+    def decrypt_file(self, src: str, dst: str) -> int:
+        """
+        Decrypt ``src`` into ``dst``; returns plaintext bytes written.
+        Output goes to ``dst.part`` and only replaces ``dst`` once the
+        final record has authenticated.
+        """
+        with open(src, "rb") as fin:
+            return write_atomic(dst, self.decrypt_stream(fin))
+
+    def encrypt_many(self, messages: Iterable[Union[str, BytesLike]]) -> List[bytes]:
+        """Encrypt many payloads (stream format), spread over the thread pool."""
+        return self._map(self.encrypt_bytes, list(messages))
+
+    def decrypt_many(self, tokens: Iterable[BytesLike]) -> List[bytes]:
+        """Decrypt many :meth:`encrypt_many` results, spread over the thread pool."""
+        return self._map(self.decrypt_bytes, list(tokens))
+
+    def _map(self, fn: Callable, items: List) -> List:
+        """
+        Apply ``fn`` to ``items`` in contiguous batches spread over the
+        worker threads, preserving order. Small inputs stay on the calling
+        thread, where dispatch would dominate.
+        """
+        workers = min(self.max_workers, len(items))
+        if workers <= 1 or sum(map(len, items)) < _PARALLEL_MIN:
+            return _apply(fn, items)
+        step = -(-len(items) // (workers * 4))
+        executor = self._pool()
+        futures = [executor.submit(_apply, fn, items[i:i + step]) for i in range(0, len(items), step)]
+        results: List = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="crypto")
+            return self._executor
+
+    def close(self) -> None:
+        """Stop the worker threads used by encrypt_many/decrypt_many."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
     def get_key(self) -> bytes:
         return self.key
@@ -3,32 +3,361 @@ Unified Firewall
 ================
 
 Smart firewall for Internet ∞.
+
+Rules match on any combination of these packet fields (an absent field is
+a wildcard):
+
+    ip        address or CIDR prefix ("10.0.0.0/8"); non-IPv4 values
+              (hostnames, IPv6) are compared as exact strings
+    port      a port, "low-high" or (low, high), inclusive
+    protocol  e.g. "tcp" (case-insensitive)
+    layer     e.g. "greennet"
+
+plus an ``action`` of "block" (default) or "allow". The legacy form
+``{"block_ip": "192.168.0.1"}`` is still understood. The first matching
+rule in insertion order decides; packets matching nothing are allowed.
+
+Rules are compiled into a ``RuleClassifier`` and recent decisions are
+kept in a bounded flow cache, so the per-packet cost does not grow with
+the number of rules.
 """
 
-from typing import List, Dict, Any
+import copy
+import heapq
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+from utils.ipv4 import ip_to_int, parse_cidr
+
+_NO_MATCH = float("inf")
+
+# Shape marker for ip values that are not IPv4 and are matched verbatim
+_EXACT = -1
+
+# Stands in for unhashable packet fields, which no rule can equal
+_UNMATCHABLE = object()
+
+_MASKS = [(0xFFFFFFFF << (32 - plen)) & 0xFFFFFFFF for plen in range(33)]
+
+MATCH_FIELDS = ("ip", "port", "protocol", "layer")
+
+# Flow key: the packet fields a rule can look at
+Flow = Tuple[Any, Any, Any, Any]
+
+
+def parse_port_range(value: Any) -> Tuple[int, int]:
+    """Parse ``80``, ``"80"``, ``"1000-2000"`` or ``(1000, 2000)`` (raises ValueError)."""
+    if isinstance(value, (tuple, list)):
+        low, high = value
+    elif isinstance(value, str) and "-" in value:
+        low, _, high = value.partition("-")
+    else:
+        low = high = value
+    low, high = int(low), int(high)
+    if not 0 <= low <= high <= 65535:
+        raise ValueError(f"Invalid port range: {value}")
+    return low, high
+
+
+def _protocol(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable stand-in for a rule value; values that are == freeze alike."""
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return type(value)
+    return value
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        return _UNMATCHABLE
+    return value
+
+
+class _PortIndex:
+    """
+    Rules sharing one (ip, protocol, layer) key, indexed by port.
+
+    Port ranges are flattened into elementary segments, each holding the
+    lowest rule id that covers it, so a lookup is one binary search.
+    """
+
+    __slots__ = ("wild", "wild_min", "ranges", "_starts", "_best", "_dirty")
 
-class UnifiedFirewall:
     def __init__(self):
-        self.rules: List[Dict[str, Any]] = []
+        self.wild: set = set()
+        self.wild_min: float = _NO_MATCH
+        self.ranges: Dict[int, Tuple[int, int]] = {}
+        self._starts: List[int] = []
+        self._best: List[float] = []
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.wild) + len(self.ranges)
+
+    def add(self, rule_id: int, port: Optional[Tuple[int, int]]) -> None:
+        if port is None:
+            self.wild.add(rule_id)
+            if rule_id < self.wild_min:
+                self.wild_min = rule_id
+        else:
+            self.ranges[rule_id] = port
+            self._dirty = True
+
+    def remove(self, rule_id: int) -> None:
+        if rule_id in self.wild:
+            self.wild.remove(rule_id)
+            if rule_id == self.wild_min:
+                self.wild_min = min(self.wild) if self.wild else _NO_MATCH
+        if self.ranges.pop(rule_id, None) is not None:
+            self._dirty = True
+
+    def best(self, port: Any) -> float:
+        found = self.wild_min
+        if not self.ranges or not isinstance(port, int):
+            return found
+        if self._dirty:
+            self._compile()
+        i = bisect_right(self._starts, port) - 1
+        return min(found, self._best[i]) if i >= 0 else found
 
-    def add_rule(self, rule: Dict[str, Any]) -> None:
-        """Add a new firewall rule."""
-        self.rules.append(rule)
+    def _compile(self) -> None:
+        """Sweep the range endpoints, keeping covering rules in a min-heap."""
+        items = sorted((low, high, rule_id) for rule_id, (low, high) in self.ranges.items())
+        starts = sorted({p for low, high, _ in items for p in (low, high + 1)})
+        best: List[float] = []
+        heap: List[Tuple[int, int]] = []
+        j = 0
+        for start in starts:
+            while j < len(items) and items[j][0] <= start:
+                heapq.heappush(heap, (items[j][2], items[j][1]))
+                j += 1
+            while heap and heap[0][1] < start:
+                heapq.heappop(heap)
+            best.append(heap[0][0] if heap else _NO_MATCH)
+        self._starts, self._best, self._dirty = starts, best, False
 
-    def remove_rule(self, rule: Dict[str, Any]) -> None:
-        if rule in self.rules:
-            self.rules.remove(rule)
+
+class RuleClassifier:
+    """
+    Tuple-space index of firewall rules.
+
+    Rules are grouped by shape — the ip prefix length (or exact/absent)
+    and whether protocol and layer are set — and each shape is a hash
+    table from the masked field values to a ``_PortIndex``. Classifying a
+    packet costs one hash probe per shape in use (a handful in practice,
+    at most 35 × 4 = 140) plus a binary search over ports, independent of the
+    number of rules. Rule ids double as priorities: lowest wins.
+    """
+
+    def __init__(self):
+        self._tables: Dict[Tuple[int, bool, bool], Dict[Tuple[Any, Any, Any], _PortIndex]] = {}
+        self._placement: Dict[int, Tuple[Tuple[int, bool, bool], Tuple[Any, Any, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._placement)
+
+    @staticmethod
+    def compile(rule: Dict[str, Any]) -> Optional[Tuple[Tuple[int, bool, bool], Tuple[Any, Any, Any], Any]]:
+        """Return ``(shape, key, port range)`` for a rule, or None if it matches nothing."""
+        ip = rule.get("ip", rule.get("block_ip"))
+        if ip is None and not any(field in rule for field in MATCH_FIELDS[1:]):
+            return None
+        if ip is None:
+            ip_shape = None
+        else:
+            try:
+                network, plen = parse_cidr(ip)
+                ip_shape, ip = plen, network
+            except (ValueError, AttributeError):
+                if isinstance(ip, str) and "/" in ip:
+                    raise ValueError(f"Invalid CIDR prefix: {ip}")
+                ip_shape = _EXACT
+        port = parse_port_range(rule["port"]) if rule.get("port") is not None else None
+        protocol, layer = _protocol(rule.get("protocol")), rule.get("layer")
+        try:
+            hash((ip, protocol, layer))
+        except TypeError:
+            raise ValueError(f"Rule match values must be hashable: {rule}") from None
+        shape = (ip_shape, protocol is not None, layer is not None)
+        return shape, (ip, protocol, layer), port
+
+    def add(self, rule_id: int, rule: Dict[str, Any]) -> bool:
+        """Index a rule; returns False for rules without match fields."""
+        compiled = self.compile(rule)
+        if compiled is None:
+            return False
+        shape, key, port = compiled
+        table = self._tables.setdefault(shape, {})
+        entry = table.get(key)
+        if entry is None:
+            entry = table[key] = _PortIndex()
+        entry.add(rule_id, port)
+        self._placement[rule_id] = (shape, key)
+        return True
+
+    def remove(self, rule_id: int) -> None:
+        placement = self._placement.pop(rule_id, None)
+        if placement is None:
+            return
+        shape, key = placement
+        table = self._tables[shape]
+        entry = table[key]
+        entry.remove(rule_id)
+        if not len(entry):
+            del table[key]
+            if not table:
+                del self._tables[shape]
+
+    def match(self, ip: Any, port: Any, protocol: Any, layer: Any) -> float:
+        """Return the lowest matching rule id (``inf`` when none match)."""
+        try:
+            address = ip_to_int(ip)
+        except (ValueError, AttributeError):
+            address = None
+        if isinstance(port, str) and port.isdigit():
+            port = int(port)
+        protocol = _protocol(protocol)
+        ip, protocol, layer = (_hashable(value) for value in (ip, protocol, layer))
+        found = _NO_MATCH
+        for (ip_shape, has_protocol, has_layer), table in self._tables.items():
+            if ip_shape is None:
+                value = None
+            elif ip_shape == _EXACT:
+                value = ip
+            elif address is None:
+                continue
+            else:
+                value = address & _MASKS[ip_shape]
+            entry = table.get((value, protocol if has_protocol else None, layer if has_layer else None))
+            if entry is not None:
+                best = entry.best(port)
+                if best < found:
+                    found = best
+        return found
+
+
+class UnifiedFirewall:
+    def __init__(self, flow_cache_size: int = 65_536):
+        self.rules: Dict[int, Dict[str, Any]] = {}
+        self.classifier = RuleClassifier()
+        self.flow_cache_size = flow_cache_size
+        self._flows: "OrderedDict[Flow, bool]" = OrderedDict()
+        # Rule ids by content key (oldest first), and each id's key as added
+        self._by_content: Dict[Any, List[int]] = {}
+        self._keys: Dict[int, Any] = {}
+        self._next_id = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def _content_key(rule: Dict[str, Any]) -> Any:
+        # Equal rules share a key ({"port": 80} and {"port": 80.0} too);
+        # candidates are still confirmed with == before removal
+        return _freeze(rule)
+
+    def add_rule(self, rule: Dict[str, Any]) -> int:
+        """
+        Add a new firewall rule; returns its id (raises ValueError if
+        malformed). The rule is copied, so later changes to the caller's
+        dict do not affect it.
+        """
+        rule = copy.deepcopy(rule)
+        rule_id = self._next_id
+        self.classifier.add(rule_id, rule)
+        self._next_id += 1
+        self.rules[rule_id] = rule
+        key = self._keys[rule_id] = self._content_key(rule)
+        self._by_content.setdefault(key, []).append(rule_id)
+        self._flows.clear()
+        return rule_id
+
+    def remove_rule(self, rule: Union[int, Dict[str, Any]]) -> bool:
+        """Remove a rule by id, or the oldest rule equal to ``rule``."""
+        if isinstance(rule, int) and not isinstance(rule, bool):
+            rule_id = rule
+            if rule_id not in self.rules:
+                return False
+            key = self._keys[rule_id]
+            ids = self._by_content[key]
+            ids.remove(rule_id)
+        elif isinstance(rule, dict):
+            key = self._content_key(rule)
+            ids = self._by_content.get(key, [])
+            rule_id = next((i for i in ids if self.rules[i] == rule), None)
+            if rule_id is None:
+                return False
+            ids.remove(rule_id)
+        else:
+            return False
+        if not ids:
+            del self._by_content[key]
+        del self._keys[rule_id]
+        del self.rules[rule_id]
+        self.classifier.remove(rule_id)
+        self._flows.clear()
+        return True
+
+    def match(self, packet: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the rule that decides ``packet``, if any."""
+        found = self.classifier.match(packet.get("ip"), packet.get("port"), packet.get("protocol"), packet.get("layer"))
+        return None if found == _NO_MATCH else self.rules[int(found)]
 
     def is_allowed(self, packet: Dict[str, Any]) -> bool:
         """
         Check if a packet passes firewall rules.
         Example rule: {"block_ip": "192.168.0.1"}
         """
-        for rule in self.rules:
-            if "block_ip" in rule and packet.get("ip") == rule["block_ip"]:
-                return False
-        return True
+        flow = (packet.get("ip"), packet.get("port"), packet.get("protocol"), packet.get("layer"))
+        try:
+            allowed = self._flows.get(flow)
+        except TypeError:  # unhashable field values are classified uncached
+            return self._decide(flow)
+        if allowed is not None:
+            self._flows.move_to_end(flow)
+            self.stats["hits"] += 1
+            return allowed
+        self.stats["misses"] += 1
+        allowed = self._decide(flow)
+        if self.flow_cache_size > 0:
+            self._flows[flow] = allowed
+            if len(self._flows) > self.flow_cache_size:
+                self._flows.popitem(last=False)
+        return allowed
+
+    def is_allowed_batch(self, packets: Iterable[Dict[str, Any]]) -> List[bool]:
+        """Classify many packets; each distinct flow is decided once."""
+        is_allowed = self.is_allowed
+        decided: Dict[Flow, bool] = {}
+        results = []
+        for packet in packets:
+            flow = (packet.get("ip"), packet.get("port"), packet.get("protocol"), packet.get("layer"))
+            try:
+                allowed = decided.get(flow)
+                if allowed is None:
+                    allowed = decided[flow] = is_allowed(packet)
+            except TypeError:
+                allowed = is_allowed(packet)
+            results.append(allowed)
+        return results
+
+    def _decide(self, flow: Flow) -> bool:
+        found = self.classifier.match(*flow)
+        if found == _NO_MATCH:
+            return True
+        return self.rules[int(found)].get("action", "block") == "allow"
 
     def list_rules(self) -> List[Dict[str, Any]]:
-        return self.rules
+        return list(self.rules.values())
@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+from interconnect.bionet import BioNet, SignalStore
+
+
+class TestSignalStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = SignalStore({"eeg": 10.0}, seconds=2.0, users=2)  # capacity 20
+        self.store.add_user("u1")
+
+    def test_windows_follow_ring_wraparound(self):
+        """Windows stay contiguous, chronological views across wrap-around."""
+        stream = np.arange(57, dtype=np.float32)
+        for start in range(0, 57, 7):
+            self.store.ingest("u1", "eeg", stream[start:start + 7])
+        window = self.store.window("u1", "eeg")
+        np.testing.assert_array_equal(window, stream[-20:])
+        np.testing.assert_array_equal(self.store.window("u1", "eeg", 5), stream[-5:])
+        self.assertFalse(window.flags.writeable)
+        self.assertFalse(window.flags.owndata)
+
+    def test_oversized_block_keeps_latest(self):
+        self.store.ingest("u1", "eeg", np.arange(3))
+        self.store.ingest("u1", "eeg", np.arange(100, 150))
+        np.testing.assert_array_equal(self.store.window("u1", "eeg"), np.arange(130, 150))
+        self.store.ingest("u1", "eeg", [7, 8])
+        np.testing.assert_array_equal(self.store.window("u1", "eeg", 3), [149, 7, 8])
+
+    def test_ingest_many_matches_single_ingest(self):
+        """The vectorized multi-user write equals per-user ingest, and rows grow on demand."""
+        users = [f"u{i}" for i in range(1, 6)]
+        reference = SignalStore({"eeg": 10.0}, seconds=2.0)
+        for u in users:
+            self.store.add_user(u)
+            reference.add_user(u)
+        rng = np.random.default_rng(1)
+        for _ in range(6):
+            blocks = rng.normal(size=(len(users), 7)).astype(np.float32)
+            self.store.ingest_many("eeg", users, blocks, timestamp=100.0)
+            for u, block in zip(users, blocks):
+                reference.ingest(u, "eeg", block, timestamp=100.0)
+        for u in users:
+            np.testing.assert_array_equal(self.store.window(u, "eeg"), reference.window(u, "eeg"))
+
+    def test_timestamps_are_rate_derived(self):
+        self.store.ingest("u1", "eeg", np.zeros(4), timestamp=50.0)
+        np.testing.assert_allclose(self.store.timestamps("u1", "eeg"), [49.7, 49.8, 49.9, 50.0])
+        self.store.ingest("u1", "eeg", np.zeros(2))
+        self.assertAlmostEqual(self.store.timestamps("u1", "eeg")[-1], 50.2)
+
+
+def _synthetic(seconds: float, rate: float = 256.0, alpha: float = 20.0, bpm: float = 72.0, seed: int = 0):
+    """EEG with a 10 Hz alpha rhythm and 6 Hz theta, plus a spiky ECG at ``bpm``."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    eeg = alpha * np.sin(2 * np.pi * 10 * t) + 5 * np.sin(2 * np.pi * 6 * t) + rng.normal(0, 1, len(t))
+    ecg = rng.normal(0, 0.05, len(t))
+    for start in np.arange(0, len(t), rate * 60 / bpm).astype(int):
+        ecg[start:start + 3] += [0.3, 1.0, 0.4][:len(ecg[start:start + 3])]
+    return eeg, ecg
+
+
+class TestFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.bn = BioNet(hop_seconds=0.5)
+        for i, (alpha, bpm) in enumerate([(20.0, 72.0), (5.0, 110.0)]):
+            user = f"u{i}"
+            self.bn.register_bio_id(user, "a" * 64)
+            eeg, ecg = _synthetic(6, alpha=alpha, bpm=bpm, seed=i)
+            for start in range(0, len(eeg), 64):
+                self.bn.ingest(user, "eeg", eeg[start:start + 64])
+                self.bn.ingest(user, "ecg", ecg[start:start + 64])
+
+    def test_band_power_and_heart_rate(self):
+        """Band powers track sine amplitudes (A²/2) and HR the beat interval."""
+        self.assertEqual(self.bn.update_features(), 4)
+        self.assertAlmostEqual(self.bn.features.value("u0", "alpha"), 200.0, delta=20)
+        self.assertAlmostEqual(self.bn.features.value("u1", "alpha"), 12.5, delta=3)
+        self.assertAlmostEqual(self.bn.features.value("u0", "theta"), 12.5, delta=3)
+        self.assertLess(self.bn.features.value("u0", "beta"), 2.0)
+        self.assertAlmostEqual(self.bn.features.value("u0", "hr"), 72.0, delta=2)
+        self.assertAlmostEqual(self.bn.features.value("u1", "hr"), 110.0, delta=3)
+
+    def test_updates_are_incremental(self):
+        """Only channels with a hop of new samples are recomputed."""
+        self.bn.update_features()
+        self.assertEqual(self.bn.update_features(), 0)
+        self.bn.ingest("u1", "eeg", np.zeros(64))
+        self.assertEqual(self.bn.update_features(), 0)
+        self.bn.ingest("u1", "eeg", np.zeros(64))
+        self.assertEqual(self.bn.update_features(), 1)
+
+    def test_packets_come_from_cached_features(self):
+        self.assertEqual(self.bn.map_signal_to_network("u0", "alpha")["reason"], "signal not available")
+        self.bn.update_features()
+        packet = self.bn.map_signal_to_network("u0", "hr")
+        self.assertTrue(packet["signal"].startswith("hr:7"))
+        self.assertEqual(packet["mapped_to"], "packet::hr::u0")
+        self.assertEqual(len(self.bn.get_biological_signal("u1")), 4)
+        self.assertEqual(self.bn.map_signal_to_network("u0", "gamma")["status"], "error")
+
+
+class TestBioNetIngest(unittest.TestCase):
+
+    def test_ingest_requires_registration_and_channel(self):
+        bn = BioNet()
+        self.assertEqual(bn.ingest("ghost", "eeg", [1.0]), 0)
+        bn.register_bio_id("alice", "f" * 64)
+        self.assertEqual(bn.ingest("alice", "emg", [1.0]), 0)
+        self.assertEqual(bn.ingest("alice", "eeg", np.ones(64)), 64)
+        self.assertEqual(len(bn.window("alice", "eeg")), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
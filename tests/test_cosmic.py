@@ -0,0 +1,251 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from interconnect.cosmic_substrate import ChannelLog, CosmicSubstrate, PulseMulticaster, TrustEngine
+
+class TestCosmicSubstrate(unittest.TestCase):
+
+    def setUp(self):
+        """Initialize CosmicSubstrate with a small resonance chain A - B - C and a loner D."""
+        self.cs = CosmicSubstrate()
+        for node in ("A", "B", "C", "D"):
+            self.cs.add_node(node)
+        self.cs.establish_resonance("A", "B")
+        self.cs.establish_resonance("B", "C")
+
+    def test_transitive_trust_allows_pulse(self):
+        """A target trusted through the resonance graph accepts pulses."""
+        result = self.cs.send_pulse("A", "hello", target="C")
+        self.assertEqual(result["to"], "C")
+
+    def test_untrusted_target_is_refused(self):
+        """A node outside the resonance graph stays below the trust threshold."""
+        self.assertEqual(self.cs.send_pulse("A", "hello", target="D"), {"status": "low_trust"})
+
+    def test_no_resonances_means_no_trust(self):
+        """Without any resonance, targeted pulses are refused."""
+        cs = CosmicSubstrate()
+        cs.add_node("A")
+        cs.add_node("B")
+        self.assertEqual(cs.send_pulse("A", "hello", target="B"), {"status": "low_trust"})
+
+    def test_trust_is_seeded_at_the_sender(self):
+        """A well-connected target is not trusted by a sender with no path to it."""
+        cs = CosmicSubstrate()
+        for node in ("A", "B", "C"):
+            cs.add_node(node)
+        cs.establish_resonance("B", "C")
+        self.assertEqual(cs.trust("A", "C"), 0.0)
+        self.assertEqual(cs.send_pulse("A", "hello", target="C"), {"status": "low_trust"})
+        self.assertGreaterEqual(self.cs.trust("A", "C"), 30)
+        self.assertEqual(self.cs.trust("D", "A"), 0.0)
+
+    def test_trust_updates_incrementally(self):
+        """New resonances are reflected after a warm-started recompute."""
+        engine = self.cs.trust_engine
+        self.assertLess(engine.score("D"), 30)
+        self.cs.establish_resonance("C", "D")
+        self.assertGreater(engine.score("D"), 30)
+        self.assertEqual(engine.stats["recomputes"], 2)
+        self.assertEqual(self.cs.trust("C", "D"), 85)
+        self.assertGreater(self.cs.trust("A", "D"), 0)
+
+    def test_trust_engine_converges_to_stationary_vector(self):
+        """Global trust on a symmetric ring is uniform."""
+        engine = TrustEngine()
+        for i in range(10):
+            engine.set_trust(f"n{i}", f"n{(i + 1) % 10}", 1.0)
+            engine.set_trust(f"n{(i + 1) % 10}", f"n{i}", 1.0)
+        self.assertAlmostEqual(engine.score("n3"), 100.0)
+        engine.remove_trust("n3", "n4")
+        self.assertLess(engine.score("n4"), 100.0)
+
+    def test_personal_vectors_warm_start_after_edge_change(self):
+        """One edge change re-converges cached per-source vectors from their old values."""
+        engine = TrustEngine()
+        for i in range(200):
+            for step in (1, 7, 31):
+                engine.set_trust(f"n{i}", f"n{(i + step) % 200}", 1.0 + (i % step))
+        sources = ("n0", "n50", "n100")
+        for source in sources:
+            engine.personal_score(source, "n1")
+        cold = engine.stats["personal_iterations"]
+        engine.set_trust("n3", "n150", 2.0)
+        self.assertEqual(engine.stats["personal_recomputes"], 3)
+        before = engine.personal_score("n0", "n150")
+        self.assertEqual(engine.stats["personal_recomputes"], 4)
+        warm = engine.stats["personal_iterations"] - cold
+        self.assertLess(warm, cold / len(sources))
+        fresh = TrustEngine()
+        fresh.__dict__.update(index=engine.index, names=engine.names, _edges=engine._edges,
+                              _src=engine._src, _dst=engine._dst, _weight=engine._weight)
+        self.assertAlmostEqual(before, fresh.personal_score("n0", "n150"), places=5)
+
+
+class TestMulticast(unittest.TestCase):
+
+    def setUp(self):
+        """Create a channel with a sender and three members with tiny inboxes."""
+        self.cs = CosmicSubstrate(multicast=PulseMulticaster(inbox_size=2))
+        for node in ("S", "M1", "M2", "M3"):
+            self.cs.add_node(node)
+        self.cs.create_channel("ops")
+        for node in ("S", "M1", "M2", "M3", "M1"):
+            self.cs.join_channel(node, "ops")
+
+    def test_membership_is_set_based(self):
+        """Joining twice keeps a single membership entry."""
+        self.assertEqual(self.cs.channels["ops"]["nodes"], {"S", "M1", "M2", "M3"})
+        self.assertEqual(self.cs.nodes["M1"]["channels"], {"ops"})
+
+    def test_pulse_fans_out_to_members(self):
+        """Every member except the sender receives the same payload object."""
+        payload = self.cs.send_pulse("S", "hello", channel="ops")
+        inboxes = self.cs.multicast.inboxes
+        self.assertEqual(set(inboxes), {"M1", "M2", "M3"})
+        self.assertTrue(all(inboxes[n].get_nowait() is payload for n in ("M1", "M2", "M3")))
+
+    def test_full_inbox_drops_oldest(self):
+        """Slow readers lag: the oldest pulse is evicted for the newest."""
+        for i in range(3):
+            self.cs.send_pulse("S", f"p{i}", channel="ops")
+        inbox = self.cs.multicast.inbox("M2")
+        self.assertEqual([inbox.get_nowait()["message"] for _ in range(2)], ["p1", "p2"])
+        self.assertEqual(self.cs.multicast.stats["lagged"], 3)
+
+    def test_async_delivery_with_backpressure(self):
+        """The block policy waits for readers and then drops after the timeout."""
+        self.cs.multicast = PulseMulticaster(inbox_size=1, policy="block", block_timeout=0.01)
+
+        async def scenario():
+            await self.cs.send_pulse_async("S", "first", channel="ops")
+            reader = asyncio.ensure_future(self.cs.receive("M1"))
+            await self.cs.send_pulse_async("S", "second", channel="ops")
+            return (await reader)["message"]
+
+        self.assertEqual(asyncio.run(scenario()), "first")
+        self.assertEqual(self.cs.multicast.stats, {"delivered": 4, "dropped": 2, "lagged": 0})
+
+    def test_block_waits_are_concurrent(self):
+        """Full inboxes share one timeout per pulse instead of one each."""
+        self.cs.multicast = PulseMulticaster(inbox_size=1, policy="block", block_timeout=0.2)
+
+        async def scenario():
+            await self.cs.send_pulse_async("S", "first", channel="ops")
+            started = time.monotonic()
+            await self.cs.send_pulse_async("S", "second", channel="ops")
+            return time.monotonic() - started
+
+        self.assertLess(asyncio.run(scenario()), 0.35)
+        self.assertEqual(self.cs.multicast.stats, {"delivered": 3, "dropped": 3, "lagged": 0})
+
+
+class TestChannelLog(unittest.TestCase):
+
+    def test_pulses_are_logged_per_channel(self):
+        """Channel pulses land in the log and show_state counts them."""
+        cs = CosmicSubstrate()
+        cs.add_node("A")
+        cs.create_channel("news")
+        for i in range(5):
+            cs.send_pulse("A", f"pulse {i}", channel="news")
+        self.assertEqual(cs.show_state()["channel_logs"], {"news": 5})
+        history = cs.channel_history("news", sender="A")
+        self.assertEqual([p["message"] for p in history], [f"pulse {i}" for i in range(5)])
+
+    def test_time_range_and_sender_queries(self):
+        """Queries use segment bounds and indexes across many segments."""
+        log = ChannelLog(segment_bytes=512, index_interval=4)
+        for i in range(500):
+            log.append(f"s{i % 5}", f"m{i}", timestamp=1000.0 + i)
+        self.assertGreater(len(log.segments), 10)
+        window = list(log.read(1100.0, 1109.0))
+        self.assertEqual([r["message"] for r in window], [f"m{i}" for i in range(100, 110)])
+        by_sender = list(log.read(1100.0, 1120.0, sender="s2"))
+        self.assertEqual([r["message"] for r in by_sender], ["m102", "m107", "m112", "m117"])
+
+    def test_segments_persist_and_retention_drops_oldest(self):
+        """File-backed logs reopen from disk and keep within the size budget."""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = ChannelLog(tmp, segment_bytes=1024, retention_bytes=4096)
+            for i in range(400):
+                log.append("A", "x" * 20, timestamp=float(i))
+            self.assertLessEqual(log.size_bytes, 4096 + 1024)
+            kept = len(log)
+            log.close()
+            reopened = ChannelLog(tmp)
+            self.assertEqual(len(os.listdir(tmp)), len(reopened.segments))
+            self.assertEqual(len(reopened), kept)
+            self.assertEqual(list(reopened.read(since=399.0))[0]["message"], "x" * 20)
+            reopened.close()
+
+    def test_sealed_segments_are_mapped_on_demand(self):
+        """Only a bounded number of sealed segment files stay mapped."""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = ChannelLog(tmp, segment_bytes=512, max_mapped=2)
+            for i in range(200):
+                log.append("A", f"m{i}", timestamp=float(i))
+            sealed = log.segments[:-1]
+            self.assertGreater(len(sealed), 4)
+            self.assertTrue(all(seg.mm is None for seg in sealed))
+            self.assertEqual(len(list(log.read())), 200)
+            self.assertEqual(sum(seg.mm is not None for seg in sealed), 2)
+            log.close()
+
+    def test_idle_channels_still_expire(self):
+        """Retention applies on read even when nothing is appended."""
+        with tempfile.TemporaryDirectory() as tmp:
+            log = ChannelLog(tmp, segment_seconds=0.0, retention_seconds=60.0)
+            log.append("A", "old", timestamp=time.time() - 120)
+            self.assertEqual(list(log.read()), [])
+            self.assertEqual(log.segments, [])
+            self.assertEqual(os.listdir(tmp), [])
+            log.append("A", "new")
+            self.assertEqual([r["message"] for r in log.read()], ["new"])
+            log.close()
+
+    def test_substrate_close_closes_logs(self):
+        """CosmicSubstrate.close seals every channel log."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cs = CosmicSubstrate(log_dir=tmp)
+            cs.add_node("A")
+            cs.create_channel("news")
+            cs.send_pulse("A", "hello", channel="news")
+            cs.close()
+            self.assertEqual(cs.channel_logs["news"].segments, [])
+            reopened = ChannelLog(os.path.join(tmp, "news"))
+            self.assertEqual([r["message"] for r in reopened.read()], ["hello"])
+            reopened.close()
+
+    def test_dot_channel_names_stay_inside_log_dir(self):
+        """"." and ".." get their own log directories under log_dir."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = os.path.join(tmp, "logs")
+            cs = CosmicSubstrate(log_dir=root)
+            cs.add_node("A")
+            for name in (".", "..", "%2E"):
+                cs.create_channel(name)
+                cs.send_pulse("A", name, channel=name)
+            cs.close()
+            self.assertEqual(sorted(os.listdir(tmp)), ["logs"])
+            self.assertEqual(sorted(os.listdir(root)), ["%252E", "%2E", "%2E%2E"])
+            self.assertTrue(all(name.endswith(".seg") for name in os.listdir(os.path.join(root, "%2E"))))
+
+    def test_oversized_sender_is_refused(self):
+        """Names beyond the 16-bit header field fail cleanly instead of crashing."""
+        log = ChannelLog()
+        with self.assertRaises(ValueError):
+            log.append("A", "hi", target="x" * 70_000)
+        self.assertEqual(len(log), 0)
+        cs = CosmicSubstrate()
+        cs.add_node("n" * 70_000)
+        cs.create_channel("ops")
+        result = cs.send_pulse("n" * 70_000, "hi", channel="ops")
+        self.assertEqual(result["status"], "error")
+        log.close()
+        cs.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import os
+import tempfile
+import unittest
+
+from cryptography.fernet import InvalidToken
+
+from security.crypto_engine import CryptoEngine
+
+
+class TestCryptoEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = CryptoEngine(max_workers=4)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_fernet_round_trip(self):
+        self.assertEqual(self.engine.decrypt(self.engine.encrypt("hello ∞")), "hello ∞")
+
+    def test_stream_round_trip_across_chunk_boundaries(self):
+        """Large and empty inputs split into records and decrypt intact."""
+        data = os.urandom(100_000)
+        for payload in (b"", b"x", data, memoryview(data)[1:]):
+            token = self.engine.encrypt_bytes(payload, chunk_size=4_096)
+            self.assertEqual(self.engine.decrypt_bytes(token), bytes(payload))
+        # 25 records of 4096 bytes: 23-byte header plus 20 bytes per record
+        self.assertEqual(len(self.engine.encrypt_bytes(data, chunk_size=4_096)), len(data) + 23 + 25 * 20)
+
+    def test_stream_from_iterable_and_file(self):
+        chunks = [b"alpha", b"", bytearray(b"beta"), memoryview(b"gamma")]
+        stream = b"".join(self.engine.encrypt_stream(chunks))
+        self.assertEqual(b"".join(self.engine.decrypt_stream(io.BytesIO(stream))), b"alphabetagamma")
+        with tempfile.TemporaryDirectory() as tmp:
+            src, enc, out = (os.path.join(tmp, name) for name in ("a", "a.enc", "a.out"))
+            with open(src, "wb") as f:
+                f.write(os.urandom(300_000))
+            self.engine.encrypt_file(src, enc, chunk_size=65_536)
+            self.assertEqual(self.engine.decrypt_file(enc, out), 300_000)
+            with open(src, "rb") as a, open(out, "rb") as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_tampering_is_detected(self):
+        """Flipped bits, truncation, reordering and trailing data all fail."""
+        token = self.engine.encrypt_bytes(os.urandom(10_000), chunk_size=1_000)
+        record = 4 + 1_000 + 16
+        flipped = bytearray(token)
+        flipped[50] ^= 1
+        header, body = token[:23], token[23:]
+        reordered = header + body[record:2 * record] + body[:record] + body[2 * record:]
+        for bad in (bytes(flipped), token[:-record], reordered, token + b"\0", b"junk"):
+            with self.assertRaises(InvalidToken):
+                self.engine.decrypt_bytes(bad)
+        with self.assertRaises(InvalidToken):
+            CryptoEngine().decrypt_bytes(token)
+
+    def test_streams_use_distinct_salts(self):
+        """Each stream derives its own key from a fresh 16-byte salt."""
+        first, second = (self.engine.encrypt_bytes(b"same") for _ in range(2))
+        self.assertNotEqual(first[7:23], second[7:23])
+        self.assertNotEqual(first[23:], second[23:])
+
+    def test_oversized_record_rejected_before_reading(self):
+        """A record length beyond chunk size + tag is refused without reading it."""
+        token = self.engine.encrypt_bytes(b"x" * 100, chunk_size=64)
+        forged = token[:23] + (1 << 31).to_bytes(4, "big") + token[27:]
+        reads = []
+        source = io.BytesIO(forged)
+        original = source.read
+        source.read = lambda n=-1: reads.append(n) or original(n)
+        with self.assertRaises(InvalidToken):
+            list(self.engine.decrypt_stream(source))
+        self.assertNotIn(1 << 31, reads)
+
+    def test_stream_from_reused_buffer(self):
+        """A source refilling one bytearray still encrypts every chunk intact."""
+        data = os.urandom(50_000)
+        source = io.BytesIO(data)
+        buffer = bytearray(4_096)
+
+        def chunks():
+            while True:
+                n = source.readinto(buffer)
+                if not n:
+                    return
+                yield memoryview(buffer)[:n]
+
+        token = b"".join(self.engine.encrypt_stream(chunks(), chunk_size=4_096))
+        self.assertEqual(self.engine.decrypt_bytes(token), data)
+
+    def test_failed_decrypt_file_leaves_no_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, out = os.path.join(tmp, "a.enc"), os.path.join(tmp, "a.out")
+            token = self.engine.encrypt_bytes(os.urandom(10_000), chunk_size=1_000)
+            with open(src, "wb") as f:
+                f.write(token[:-100])
+            with self.assertRaises(InvalidToken):
+                self.engine.decrypt_file(src, out)
+            self.assertEqual(sorted(os.listdir(tmp)), ["a.enc"])
+
+    def test_many_preserves_order(self):
+        """Bulk APIs return results in input order, on and off the thread pool."""
+        small = [f"message {i}" for i in range(50)]
+        large = [os.urandom(64 * 1024) for _ in range(16)]
+        for messages in (small, large):
+            tokens = self.engine.encrypt_many(messages)
+            plain = self.engine.decrypt_many(tokens)
+            self.assertEqual(plain, [m.encode() if isinstance(m, str) else m for m in messages])
+
+
+if __name__ == "__main__":
+    unittest.main()
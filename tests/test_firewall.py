@@ -0,0 +1,167 @@
+import random
+import unittest
+
+from security.firewall import UnifiedFirewall, parse_port_range
+
+
+def _reference(rules, packet):
+    """Linear first-match evaluation of the documented rule semantics."""
+    from ipaddress import ip_address, ip_network
+    for rule in rules:
+        ip = rule.get("ip", rule.get("block_ip"))
+        if ip is None and not any(k in rule for k in ("port", "protocol", "layer")):
+            continue
+        if ip is not None:
+            try:
+                if ip_address(packet.get("ip")) not in ip_network(ip):
+                    continue
+            except ValueError:
+                if packet.get("ip") != ip:
+                    continue
+        if rule.get("port") is not None:
+            low, high = parse_port_range(rule["port"])
+            if not isinstance(packet.get("port"), int) or not low <= packet["port"] <= high:
+                continue
+        if rule.get("protocol") is not None and str(packet.get("protocol")).lower() != rule["protocol"].lower():
+            continue
+        if rule.get("layer") is not None and packet.get("layer") != rule["layer"]:
+            continue
+        return rule.get("action", "block") == "allow"
+    return True
+
+
+class TestUnifiedFirewall(unittest.TestCase):
+
+    def setUp(self):
+        self.fw = UnifiedFirewall()
+
+    def test_legacy_block_ip(self):
+        """The original block_ip rule form still blocks exact addresses."""
+        self.fw.add_rule({"block_ip": "192.168.0.1"})
+        self.fw.add_rule({"block_ip": "evil.example"})
+        self.assertFalse(self.fw.is_allowed({"ip": "192.168.0.1"}))
+        self.assertFalse(self.fw.is_allowed({"ip": "evil.example"}))
+        self.assertTrue(self.fw.is_allowed({"ip": "192.168.0.2"}))
+        self.assertTrue(self.fw.is_allowed({}))
+
+    def test_cidr_port_protocol_layer(self):
+        """Rules combine prefixes, port ranges, protocols and layers."""
+        self.fw.add_rule({"ip": "10.0.0.0/8", "port": "1000-2000", "protocol": "TCP"})
+        self.fw.add_rule({"layer": "quantum", "port": 22})
+        self.assertFalse(self.fw.is_allowed({"ip": "10.1.2.3", "port": 1500, "protocol": "tcp"}))
+        self.assertTrue(self.fw.is_allowed({"ip": "10.1.2.3", "port": 2001, "protocol": "tcp"}))
+        self.assertTrue(self.fw.is_allowed({"ip": "10.1.2.3", "port": 1500, "protocol": "udp"}))
+        self.assertTrue(self.fw.is_allowed({"ip": "11.1.2.3", "port": 1500, "protocol": "tcp"}))
+        self.assertFalse(self.fw.is_allowed({"ip": "1.2.3.4", "port": 22, "layer": "quantum"}))
+        self.assertTrue(self.fw.is_allowed({"ip": "1.2.3.4", "port": 22, "layer": "greennet"}))
+
+    def test_first_match_wins(self):
+        """An earlier allow rule overrides a later, broader block."""
+        allow = self.fw.add_rule({"ip": "10.0.0.5", "action": "allow"})
+        self.fw.add_rule({"ip": "10.0.0.0/24"})
+        self.assertTrue(self.fw.is_allowed({"ip": "10.0.0.5"}))
+        self.assertFalse(self.fw.is_allowed({"ip": "10.0.0.6"}))
+        self.assertIs(self.fw.match({"ip": "10.0.0.6"}), self.fw.rules[allow + 1])
+        self.fw.remove_rule(allow)
+        self.assertFalse(self.fw.is_allowed({"ip": "10.0.0.5"}))
+
+    def test_remove_rule_invalidates_flow_cache(self):
+        """Cached decisions are dropped whenever the rule set changes."""
+        rule = {"block_ip": "1.1.1.1"}
+        self.fw.add_rule(rule)
+        packet = {"ip": "1.1.1.1"}
+        self.assertFalse(self.fw.is_allowed(packet))
+        self.assertFalse(self.fw.is_allowed(packet))
+        self.assertEqual(self.fw.stats["hits"], 1)
+        self.assertTrue(self.fw.remove_rule({"block_ip": "1.1.1.1"}))
+        self.assertFalse(self.fw.remove_rule(rule))
+        self.assertTrue(self.fw.is_allowed(packet))
+        self.assertEqual(self.fw.list_rules(), [])
+
+    def test_remove_rule_by_equal_content_and_stable_id(self):
+        """Equal rules are found by content, bools are not ids, and rules are copied on add."""
+        first = self.fw.add_rule({"port": 80, "protocol": "tcp"})
+        self.fw.add_rule({"port": 443})
+        self.assertFalse(self.fw.remove_rule(True))
+        self.assertFalse(self.fw.remove_rule(False))
+        self.assertEqual(len(self.fw.rules), 2)
+        self.assertTrue(self.fw.remove_rule({"protocol": "tcp", "port": 80.0}))
+        self.assertNotIn(first, self.fw.rules)
+
+        rule = {"ip": "10.0.0.0/8", "port": [1000, 2000]}
+        rule_id = self.fw.add_rule(rule)
+        rule["port"].append(3000)
+        rule["action"] = "allow"
+        self.assertEqual(self.fw.rules[rule_id], {"ip": "10.0.0.0/8", "port": [1000, 2000]})
+        self.fw.rules[rule_id]["note"] = "edited in place"
+        self.assertTrue(self.fw.remove_rule(rule_id))
+        self.assertFalse(self.fw.is_allowed({"port": 443}))
+        self.assertTrue(self.fw.is_allowed({"ip": "10.1.1.1", "port": 1500}))
+
+    def test_malformed_rules_rejected(self):
+        with self.assertRaises(ValueError):
+            self.fw.add_rule({"ip": "10.0.0.1/8"})
+        with self.assertRaises(ValueError):
+            self.fw.add_rule({"port": "90-80"})
+        with self.assertRaises(ValueError):
+            self.fw.add_rule({"ip": ["10.0.0.1"]})
+        self.assertEqual(self.fw.list_rules(), [])
+
+    def test_unhashable_packet_fields_match_nothing_exact(self):
+        """Unhashable packet values skip exact rules but still hit wildcards."""
+        self.fw.add_rule({"ip": "host.example"})
+        self.assertTrue(self.fw.is_allowed({"ip": ["host.example"]}))
+        self.fw.add_rule({"layer": "greennet"})
+        self.assertFalse(self.fw.is_allowed({"ip": ["x"], "protocol": {"tcp"}, "layer": "greennet"}))
+
+    def test_wildcard_port_minimum_tracked(self):
+        """Removing the lowest wildcard rule hands over to the next one."""
+        first = self.fw.add_rule({"layer": "greennet", "action": "allow"})
+        self.fw.add_rule({"layer": "greennet"})
+        packet = {"layer": "greennet", "port": 80}
+        self.assertTrue(self.fw.is_allowed(packet))
+        self.fw.remove_rule(first)
+        self.assertFalse(self.fw.is_allowed(packet))
+
+    def test_batch_matches_linear_reference(self):
+        """The compiled index agrees with a linear first-match scan."""
+        rng = random.Random(3)
+        rules = []
+        for _ in range(300):
+            rule = {}
+            if rng.random() < 0.8:
+                plen = rng.choice([8, 16, 24, 32])
+                rule["ip"] = f"10.{rng.randrange(4)}.{rng.randrange(4)}.{rng.randrange(4)}"
+                if plen != 32:
+                    octets = rule["ip"].split(".")[: plen // 8] + ["0"] * (4 - plen // 8)
+                    rule["ip"] = ".".join(octets) + f"/{plen}"
+            if rng.random() < 0.5:
+                low = rng.randrange(0, 100)
+                rule["port"] = (low, low + rng.randrange(0, 30))
+            if rng.random() < 0.3:
+                rule["protocol"] = rng.choice(["tcp", "udp"])
+            if rng.random() < 0.2:
+                rule["layer"] = rng.choice(["greennet", "holonet"])
+            rule["action"] = rng.choice(["block", "allow"])
+            rules.append(rule)
+            self.fw.add_rule(rule)
+        packets = [
+            {
+                "ip": f"10.{rng.randrange(4)}.{rng.randrange(4)}.{rng.randrange(4)}",
+                "port": rng.randrange(0, 130),
+                "protocol": rng.choice(["tcp", "udp", "TCP"]),
+                "layer": rng.choice(["greennet", "holonet", None]),
+            }
+            for _ in range(2_000)
+        ]
+        expected = [_reference(rules, p) for p in packets]
+        self.assertEqual(self.fw.is_allowed_batch(packets), expected)
+        for rule in rules[::3]:
+            self.assertTrue(self.fw.remove_rule(rule))
+        remaining = self.fw.list_rules()
+        self.assertEqual(len(remaining), 200)
+        self.assertEqual(self.fw.is_allowed_batch(packets), [_reference(remaining, p) for p in packets])
+
+
+if __name__ == "__main__":
+    unittest.main()
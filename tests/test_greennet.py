@@ -1,5 +1,16 @@
+import os
+import random
+import tempfile
 import unittest
-from interconnect.greennet import GreenNet
+from interconnect.greennet import (
+    FirewallMatcher,
+    GreenNet,
+    PathEngine,
+    RoutingTable,
+    PACKET_BLOCKED,
+    PACKET_NO_ROUTE,
+    PACKET_SENT,
+)
 
 class TestGreenNet(unittest.TestCase):
 
@@ -23,5 +34,207 @@ class TestGreenNet(unittest.TestCase):
         result = self.gn.send_packet("UnknownNode", "TestData")
         self.assertFalse(result)
 
+    def test_firewall_blocks_content(self):
+        """A content rule should block any payload containing its target."""
+        self.gn.add_route("Node3", "192.168.1.3")
+        self.gn.add_firewall_rule("content", "malware")
+        self.assertFalse(self.gn.send_packet("Node3", "payload with malware inside"))
+        self.assertTrue(self.gn.send_packet("Node3", "clean payload"))
+        self.assertEqual(self.gn.analytics["blocked"], 1)
+
+    def test_firewall_first_match_wins(self):
+        """The earliest matching rule decides, even for overlapping targets."""
+        self.gn.add_route("Node4", "192.168.1.4")
+        self.gn.add_firewall_rule("content", "secure", action="allow")
+        self.gn.add_firewall_rule("content", "cure")
+        self.gn.add_firewall_rule("node", "Node4")
+        self.assertTrue(self.gn.send_packet("Node4", "secure channel"))
+        self.assertFalse(self.gn.send_packet("Node4", "cured"))
+        self.assertFalse(self.gn.send_packet("Node4", "plain"))
+
+    def test_firewall_rules_added_after_traffic(self):
+        """Rules added between packets must be picked up by the matcher."""
+        self.gn.add_route("Node5", "192.168.1.5")
+        self.assertTrue(self.gn.send_packet("Node5", "abcd"))
+        self.gn.add_firewall_rule("content", "bc")
+        self.assertFalse(self.gn.send_packet("Node5", "abcd"))
+
+    def test_firewall_rebuilds_are_batched(self):
+        """Interleaved adds and matches relink once per batch and keep first-match order."""
+        matcher = FirewallMatcher(relink_batch=16)
+        for i in range(100):
+            matcher.add({"type": "content", "target": f"bad{i:03d}", "action": "block"})
+            matcher.add({"type": "content", "target": f"d{i:03d}", "action": "allow"})
+            self.assertEqual(matcher.match("N", f"xx bad{i:03d} yy")["action"], "block")
+            self.assertEqual(matcher.match("N", f"d{i:03d}")["action"], "allow")
+            self.assertIsNone(matcher.match("N", "clean"))
+        self.assertEqual(matcher.relinks, 200 // 16)
+        self.assertEqual(matcher.match("N", ["d", "0", "0", "1"])["target"], "d001")
+
+    def test_send_packets_batch(self):
+        """Batch sends return per-packet statuses and update analytics once."""
+        self.gn.add_route("Node6", "192.168.1.6")
+        self.gn.add_firewall_rule("content", "spam")
+        results = self.gn.send_packets([
+            ("Node6", "hello"),
+            ("Node6", "spam offer"),
+            ("Ghost", "hello"),
+            ("Node6", "hello"),
+        ])
+        self.assertEqual(
+            list(results),
+            [PACKET_SENT, PACKET_BLOCKED, PACKET_NO_ROUTE, PACKET_SENT],
+        )
+        self.assertEqual(self.gn.analytics, {"sent": 2, "blocked": 1})
+
+    def test_send_packets_unhashable_packets(self):
+        """List packets and unhashable nodes are classified without the cache."""
+        self.gn.add_route("Node7", "192.168.1.7")
+        self.gn.add_firewall_rule("content", "spam")
+        results = self.gn.send_packets([
+            ["Node7", "hello"],
+            ("Node7", ["s", "p", "a", "m"]),
+            [["Node7"], "hello"],
+            ("Node7", "hello"),
+        ])
+        self.assertEqual(list(results), [PACKET_SENT, PACKET_BLOCKED, PACKET_NO_ROUTE, PACKET_SENT])
+
+    def test_prefix_routes_longest_match(self):
+        """Lookups resolve to the most specific covering prefix."""
+        self.gn.add_prefix_route("10.0.0.0/8", "Core")
+        self.gn.add_prefix_route("10.1.0.0/16", "Edge")
+        self.gn.add_prefix_route("10.1.2.128/25", "Rack")
+        self.gn.add_route("Host", "10.1.2.200")
+        self.assertEqual(self.gn.resolve("10.9.9.9"), "Core")
+        self.assertEqual(self.gn.resolve("10.1.7.1"), "Edge")
+        self.assertEqual(self.gn.resolve("10.1.2.129"), "Rack")
+        self.assertEqual(self.gn.resolve("10.1.2.200"), "Host")
+        self.assertIsNone(self.gn.resolve("11.0.0.1"))
+        self.assertFalse(self.gn.add_prefix_route("10.1.2.3/16", "Bad"))
+
+    def test_routing_table_insert_order_and_load(self):
+        """Shorter prefixes added later must not shadow longer ones."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "routes.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# prefix next-hop\n192.168.1.0/24 LanA\n192.168.0.0,Campus\n\n")
+                f.write("192.168.0.0/16 Campus\n0.0.0.0/0 Default\n")
+            table = RoutingTable()
+            self.assertEqual(table.load(path), 4)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.lookup("192.168.1.9"), "LanA")
+        self.assertEqual(table.lookup("192.168.0.0"), "Campus")
+        self.assertEqual(table.lookup("192.168.2.1"), "Campus")
+        self.assertEqual(table.lookup("8.8.8.8"), "Default")
+
+    def test_routing_table_counts_distinct_prefixes(self):
+        """Re-inserting a prefix replaces it instead of counting it twice."""
+        table = RoutingTable()
+        table.insert("10.0.0.0/8", "A")
+        table.insert("10.0.0.0/16", "B")
+        table.insert("10.0.0.0/8", "C")
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.lookup("10.0.1.1"), "B")
+        self.assertEqual(table.lookup("10.1.0.1"), "C")
+
+    def test_routing_table_remove_falls_back(self):
+        """Removed prefixes hand their addresses back to covering prefixes."""
+        table = RoutingTable()
+        table.insert("10.0.0.0/8", "Core")
+        table.insert("10.1.0.0/20", "Pod")
+        table.insert("10.1.0.0/24", "Rack")
+        self.assertTrue(table.remove("10.1.0.0/24"))
+        self.assertEqual(table.lookup("10.1.0.5"), "Pod")
+        self.assertTrue(table.remove("10.1.0.0/20"))
+        self.assertEqual(table.lookup("10.1.0.5"), "Core")
+        self.assertFalse(table.remove("10.1.0.0/20"))
+        self.assertEqual(len(table), 1)
+
+    def test_readded_node_drops_old_host_route(self):
+        """Moving a node to a new address retires its previous /32."""
+        self.gn.add_route("Mover", "10.0.0.1")
+        self.gn.add_route("Mover", "10.0.0.2")
+        self.assertIsNone(self.gn.resolve("10.0.0.1"))
+        self.assertEqual(self.gn.resolve("10.0.0.2"), "Mover")
+        self.gn.add_route("Other", "10.0.0.2")
+        self.gn.add_route("Mover", "10.0.0.3")
+        self.assertEqual(self.gn.resolve("10.0.0.2"), "Other")
+        self.assertEqual(len(self.gn.routing_table), 2)
+
+    def test_shared_address_survives_one_node_moving(self):
+        """A host route stays while any node is still registered at that address."""
+        self.gn.add_route("A", "10.0.0.1")
+        self.gn.add_route("B", "10.0.0.1")
+        self.gn.add_route("B", "10.0.0.2")
+        self.assertEqual(self.gn.resolve("10.0.0.1"), "A")
+        self.gn.add_route("A", "10.0.0.3")
+        self.assertIsNone(self.gn.resolve("10.0.0.1"))
+        self.assertEqual(len(self.gn.routing_table), 2)
+
+    def test_memory_bytes_counts_the_prefix_index(self):
+        """The estimate grows with the prefix index, not just the trie columns."""
+        table = RoutingTable()
+        for i in range(1000):
+            table.insert(f"10.{i // 256}.{i % 256}.0/24", f"hop{i}")
+        columns = sum(col.itemsize * len(col) for col in (table._hop, table._len, table._child))
+        self.assertGreater(table.memory_bytes() - columns, 1000 * 80)
+
+    def test_multi_hop_cheapest_path(self):
+        """Packets with a source follow the lowest-energy multi-hop path."""
+        self.gn.add_link("A", "B", energy=1.0)
+        self.gn.add_link("B", "C", energy=1.0)
+        self.gn.add_link("A", "C", energy=5.0)
+        self.assertEqual(self.gn.topology.path("A", "C"), (["A", "B", "C"], 2.0))
+        self.assertTrue(self.gn.send_packet("C", "hello", source="A"))
+        self.assertFalse(self.gn.send_packet("Z", "hello", source="A"))
+
+    def test_path_trees_repaired_on_link_change(self):
+        """Cached trees are repaired only when a link change affects them."""
+        engine = self.gn.topology
+        self.gn.add_link("A", "B", energy=1.0)
+        self.gn.add_link("B", "C", energy=1.0)
+        self.gn.add_link("C", "D", energy=1.0)
+        self.gn.add_link("A", "C", energy=5.0)
+        self.gn.add_link("X", "Y", energy=1.0)
+        engine.path("A", "D")
+        engine.path("X", "Y")
+        self.gn.add_link("A", "C", energy=6.0)  # non-tree edge got heavier
+        self.assertEqual(engine.stats["trees_repaired"], 0)
+        self.gn.add_link("B", "C", energy=10.0)  # tree edge got heavier
+        self.assertEqual(engine.path("A", "D"), (["A", "C", "D"], 7.0))
+        self.gn.add_link("A", "D", energy=2.0)  # new shortcut
+        self.assertEqual(engine.path("A", "D"), (["A", "D"], 2.0))
+        self.assertEqual(engine.path("A", "C"), (["A", "D", "C"], 3.0))
+        engine.remove_link("A", "D")
+        engine.remove_link("A", "C")
+        self.assertEqual(engine.path("A", "D"), (["A", "B", "C", "D"], 12.0))
+        engine.remove_link("B", "C")
+        self.assertIsNone(engine.path("A", "D"))
+        self.assertEqual(engine.path("X", "Y"), (["X", "Y"], 1.0))
+        self.assertEqual(engine.stats["trees_built"], 2)
+
+    def test_path_repairs_match_fresh_computation(self):
+        """Repaired trees must agree with trees computed from scratch."""
+        rng = random.Random(3)
+        engine = PathEngine(max_trees=8)
+        for _ in range(120):
+            engine.set_link(f"n{rng.randrange(40)}", f"n{rng.randrange(40)}", rng.randint(1, 9))
+        for _ in range(200):
+            for src in range(0, 40, 5):
+                engine.path(f"n{src}", "n0")
+            a, b = f"n{rng.randrange(40)}", f"n{rng.randrange(40)}"
+            if rng.random() < 0.3:
+                engine.remove_link(a, b)
+            else:
+                engine.set_link(a, b, rng.randint(1, 9))
+            fresh = PathEngine()
+            for (u, v), (energy, _) in engine.links.items():
+                fresh.set_link(u, v, energy, bidirectional=False)
+            for src in range(0, 40, 5):
+                for dst in range(40):
+                    got = engine.path(f"n{src}", f"n{dst}")
+                    want = fresh.path(f"n{src}", f"n{dst}")
+                    self.assertEqual(got and got[1], want and want[1])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,203 @@
+import asyncio
+import unittest
+import random
+from interconnect.holonet import (
+    Frame, FrameBroadcaster, FrameCodec, FrameDecoder, FrameQueue, HoloNet, SpatialGrid, parse_frame,
+)
+
+
+class TestHoloNetBroadcast(unittest.TestCase):
+
+    def setUp(self):
+        """A room with a presenter and two viewers, using tiny queues."""
+        self.hn = HoloNet(broadcaster=FrameBroadcaster(queue_size=2))
+        self.hn.create_hologram("stage")
+        for user in ("P", "V1", "V2"):
+            self.hn.add_participant(user, "stage")
+
+    def test_frame_is_shared_by_reference(self):
+        """One encoded frame reaches every receiver except the sender."""
+        result = self.hn.broadcast_vr_message("stage", "pose", sender="P")
+        self.assertEqual(sorted(result["receivers"]), ["V1", "V2"])
+        self.assertEqual(result["queued"], 2)
+        queues = self.hn.broadcaster.queues
+        first, second = queues[("stage", "V1")].get_nowait(), queues[("stage", "V2")].get_nowait()
+        self.assertIs(first, second)
+        self.assertEqual(bytes(FrameDecoder().decode(first.payload)), b"pose")
+        self.assertNotIn(("stage", "P"), queues)
+
+    def test_slow_consumer_coalesces_same_sender(self):
+        """A full queue keeps the newest delta per sender instead of stalling."""
+        for i in range(4):
+            self.hn.broadcast_vr_message("stage", f"f{i}".ljust(100), sender="P")
+        decoder = FrameDecoder()
+        pending = [bytes(decoder.decode(f.payload)).rstrip() for f in self.hn.broadcaster.queues[("stage", "V1")].drain()]
+        self.assertEqual(pending, [b"f0", b"f3"])
+        stats = self.hn.broadcaster.room_stats("stage")
+        self.assertEqual(stats["frames"], 4)
+        self.assertEqual(stats["coalesced"], 4)
+
+    def test_delta_never_replaces_pending_keyframe(self):
+        """Coalescing never evicts a keyframe that deltas rely on."""
+        self.hn.broadcast_vr_message("stage", "other", sender="V2")
+        for i in range(2):
+            result = self.hn.broadcast_vr_message("stage", f"f{i}".ljust(100), sender="P")
+        self.assertEqual(result["dropped"], 1)
+        frames = self.hn.broadcaster.queues[("stage", "V1")].drain()
+        self.assertEqual([(f.sender, f.keyframe) for f in frames], [("V2", True), ("P", True)])
+
+        # The keyframe is the only queued frame: the delta gives way instead
+        queue = FrameQueue(maxsize=1)
+        key, delta = Frame("stage", "P", 0, b"k"), Frame("stage", "P", 1, b"d", keyframe=False)
+        self.assertEqual(queue.offer(key), "queued")
+        self.assertEqual(queue.offer(delta), "dropped")
+        self.assertEqual(queue.drain(), [key])
+
+        # The keyframe is the oldest frame: another stream's delta is evicted
+        queue = FrameQueue(maxsize=2)
+        other = Frame("stage", "Q", 0, b"q", keyframe=False)
+        queue.offer(key)
+        queue.offer(other)
+        self.assertEqual(queue.offer(delta), "coalesced")
+        self.assertEqual(queue.drain(), [key, delta])
+
+    def test_coalescing_is_per_room_stream(self):
+        """A sender's keyframe in one room never replaces its keyframe in another."""
+        queue = FrameQueue(maxsize=2)
+        a, b = Frame("A", "P", 0, b"a"), Frame("B", "P", 0, b"b")
+        queue.offer(a)
+        queue.offer(Frame("A", "Q", 0, b"q"))
+        self.assertEqual(queue.offer(b), "dropped")
+        newer = Frame("A", "P", 1, b"a2")
+        self.assertEqual(queue.offer(newer), "coalesced")
+        self.assertEqual([f.payload for f in queue.drain()], [b"q", b"a2"])
+
+    def test_drop_policy_discards_new_frames(self):
+        """The drop policy keeps what is queued and counts the rest."""
+        queue = FrameQueue(maxsize=1)
+        self.hn.broadcast_vr_message("stage", "a", sender="P")
+        frames = self.hn.broadcaster.queues[("stage", "V1")].drain()
+        self.assertEqual(queue.offer(frames[0], "drop"), "queued")
+        self.assertEqual(queue.offer(frames[0], "drop"), "dropped")
+
+    def test_leaving_and_room_removal_free_state(self):
+        """Queues and codec streams go away with their participant or room."""
+        self.hn.create_hologram("side")
+        self.hn.add_participant("V1", "side")
+        self.hn.broadcast_vr_message("stage", "pose", sender="P")
+        self.hn.broadcast_vr_message("stage", "wave", sender="V1")
+        self.hn.broadcast_vr_message("side", "hi")
+        broadcaster, codec = self.hn.broadcaster, self.hn.codec
+        self.assertIn(("side", "V1"), broadcaster.queues)
+        self.assertTrue(self.hn.remove_participant("V1", "stage"))
+        self.assertNotIn(("stage", "V1"), broadcaster.queues)
+        self.assertNotIn(("stage", "V1"), codec.streams)
+        self.assertEqual(len(broadcaster.queues[("side", "V1")]), 1)
+        self.assertTrue(self.hn.remove_hologram("stage"))
+        self.assertFalse(self.hn.remove_hologram("stage"))
+        self.assertEqual(set(broadcaster.queues), {("side", "V1")})
+        self.assertEqual(set(codec.streams), {("side", None)})
+        self.assertEqual(len(codec._state), 1)
+        self.assertEqual(self.hn.broadcast_vr_message("stage", "x")["status"], "error")
+
+    def test_unknown_room(self):
+        self.assertEqual(self.hn.broadcast_vr_message("nowhere", "x")["status"], "error")
+
+    def test_async_receive_reports_latency(self):
+        """Receivers awaiting frames are woken and latency is recorded."""
+        async def scenario():
+            reader = asyncio.ensure_future(self.hn.receive("V1", "stage"))
+            await asyncio.sleep(0)
+            await self.hn.broadcast_vr_message_async("stage", b"\x00\x01", sender="P")
+            many = await self.hn.broadcaster.receive_many("stage", "V2")
+            return await reader, many
+
+        frame, many = asyncio.run(scenario())
+        self.assertEqual(parse_frame(frame.payload)[4], b"\x00\x01")
+        self.assertEqual(many, [frame])
+        stats = self.hn.broadcaster.room_stats("stage")
+        self.assertIn("latency_p99_ms", stats)
+        self.assertEqual(stats["drop_rate"], 0.0)
+
+
+class TestFrameCodec(unittest.TestCase):
+
+    def test_deltas_round_trip(self):
+        """Mostly-static payloads become small deltas that decode exactly."""
+        rng = random.Random(6)
+        codec, decoder = FrameCodec(keyframe_interval=10), FrameDecoder()
+        scene = bytearray(rng.randbytes(4096))
+        flags = []
+        for tick in range(25):
+            for _ in range(3):
+                scene[rng.randrange(len(scene))] = rng.randrange(256)
+            if tick == 12:
+                scene.extend(b"grown")
+            if tick == 18:
+                del scene[-100:]
+            wire, keyframe = codec.encode("room", "P", bytes(scene))
+            flags.append(keyframe)
+            self.assertEqual(bytes(decoder.decode(wire)), bytes(scene))
+        self.assertEqual([i for i, k in enumerate(flags) if k], [0, 10, 20])
+        self.assertLess(codec.stats["wire_bytes"], codec.stats["raw_bytes"] / 5)
+
+    def test_large_changes_force_keyframe(self):
+        codec = FrameCodec()
+        codec.encode("room", "P", bytes(1000))
+        self.assertTrue(codec.encode("room", "P", bytes(range(256)) * 4)[1])
+
+    def test_delta_without_keyframe_is_skipped(self):
+        """A receiver that missed the keyframe waits for the next one."""
+        codec, decoder = FrameCodec(), FrameDecoder()
+        codec.encode("room", "P", b"x" * 60)
+        wire, keyframe = codec.encode("room", "P", b"x" * 59 + b"y")
+        self.assertFalse(keyframe)
+        self.assertIsNone(decoder.decode(wire))
+        self.assertEqual(decoder.stats["missing_base"], 1)
+        with self.assertRaises(ValueError):
+            parse_frame(b"XX" + wire[2:])
+
+
+class TestSpatialInterest(unittest.TestCase):
+
+    def setUp(self):
+        self.hn = HoloNet()
+        self.hn.create_hologram("plaza", interest_radius=5.0)
+        self.hn.add_participant("A", "plaza", (0, 0, 0))
+        self.hn.add_participant("B", "plaza", (3, 4, 0))
+        self.hn.add_participant("C", "plaza", (20, 0, 0))
+
+    def test_broadcast_limited_to_interest_radius(self):
+        """Only participants within the radius (inclusive) receive."""
+        self.assertEqual(self.hn.broadcast_vr_message("plaza", "hi", sender="A")["receivers"], ["B"])
+        self.assertEqual(self.hn.broadcast_vr_message("plaza", "hi", sender="C")["receivers"], [])
+        self.assertEqual(self.hn.broadcast_vr_message("plaza", "all")["count"], 3)
+
+    def test_moving_updates_interest(self):
+        """Moves across cells are reflected in later broadcasts."""
+        self.hn.move_participant("C", "plaza", (1, -1, 1))
+        self.assertEqual(sorted(self.hn.broadcast_vr_message("plaza", "hi", sender="A")["receivers"]), ["B", "C"])
+        self.assertTrue(self.hn.remove_participant("B", "plaza"))
+        self.assertEqual(self.hn.broadcast_vr_message("plaza", "hi", sender="A")["receivers"], ["C"])
+        self.assertFalse(self.hn.add_participant("A", "plaza"))
+
+    def test_grid_query_matches_brute_force(self):
+        """Grid results equal a full distance scan, including negative coordinates."""
+        rng = random.Random(2)
+        grid = SpatialGrid(cell_size=4.0)
+        points = {f"u{i}": tuple(rng.uniform(-50, 50) for _ in range(3)) for i in range(500)}
+        for user, pos in points.items():
+            grid.move(user, pos)
+        for user in list(points)[:100]:
+            points[user] = tuple(rng.uniform(-50, 50) for _ in range(3))
+            grid.move(user, points[user])
+        for _ in range(20):
+            center = tuple(rng.uniform(-50, 50) for _ in range(3))
+            radius = rng.uniform(1, 15)
+            expected = {u for u, p in points.items()
+                        if sum((a - b) ** 2 for a, b in zip(p, center)) <= radius ** 2}
+            self.assertEqual(set(grid.query(center, radius)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
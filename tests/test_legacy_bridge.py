@@ -0,0 +1,324 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from interconnect.legacy_bridge import LegacyBridge, freshness_lifetime
+from security.crypto_engine import CryptoEngine
+from utils.persistence import StatePersistence
+
+
+def _blob(size: int) -> bytes:
+    return (bytes(range(256)) * (size // 256 + 1))[:size]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def _reply(self, body: bytes, status: int = 200, headers: dict = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """/fresh is cacheable for a minute, /etag must revalidate, /slow takes 50 ms."""
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.ports.add(self.client_address[1])
+            server.hits[self.path] += 1
+        if self.path.startswith("/slow"):
+            time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+        if self.path.startswith("/vary/"):
+            self._reply(self.headers.get("User-Agent", "").encode(),
+                        headers={"Cache-Control": "max-age=60", "Vary": self.path[6:]})
+        elif self.path.startswith("/blob/"):
+            self._reply(_blob(int(self.path[6:])))
+        elif self.path.startswith("/fresh") or self.path.startswith("/slow/fresh"):
+            self._reply(self.path.encode(), headers={"Cache-Control": "max-age=60"})
+        elif self.path.startswith("/etag"):
+            headers = {"ETag": '"v1"', "Cache-Control": "no-cache"}
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._reply(b"", 304, headers)
+            else:
+                self._reply(b"versioned", headers=headers)
+        else:
+            self._reply(self.path.encode())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self._reply(json.dumps({"echo": json.loads(body)}).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class _LocalServerCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """A local keep-alive HTTP server standing in for the legacy internet."""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.lock = threading.Lock()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.active = self.server.peak = 0
+        self.server.ports = set()
+        self.server.hits = Counter()
+        self.bridge = LegacyBridge(max_per_host=4, max_in_flight=4)
+
+    def tearDown(self):
+        self.bridge.close()
+
+
+class TestLegacyBridge(_LocalServerCase):
+
+    def test_sequential_requests_reuse_connection(self):
+        """Back-to-back calls go over one pooled keep-alive connection."""
+        for i in range(5):
+            self.assertEqual(self.bridge.send_http(f"{self.base}/item/{i}"), f"/item/{i}")
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_post_and_unsupported_method(self):
+        """POST sends JSON; other methods are rejected with None."""
+        text = self.bridge.send_http(f"{self.base}/submit", method="POST", data={"x": 1})
+        self.assertEqual(json.loads(text), {"echo": {"x": 1}})
+        self.assertIsNone(self.bridge.send_http(self.base, method="DELETE"))
+
+    def test_send_many_preserves_order(self):
+        """Results come back in input order, with failures as None."""
+        specs = [f"{self.base}/a", (f"{self.base}/b", "POST", {"k": "v"}), {"url": "http://127.0.0.1:1/"}]
+        results = self.bridge.send_many(specs)
+        self.assertEqual(results[0], "/a")
+        self.assertEqual(json.loads(results[1]), {"echo": {"k": "v"}})
+        self.assertIsNone(results[2])
+
+    def test_send_many_malformed_specs_yield_none(self):
+        """Bad specs become None results without disturbing the others."""
+        specs = [{"url": f"{self.base}/ok", "verb": "GET"}, {"method": "GET"}, (), 42, f"{self.base}/ok"]
+        with self.assertLogs("interconnect.legacy_bridge", level="ERROR"):
+            results = self.bridge.send_many(specs)
+        self.assertEqual(results, [None, None, None, None, "/ok"])
+
+    def test_send_many_respects_in_flight_limit(self):
+        """Slow requests overlap, but never beyond the configured limit."""
+        urls = [f"{self.base}/slow/{i}" for i in range(12)]
+        started = time.perf_counter()
+        results = self.bridge.send_many(urls, max_in_flight=3)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(results, [f"/slow/{i}" for i in range(12)])
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertGreater(self.server.peak, 1)
+        self.assertLess(elapsed, 12 * 0.05)
+
+    def test_send_many_as_completed(self):
+        """The streaming form yields every (index, text) pair exactly once."""
+        urls = [f"{self.base}/n/{i}" for i in range(10)]
+        pairs = list(self.bridge.send_many(urls, as_completed=True))
+        self.assertEqual(sorted(pairs), [(i, f"/n/{i}") for i in range(10)])
+
+
+
+class TestResponseCache(_LocalServerCase):
+
+    def test_fresh_response_served_from_memory(self):
+        """max-age responses skip the network until they expire."""
+        url = f"{self.base}/fresh/a"
+        self.assertEqual(self.bridge.send_http(url), "/fresh/a")
+        self.assertEqual(self.bridge.send_http(url), "/fresh/a")
+        self.assertEqual(self.server.hits["/fresh/a"], 1)
+        stats = self.bridge.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertIn("hits_p99_ms", stats)
+
+    def test_uncacheable_response_always_fetched(self):
+        """Without freshness or validators nothing is stored."""
+        for _ in range(2):
+            self.bridge.send_http(f"{self.base}/plain")
+        self.assertEqual(self.server.hits["/plain"], 2)
+        self.assertEqual(len(self.bridge.cache), 0)
+
+    def test_etag_revalidation(self):
+        """no-cache + ETag revalidates with If-None-Match and reuses the body."""
+        url = f"{self.base}/etag"
+        self.assertEqual(self.bridge.send_http(url), "versioned")
+        self.assertEqual(self.bridge.send_http(url), "versioned")
+        self.assertEqual(self.server.hits["/etag"], 2)
+        self.assertEqual(self.bridge.cache.stats()["revalidated"], 1)
+
+    def test_post_invalidates(self):
+        """A POST to a cached URL drops the stored response."""
+        url = f"{self.base}/fresh/b"
+        self.bridge.send_http(url)
+        self.bridge.send_http(url, method="POST", data={})
+        self.bridge.send_http(url)
+        self.assertEqual(self.server.hits["/fresh/b"], 2)
+
+    def test_concurrent_gets_coalesce(self):
+        """Identical in-flight GETs share one upstream request."""
+        url = f"{self.base}/slow/fresh"
+        results = self.bridge.send_many([url] * 4, max_in_flight=4)
+        self.assertEqual(results, ["/slow/fresh"] * 4)
+        self.assertEqual(self.server.hits["/slow/fresh"], 1)
+        stats = self.bridge.cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["coalesced"] + stats["hits"], 3)
+
+    def test_lru_eviction_and_disk_tier(self):
+        """Evicted entries are reloaded from the persistence tier."""
+        with tempfile.TemporaryDirectory() as tmp:
+            bridge = LegacyBridge(persistence=StatePersistence(tmp), cache_entries=1, cache_to_disk=True)
+            try:
+                bridge.send_http(f"{self.base}/fresh/x")
+                bridge.send_http(f"{self.base}/fresh/y")
+                self.assertEqual(bridge.cache.counters["evictions"], 1)
+                self.assertEqual(bridge.send_http(f"{self.base}/fresh/x"), "/fresh/x")
+                self.assertEqual(self.server.hits["/fresh/x"], 1)
+                self.assertEqual(bridge.cache.counters["disk_hits"], 1)
+            finally:
+                bridge.close()
+
+    def test_disk_tier_is_bounded_quiet_and_deletes(self):
+        """The disk tier evicts files LRU, never prints, and invalidation deletes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            bridge = LegacyBridge(persistence=StatePersistence(tmp), cache_to_disk=True)
+            bridge.cache.disk_entries = 2
+            try:
+                with contextlib.redirect_stdout(io.StringIO()) as out:
+                    for name in ("a", "b", "c"):
+                        bridge.send_http(f"{self.base}/fresh/disk-{name}")
+                self.assertEqual(out.getvalue(), "")
+                self.assertEqual(len(os.listdir(tmp)), 2)
+                self.assertEqual(bridge.cache.counters["disk_evictions"], 1)
+                bridge.send_http(f"{self.base}/fresh/disk-c", method="POST", data={})
+                self.assertEqual(len(os.listdir(tmp)), 1)
+                reopened = LegacyBridge(persistence=StatePersistence(tmp), cache_to_disk=True)
+                self.assertEqual(reopened.cache.disk_used, bridge.cache.disk_used)
+                reopened.close()
+            finally:
+                bridge.close()
+
+    def test_vary_is_respected(self):
+        """Vary: * is not stored; other Vary headers must match the request."""
+        star = f"{self.base}/vary/*"
+        for _ in range(2):
+            self.bridge.send_http(star)
+        self.assertEqual(self.server.hits["/vary/*"], 2)
+        url = f"{self.base}/vary/User-Agent"
+        self.assertEqual(self.bridge.send_http(url), self.bridge._session().headers["User-Agent"])
+        self.bridge.send_http(url)
+        self.assertEqual(self.server.hits["/vary/User-Agent"], 1)
+        self.bridge._session().headers["User-Agent"] = "other-agent"
+        self.assertEqual(self.bridge.send_http(url), "other-agent")
+        self.assertEqual(self.server.hits["/vary/User-Agent"], 2)
+
+    def test_freshness_lifetime(self):
+        """Cache-Control wins over Expires; no-store is never stored."""
+        now = 1_000_000.0
+        self.assertEqual(freshness_lifetime({"Cache-Control": "public, max-age=30", "Age": "10"}, now), 20)
+        self.assertIsNone(freshness_lifetime({"Cache-Control": "no-store"}, now))
+        self.assertEqual(freshness_lifetime({"Cache-Control": "no-cache, max-age=30"}, now), 0.0)
+        expires = {"Date": "Sun, 06 Nov 1994 08:49:37 GMT", "Expires": "Sun, 06 Nov 1994 08:50:37 GMT"}
+        self.assertEqual(freshness_lifetime(expires, now), 60)
+        self.assertEqual(freshness_lifetime({"Expires": "0"}, now), 0.0)
+
+
+
+class TestStreaming(_LocalServerCase):
+
+    def test_stream_http_yields_bounded_chunks(self):
+        """Bodies arrive as raw chunks no larger than chunk_size."""
+        chunks = list(self.bridge.stream_http(f"{self.base}/blob/100000", chunk_size=16_384))
+        self.assertLessEqual(max(map(len, chunks)), 16_384)
+        self.assertEqual(b"".join(chunks), _blob(100_000))
+        self.assertEqual(len(self.bridge.cache), 0)
+
+    def test_download_to_path_and_file(self):
+        """download writes to a path or an open binary file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "body.bin")
+            self.assertEqual(self.bridge.download(f"{self.base}/blob/5000", path), 5000)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), _blob(5000))
+        buffer = io.BytesIO()
+        self.assertEqual(self.bridge.download(f"{self.base}/blob/300", buffer), 300)
+        self.assertEqual(buffer.getvalue(), _blob(300))
+
+    def test_failed_download_leaves_no_file(self):
+        """Unreachable hosts return None and leave no partial file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "body.bin")
+            self.assertIsNone(self.bridge.download("http://127.0.0.1:1/", path))
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_encrypted_download_to_persistence(self):
+        """Chunks are encrypted on the way into persistence and decrypt back."""
+        crypto = CryptoEngine()
+        with tempfile.TemporaryDirectory() as tmp:
+            store = StatePersistence(tmp)
+            bridge = LegacyBridge(persistence=store, crypto=crypto)
+            try:
+                written = bridge.download(f"{self.base}/blob/70000", filename="body.enc",
+                                          chunk_size=8_192, encrypt=True)
+            finally:
+                bridge.close()
+            self.assertGreater(written, 70_000)
+            with store.open_stream("body.enc") as f:
+                self.assertEqual(b"".join(crypto.decrypt_stream(f)), _blob(70_000))
+
+    def test_abandoned_streams_do_not_block_the_pool(self):
+        """Started but unfinished streams leave later requests free to run."""
+        streams = [self.bridge.stream_http(f"{self.base}/blob/{1 << 20}", chunk_size=1024) for _ in range(6)]
+        for stream in streams:
+            self.assertEqual(len(next(stream)), 1024)
+        results = []
+        worker = threading.Thread(target=lambda: results.append(self.bridge.send_http(f"{self.base}/after")),
+                                  daemon=True)
+        worker.start()
+        worker.join(5)
+        self.assertEqual(results, ["/after"])
+        for stream in streams:
+            stream.close()
+
+    def test_save_stream_is_atomic_and_logged(self):
+        """Persistence streams log their summary and leave no file on failure."""
+        def broken():
+            yield b"partial"
+            raise OSError("connection reset")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = StatePersistence(tmp)
+            with self.assertLogs("utils.persistence", level="INFO"):
+                self.assertEqual(store.save_stream("ok.bin", [b"ab", b"cd"]), 4)
+            with self.assertRaises(OSError):
+                store.save_stream("bad.bin", broken())
+            self.assertEqual(os.listdir(tmp), ["ok.bin"])
+
+    def test_encrypt_requires_crypto(self):
+        with self.assertRaises(ValueError):
+            self.bridge.stream_http(f"{self.base}/blob/10", encrypt=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
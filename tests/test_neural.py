@@ -0,0 +1,191 @@
+import random
+import unittest
+import numpy as np
+from interconnect.neural_net import NeuralNet, PatternIds, PatternIndex, PatternStore, PredictionCache
+
+
+class TestPatternIndex(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(3)
+        words = ["login", "logout", "stream", "video", "sync", "audio", "node", "ping"]
+        self.patterns = sorted({
+            ":".join(rng.choice(words) for _ in range(rng.randint(1, 4))) for _ in range(300)
+        })
+        self.index = PatternIndex()
+        for p in self.patterns:
+            self.index.add(p)
+
+    def test_search_matches_linear_scan(self):
+        """Every query length returns exactly the patterns containing it."""
+        for query in ["", "o", "lo", "log", "login", "n:vid", "sync:ping:", "zzz", "video:audio:node"]:
+            expected = [i for i, p in enumerate(self.patterns) if query in p]
+            self.assertEqual(sorted(self.index.search(query)), expected, query)
+
+    def test_add_is_idempotent(self):
+        """Re-adding a pattern returns its id without duplicating postings."""
+        self.assertEqual(self.index.add(self.patterns[5]), 5)
+        self.assertEqual(len(self.index), len(self.patterns))
+        self.assertEqual(list(self.index.search(self.patterns[5])).count(5), 1)
+
+
+class TestNeuralNetPredict(unittest.TestCase):
+
+    def setUp(self):
+        self.nn = NeuralNet()
+        for p in ["user:login", "user:logout", "admin:login", "user:stream"]:
+            self.nn.learn_pattern(p)
+        self.nn.weights.update({"user:login": 0.6, "user:logout": 0.9,
+                                "admin:login": 0.7, "user:stream": 0.6})
+
+    def test_predict_picks_heaviest_match(self):
+        """predict keeps its original output format."""
+        self.assertEqual(self.nn.predict("login"), "Prediction: admin:login (confidence=0.70)")
+        self.assertEqual(self.nn.predict("nothing"), "Unknown pattern")
+
+    def test_top_k_follows_reinforcement(self):
+        """Weight changes from reinforce are reflected without reindexing."""
+        self.assertEqual([p for p, _ in self.nn.predict_top("user", 2)], ["user:logout", "user:login"])
+        for _ in range(8):
+            self.nn.reinforce("user:stream", True)
+        self.assertEqual(self.nn.predict_top("user", 1)[0][0], "user:stream")
+
+    def test_ties_prefer_earliest_learned(self):
+        """Equal weights resolve like the original max() scan."""
+        self.assertEqual(self.nn.predict_top("user:", 3)[1][0], "user:login")
+
+    def test_learned_patterns_are_searchable(self):
+        """Patterns learned after the first query are indexed incrementally."""
+        self.nn.predict("video")
+        self.nn.learn_pattern("user:video")
+        self.assertIn("user:video", self.nn.predict("video"))
+        self.assertFalse(self.nn.learn_pattern("user:video"))
+
+
+class TestPatternStoreBatches(unittest.TestCase):
+
+    def setUp(self):
+        self.nn = NeuralNet()
+        self.nn.learn_batch(f"p{i}" for i in range(2000))
+
+    def test_learn_batch_skips_known_patterns(self):
+        """Known and repeated patterns are not learned twice."""
+        self.assertEqual(self.nn.learn_batch(["p1", "new", "new"]), 1)
+        self.assertEqual(len(self.nn.patterns), 2001)
+        self.assertTrue(all(0.5 <= w <= 1.0 for w in self.nn.weights.values()))
+
+    def test_reinforce_batch_matches_sequential(self):
+        """A batch equals the per-event loop when no weight hits a bound."""
+        rng = random.Random(4)
+        for i in range(2000):
+            self.nn.weights[f"p{i}"] = 0.5
+        events = [(f"p{rng.randrange(2000)}", rng.random() < 0.5) for _ in range(200)] + [("ghost", True)]
+        reference = NeuralNet()
+        reference.weights.update(dict(self.nn.weights.items()))
+        for pattern, success in events:
+            reference.reinforce(pattern, success)
+        applied = self.nn.reinforce_batch([p for p, _ in events], [o for _, o in events])
+        self.assertEqual(applied, 200)
+        np.testing.assert_allclose(self.nn.weights.array, reference.weights.array, atol=1e-5)
+
+    def test_reinforce_batch_clips_and_accepts_ids(self):
+        """Pre-resolved ids work and weights stay within [0, 1]."""
+        ids = self.nn.weights.ids(["p0", "p1"])
+        self.nn.reinforce_batch(np.repeat(ids, 30), [True] * 30 + [False] * 30)
+        self.assertEqual(self.nn.weights["p0"], 1.0)
+        self.assertEqual(self.nn.weights["p1"], 0.0)
+
+    def test_reinforce_batch_accepts_string_arrays(self):
+        """A NumPy array of pattern strings is resolved, not taken as ids."""
+        self.nn.weights["p0"] = 0.5
+        applied = self.nn.reinforce_batch(np.array(["p0", "p0", "ghost"]), [False] * 3)
+        self.assertEqual(applied, 2)
+        self.assertAlmostEqual(self.nn.weights["p0"], 0.4, places=5)
+
+    def test_pattern_ids_survive_merges_and_collisions(self):
+        """Lookups agree with a dict across merges, including equal hashes."""
+        patterns = []
+        ids = PatternIds(patterns)
+        ids.MERGE_MIN = 8
+        for i in range(100):
+            patterns.append(f"k{i}")
+            ids[f"k{i}"] = i
+        # -1 and -2 share a hash in CPython
+        for key in (-1, -2):
+            patterns.append(key)
+            ids[key] = len(patterns) - 1
+        ids.compact()
+        self.assertEqual([ids.get(p) for p in patterns], list(range(102)))
+        self.assertEqual(ids.get_many(patterns + ["nope"]).tolist(), list(range(102)) + [-1])
+        self.assertNotIn("nope", ids)
+        with self.assertRaises(KeyError):
+            ids["nope"]
+
+    def test_top_k_ties_at_boundary_keep_earliest(self):
+        """Partial selection still prefers earlier ids among equal weights."""
+        store = PatternStore(capacity=4)
+        for i in range(10):
+            store[f"x{i}"] = 0.9 if i in (7, 8) else 0.5
+        top = store.index.top("x", 4, store.array)
+        self.assertEqual(top, [7, 8, 0, 1])
+
+
+class TestPredictionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.nn = NeuralNet(cache_size=8)
+        for p in ["user:login", "user:logout", "admin:login"]:
+            self.nn.learn_pattern(p)
+        self.nn.weights.update({"user:login": 0.6, "user:logout": 0.9, "admin:login": 0.7})
+
+    def test_repeated_queries_hit(self):
+        """Smaller k is served from a larger cached result."""
+        first = self.nn.predict_top("log", 3)
+        self.assertEqual(self.nn.predict_top("log", 1), first[:1])
+        self.assertEqual(self.nn.cache.stats["hits"], 1)
+        self.assertEqual(self.nn.cache.stats["misses"], 1)
+
+    def test_reinforce_invalidates_only_matching_queries(self):
+        """Queries that cannot match the reinforced pattern stay cached."""
+        for q in ["admin", "login", "out", "user"]:
+            self.nn.predict(q)
+        self.nn.reinforce("admin:login", True)
+        self.assertEqual(set(self.nn.cache._entries), {"out", "user"})
+        self.assertIn("admin:login (confidence=0.75)", self.nn.predict("login"))
+
+    def test_learning_refreshes_affected_queries(self):
+        """Single and batch learning both expose new matches."""
+        self.nn.predict("stream")
+        self.nn.predict("user")
+        self.nn.learn_pattern("user:stream")
+        self.assertNotIn("user", self.nn.cache._entries)
+        self.assertIn("user:stream", self.nn.predict("stream"))
+        self.nn.predict("user")
+        self.nn.predict("video")
+        self.nn.learn_batch(["admin:video"])
+        self.assertIn("admin:video", self.nn.predict("video"))
+        self.assertIn("user", self.nn.cache._entries)
+
+    def test_reinforce_batch_invalidates_touched(self):
+        """Batch reinforcement drops queries matching touched patterns."""
+        self.nn.predict("admin")
+        self.nn.predict("out")
+        self.nn.reinforce_batch(["admin:login"] * 6, [True] * 6)
+        self.assertEqual(set(self.nn.cache._entries), {"out"})
+        self.assertEqual(self.nn.predict_top("admin", 1)[0][1], 1.0)
+
+    def test_lru_and_ttl(self):
+        """Entries are evicted by size and expire after the TTL."""
+        cache = PredictionCache(max_entries=2)
+        for q in "abc":
+            cache.put(q, 1, [])
+        self.assertEqual(list(cache._entries), ["b", "c"])
+        self.assertEqual(cache.stats["evictions"], 1)
+        cache = PredictionCache(ttl=-1)
+        cache.put("a", 1, [])
+        self.assertIsNone(cache.get("a", 1))
+        self.assertEqual(cache.stats["expired"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,10 @@
+import gc
+import json
+import os
+import tempfile
+import threading
 import unittest
-from interconnect.quantum_internet import QuantumInternet
+from interconnect.quantum_internet import BB84Simulator, EntanglementGraph, KeyPool, KeyPoolExhausted, QuantumInternet
 
 class TestQuantumInternet(unittest.TestCase):
 
@@ -18,5 +23,223 @@ class TestQuantumInternet(unittest.TestCase):
         self.assertIn("NodeA", self.qi.entanglements)
         self.assertEqual(self.qi.entanglements["NodeA"], "NodeB")
 
+
+class TestQuantumPulses(unittest.TestCase):
+
+    def setUp(self):
+        """Create two entangled nodes with a shared QKD key."""
+        self.qi = QuantumInternet()
+        self.qi.add_node("Alice")
+        self.qi.add_node("Bob")
+        self.qi.entangle("Alice", "Bob")
+        self.key = self.qi.qkd_handshake("Alice", "Bob")
+
+    def test_text_pulse_matches_character_xor(self):
+        """Text pulses keep the original per-character XOR output."""
+        message = "Hello ∞ quantum 🌌"
+        expected = "".join(
+            chr(ord(c) ^ ord(self.key[i % len(self.key)])) for i, c in enumerate(message)
+        )
+        pulse = self.qi.send_quantum_pulse("Alice", message, target="Bob")
+        self.assertEqual(pulse["message"], expected)
+
+    def test_bytes_pulse_round_trip(self):
+        """Bytes-like payloads are encrypted to bytes and decrypt symmetrically."""
+        data = bytes(range(256)) * 40
+        pulse = self.qi.send_quantum_pulse("Alice", memoryview(data), target="Bob")
+        self.assertIsInstance(pulse["message"], bytes)
+        self.assertNotEqual(pulse["message"], data)
+        self.assertEqual(self.qi._encrypt_message(pulse["message"], self.key), data)
+
+    def test_stream_matches_whole_message(self):
+        """Streaming encryption must match encrypting the joined payload."""
+        chunks = [b"a" * 7, b"b" * 33, b"", b"c" * 100]
+        result = self.qi.send_quantum_stream("Alice", iter(chunks), "Bob")
+        streamed = b"".join(result["stream"])
+        whole = self.qi.send_quantum_pulse("Alice", b"".join(chunks), target="Bob")
+        self.assertEqual(streamed, whole["message"])
+
+
+class TestEntanglementGraph(unittest.TestCase):
+
+    def setUp(self):
+        """Build a repeater chain A - R1 - R2 - B plus a spur R1 - C."""
+        self.qi = QuantumInternet()
+        for node in ("A", "R1", "R2", "B", "C"):
+            self.qi.add_node(node)
+        for pair in (("A", "R1"), ("R1", "R2"), ("R2", "B"), ("R1", "C")):
+            self.qi.entangle(*pair)
+
+    def test_nodes_hold_many_links(self):
+        """A node keeps every peer it is entangled with."""
+        self.assertEqual(self.qi.nodes["R1"]["entangled_with"], {"A", "R2", "C"})
+        self.assertTrue(self.qi.entanglements.linked("C", "R1"))
+        self.assertEqual(len(self.qi.entanglements), 4)
+
+    def test_pulse_over_repeater_chain(self):
+        """Non-adjacent nodes communicate via entanglement swapping."""
+        pulse = self.qi.send_quantum_pulse("A", "hi", target="B")
+        self.assertEqual(pulse["status"], "success")
+        self.assertEqual(pulse["path"], ["A", "R1", "R2", "B"])
+        self.assertEqual(self.qi.entanglements.route("B", "A"), ["B", "R2", "R1", "A"])
+
+    def test_route_cache_invalidation(self):
+        """Removing a link drops only the cached routes that used it."""
+        graph = self.qi.entanglements
+        graph.route("A", "B")
+        graph.route("A", "C")
+        self.qi.disentangle("R2", "B")
+        self.assertEqual(graph.stats["routes_invalidated"], 1)
+        self.assertEqual(graph.route("A", "C"), ["A", "R1", "C"])
+        self.assertEqual(graph.stats["route_hits"], 1)
+        self.assertEqual(self.qi.send_quantum_pulse("A", "hi", target="B")["status"], "error")
+        self.qi.entangle("C", "B")
+        self.assertEqual(graph.route("A", "B"), ["A", "R1", "C", "B"])
+
+    def test_standalone_graph_search(self):
+        """Bidirectional BFS returns a shortest chain on a larger ring."""
+        graph = EntanglementGraph()
+        for i in range(100):
+            graph.add(f"n{i}", f"n{(i + 1) % 100}")
+        self.assertEqual(len(graph.route("n0", "n50")), 51)
+        self.assertEqual(graph.route("n0", "n97"), ["n0", "n99", "n98", "n97"])
+        self.assertIsNone(graph.route("n0", "missing"))
+
+
+class TestBB84(unittest.TestCase):
+
+    def test_clean_channel_yields_keys(self):
+        """A noiseless channel gives zero QBER and distinct 128-bit keys."""
+        sim = BB84Simulator(n_qubits=2048, error_rate=0.0, seed=1)
+        keys = sim.run(16)
+        self.assertTrue(all(key is not None and len(key) == 32 for key in keys))
+        self.assertEqual(len(set(keys)), 16)
+        self.assertEqual(float(sim.last_qber.max()), 0.0)
+        self.assertGreater(sim.stats["sifted_bits"], 16 * 900)
+
+    def test_noisy_channel_aborts(self):
+        """A QBER above the threshold aborts the handshake."""
+        qi = QuantumInternet(bb84=BB84Simulator(error_rate=0.25, seed=2))
+        qi.add_node("A")
+        qi.add_node("B")
+        self.assertIsNone(qi.qkd_handshake("A", "B"))
+        self.assertGreater(float(qi.bb84.last_qber[0]), 0.11)
+        self.assertNotIn(("A", "B"), qi.qkd_keys)
+
+    def test_batch_handshake(self):
+        """Batched handshakes install one key per established pair."""
+        qi = QuantumInternet(bb84=BB84Simulator(seed=3))
+        for node in ("A", "B", "C"):
+            qi.add_node(node)
+        keys = qi.qkd_handshake_batch([("A", "B"), ("B", "C"), ("A", "Z")])
+        self.assertEqual(set(keys), {("A", "B"), ("B", "C")})
+        self.assertEqual(qi.qkd_keys[("C", "B")], keys[("B", "C")])
+        qi.key_pool.close()
+
+
+class TestKeyPools(unittest.TestCase):
+
+    def setUp(self):
+        """Entangle two nodes and use a synchronous, small key pool."""
+        self.qi = QuantumInternet(history_size=4)
+        self.qi.key_pool = KeyPool(self.qi._generate_keys, size=4, low_water=2,
+                                   byte_budget=100, background=False)
+        for node in ("Alice", "Bob"):
+            self.qi.add_node(node)
+        self.qi.entangle("Alice", "Bob")
+        self.first = self.qi.qkd_handshake("Alice", "Bob")
+        self.pair = KeyPool.pair("Alice", "Bob")
+
+    def test_keys_rotate_on_byte_budget(self):
+        """The handshake key is used until its byte budget runs out."""
+        self.assertEqual(self.qi.key_pool.spares(self.pair), 4)
+        self.qi.send_quantum_pulse("Alice", b"x" * 60, target="Bob")
+        self.assertEqual(self.qi.qkd_keys[("Alice", "Bob")], self.first)
+        self.qi.send_quantum_pulse("Bob", b"y" * 60, target="Alice")
+        rotated = self.qi.qkd_keys[("Alice", "Bob")]
+        self.assertNotEqual(rotated, self.first)
+        self.assertEqual(self.qi.qkd_keys[("Bob", "Alice")], rotated)
+        self.assertEqual(self.qi.key_pool.stats["rotations"], 1)
+        self.assertEqual(self.qi.key_pool.stats["inline_keys"], 0)
+
+    def test_stream_bytes_count_against_budget(self):
+        """Streamed chunks are charged per piece and rotate keys mid-stream."""
+        data = bytes(range(250)) * 4
+        result = self.qi.send_quantum_stream("Alice", [data[i:i + 200] for i in range(0, 1000, 200)], "Bob")
+        pieces = list(result["stream"])
+        self.assertEqual([len(piece) for piece in pieces], [100] * 10)
+        self.assertEqual(self.qi.key_pool.stats["rotations"], 9)
+        self.assertEqual(self.qi._encrypt_message(pieces[0], self.first), data[:100])
+        last = self.qi.qkd_keys[("Alice", "Bob")]
+        self.assertNotEqual(last, self.first)
+        self.assertEqual(self.qi._encrypt_message(pieces[-1], last), data[-100:])
+
+    def test_dry_pool_generates_inline(self):
+        """An empty pool generates the next key itself, without holding the lock."""
+        pool = KeyPool(self._generate_checking_lock, size=0, low_water=-1, byte_budget=10, background=False)
+        self.pool = pool
+        pool.prime(self.pair, self.first)
+        self.assertEqual(pool.take(self.pair, 10), self.first)
+        rotated = pool.take(self.pair, 10)
+        self.assertNotEqual(rotated, self.first)
+        self.assertEqual(pool.stats["inline_keys"], 1)
+        self.assertEqual(pool.stats["rotations"], 1)
+
+    def _generate_checking_lock(self, count):
+        self.assertFalse(self.pool._lock.locked())
+        return self.qi._generate_keys(count)
+
+    def test_key_history_is_bounded_and_spills(self):
+        """Old history entries leave memory and land in the spill file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.qi.history_spill = os.path.join(tmp, "keys.jsonl")
+            for _ in range(10):
+                self.qi.send_quantum_pulse("Alice", b"z" * 100, target="Bob")
+            self.assertEqual(len(self.qi.key_history), 4)
+            with open(self.qi.history_spill, encoding="utf-8") as f:
+                spilled = [json.loads(line) for line in f]
+        self.assertEqual(len(spilled) + len(self.qi.key_history), 10)
+        self.assertEqual(spilled[0]["key"], self.first)
+
+    def test_background_refill(self):
+        """The background worker tops pools up without blocking senders."""
+        pool = KeyPool(self.qi._generate_keys, size=8, low_water=4)
+        pool.prime(self.pair, self.first)
+        pool.close()
+        self.assertEqual(pool.spares(self.pair), 8)
+
+    def test_close_stops_refill_workers(self):
+        """close(), the context manager and garbage collection all end the worker."""
+        def workers():
+            return [t for t in threading.enumerate() if t.name == "qkd-key-pool" and t.is_alive()]
+
+        before = len(workers())
+        for _ in range(3):
+            with QuantumInternet() as qi:
+                for node in ("A", "B"):
+                    qi.add_node(node)
+                qi.entangle("A", "B")
+                qi.qkd_handshake("A", "B")
+        self.assertEqual(len(workers()), before)
+        qi = QuantumInternet()
+        qi.key_pool.prime(self.pair, self.first)
+        worker = qi.key_pool._worker
+        del qi
+        gc.collect()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+
+    def test_exhausted_key_is_never_recycled(self):
+        """A failed inline generation refuses the send instead of reusing the key."""
+        pool = KeyPool(lambda count: [], size=0, low_water=-1, byte_budget=10, background=False)
+        pool.prime(self.pair, self.first)
+        self.assertEqual(pool.take(self.pair, 10), self.first)
+        for _ in range(2):
+            with self.assertRaises(KeyPoolExhausted):
+                pool.take(self.pair, 10)
+        self.qi.key_pool = pool
+        result = self.qi.send_quantum_pulse("Alice", b"x" * 10, target="Bob")
+        self.assertEqual(result["status"], "error")
+
 if __name__ == "__main__":
     unittest.main()
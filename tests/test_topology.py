@@ -0,0 +1,117 @@
+import logging
+import os
+import tempfile
+import unittest
+from interconnect.cosmic_substrate import CosmicSubstrate
+from interconnect.greennet import GreenNet
+from interconnect.quantum_internet import QuantumInternet
+from utils.topology import export_topology, load_topology
+
+RECORDS = """\
+{"layer": "quantum", "kind": "entangle", "a": "Q1", "b": "Q2"}
+{"layer": "quantum", "kind": "node", "name": "Q1"}
+{"layer": "quantum", "kind": "node", "name": "Q2"}
+{"layer": "quantum", "kind": "entangle", "a": "Q1", "b": "Ghost"}
+{"layer": "cosmic", "kind": "node", "name": "A"}
+{"layer": "cosmic", "kind": "node", "name": "B"}
+{"layer": "cosmic", "kind": "channel", "name": "ops"}
+{"layer": "cosmic", "kind": "member", "node": "A", "channel": "ops"}
+{"layer": "cosmic", "kind": "resonance", "a": "A", "b": "B"}
+{"layer": "greennet", "kind": "route", "node": "N1", "address": "10.0.0.1"}
+{"layer": "greennet", "kind": "route", "node": "N2", "address": "10.0.0.300"}
+{"layer": "greennet", "kind": "prefix", "prefix": "10.1.0.0/16", "node": "N1"}
+{"layer": "greennet", "kind": "link", "a": "N1", "b": "N2", "energy": 2.5, "latency": 1}
+{"layer": "greennet", "kind": "arc", "a": "N2", "b": "N3", "energy": 1, "latency": 0}
+"""
+
+
+class TestTopology(unittest.TestCase):
+
+    def setUp(self):
+        """Write a small mixed-layer topology file."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "topology.jsonl")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(RECORDS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _load(self, path):
+        layers = {"greennet": GreenNet(), "quantum": QuantumInternet(), "cosmic": CosmicSubstrate()}
+        return layers, load_topology(path, **layers)
+
+    def test_bulk_load_fills_all_layers(self):
+        """Valid records land in every layer; bad ones are rejected."""
+        layers, counts = self._load(self.path)
+        self.assertTrue(layers["quantum"].entanglements.linked("Q1", "Q2"))
+        self.assertEqual(layers["cosmic"].channels["ops"]["nodes"], {"A"})
+        self.assertEqual(layers["cosmic"].trust("A", "B"), 85)
+        self.assertEqual(layers["greennet"].resolve("10.1.2.3"), "N1")
+        self.assertEqual(layers["greennet"].topology.path("N1", "N3"), (["N1", "N2", "N3"], 3.5))
+        self.assertIsNone(layers["greennet"].topology.path("N3", "N2"))
+        self.assertEqual(counts["rejected"], 2)
+        self.assertEqual(counts["quantum.entangle"], 1)
+
+    def test_duplicates_and_non_objects_are_rejected(self):
+        """Only records that change a layer count as accepted."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"layer": "quantum", "kind": "entangle", "a": "Q2", "b": "Q1"}\n[1, 2]\n"text"\n')
+        layers, counts = self._load(self.path)
+        self.assertEqual(counts["quantum.entangle"], 1)
+        self.assertEqual(counts["rejected"], 5)
+
+    def test_malformed_lines_and_unknown_kinds_are_counted(self):
+        """Bad JSON and wrongly typed fields are rejected; unknown kinds are counted."""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"layer": "quantum", "kind": "node", "name": ["x"]}\n'
+                    '{"layer": "cosmic", "kind": "node", "name": "C"\n'
+                    '{"layer": "greennet", "kind": "link", "a": "N1", "b": "N4", "energy": true}\n'
+                    '{"layer": "cosmic", "kind": "wormhole", "a": "A"}\n')
+        layers, counts = self._load(self.path)
+        self.assertEqual(counts["rejected"], 5)
+        self.assertEqual(counts["unknown"], 1)
+        self.assertNotIn("C", layers["cosmic"].nodes)
+        csv_path = os.path.join(self.tmp.name, "topology.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("layer,kind,field1,field2\nquantum,node,Q1\nquantum,teleport,Q1\nmars,node,M\n")
+        layers, counts = self._load(csv_path)
+        self.assertEqual(counts["quantum.node"], 1)
+        self.assertEqual(counts["unknown"], 2)
+
+    def test_bulk_load_logs_one_summary(self):
+        """Per-item INFO logging is skipped during bulk loads."""
+        layers = {"quantum": QuantumInternet(), "cosmic": CosmicSubstrate()}
+        with self.assertLogs(level=logging.INFO) as logs:
+            load_topology(self.path, **layers)
+        self.assertEqual(len(logs.records), 1)
+
+    @staticmethod
+    def _state(layers):
+        greennet, quantum, cosmic = layers["greennet"], layers["quantum"], layers["cosmic"]
+        return {
+            "routes": greennet.routes,
+            "prefixes": set(greennet.routing_table.prefixes()),
+            "links": greennet.topology.links,
+            "quantum_nodes": set(quantum.nodes),
+            "entanglements": {tuple(sorted(link)) for link in quantum.entanglements.links()},
+            "cosmic_nodes": cosmic.nodes,
+            "channels": cosmic.channels,
+            "trust": cosmic.trust_scores,
+        }
+
+    def test_round_trip_jsonl_and_csv(self):
+        """Exported topologies reload into identical layer state."""
+        layers, _ = self._load(self.path)
+        layers["greennet"].add_prefix_route("192.168.0.0/24", "N2")
+        layers["greennet"].add_prefix_route("172.16.0.9/32", "N3")
+        for ext in ("jsonl", "csv"):
+            out = os.path.join(self.tmp.name, f"export.{ext}")
+            export_topology(out, **layers)
+            copy, counts = self._load(out)
+            self.assertEqual(counts["rejected"], 0)
+            self.assertEqual(counts["greennet.prefix"], 3)
+            self.assertEqual(self._state(copy), self._state(layers))
+
+if __name__ == "__main__":
+    unittest.main()
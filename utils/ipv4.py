@@ -0,0 +1,37 @@
+"""
+IPv4 Utility
+============
+
+Integer encoding of dotted-quad addresses and CIDR prefixes, shared by
+the GreenNet routing table, the unified firewall and the topology loader.
+"""
+
+from typing import Tuple
+
+
+def ip_to_int(address: str) -> int:
+    """Encode a dotted-quad IPv4 address as an integer (raises ValueError)."""
+    parts = address.split(".")
+    if len(parts) != 4 or not all(p.isdigit() for p in parts):
+        raise ValueError(f"Invalid IPv4 address: {address}")
+    a, b, c, d = map(int, parts)
+    if a > 255 or b > 255 or c > 255 or d > 255:
+        raise ValueError(f"Invalid IPv4 address: {address}")
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def int_to_ip(value: int) -> str:
+    """Decode an integer into a dotted-quad IPv4 address."""
+    return f"{value >> 24}.{(value >> 16) & 255}.{(value >> 8) & 255}.{value & 255}"
+
+
+def parse_cidr(prefix: str) -> Tuple[int, int]:
+    """Parse ``a.b.c.d/len`` (or a bare address as /32) into ``(network, len)``."""
+    address, _, length = prefix.partition("/")
+    network = ip_to_int(address)
+    plen = int(length) if length else 32
+    if not 0 <= plen <= 32:
+        raise ValueError(f"Invalid prefix length: {prefix}")
+    if network & ((1 << (32 - plen)) - 1):
+        raise ValueError(f"Prefix has host bits set: {prefix}")
+    return network, plen
@@ -6,8 +6,32 @@ Handles saving and loading system state for Internet ∞.
 """
 
 import json
+import logging
 import os
-from typing import Any, Dict
+from typing import Any, BinaryIO, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+def write_atomic(path: str, chunks: Iterable[bytes]) -> int:
+    """
+    Stream ``chunks`` into ``path`` via ``path.part``, renamed over ``path``
+    only once every chunk is written; on failure the partial file is
+    removed and ``path`` is left as it was. Returns the bytes written.
+    """
+    partial = path + ".part"
+    written = 0
+    try:
+        with open(partial, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    return written
 
 
 class StatePersistence:
@@ -28,6 +52,15 @@ class StatePersistence:
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
 
+    def save_stream(self, filename: str, chunks: Iterable[bytes]) -> int:
+        """Write a byte stream without buffering it; returns the bytes written."""
+        written = write_atomic(os.path.join(self.base_dir, filename), chunks)
+        logger.info(f"💾 Saved stream: {filename} ({written} bytes)")
+        return written
+
+    def open_stream(self, filename: str) -> BinaryIO:
+        return open(os.path.join(self.base_dir, filename), "rb")
+
     def save_all(self) -> None:
         """Placeholder: save all components if needed."""
         pass
@@ -0,0 +1,336 @@
+"""
+Topology Import/Export
+======================
+
+Streams large topologies in and out of the interconnect layers.
+
+Files hold one record per line, either JSONL
+(``{"layer": "cosmic", "kind": "resonance", "a": "A", "b": "B"}``) or CSV
+(``layer,kind,field1,field2,...`` with fields in ``FIELDS`` order). Records
+flow through a generator pipeline: parse → batch → validate and apply.
+Each batch is applied in dependency order (nodes before the links that
+reference them) straight into the layers' internal structures, skipping
+the per-call validation and INFO logging of the public ``add_*`` methods.
+Only one summary line is logged per load or export.
+
+Supported records:
+
+    greennet  route(node, address)   prefix(prefix, node)
+              link(a, b, energy, latency)   arc(a, b, energy, latency)
+    quantum   node(name)   entangle(a, b)
+    cosmic    node(name)   channel(name)   member(node, channel)
+              resonance(a, b, trust)
+
+Prefix routes are exported from GreenNet's trie, leaving out the /32
+host routes that ``route`` records already recreate.
+"""
+
+import csv
+import json
+import logging
+import os
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.ipv4 import int_to_ip, parse_cidr
+
+logger = logging.getLogger(__name__)
+
+Record = Tuple[str, str, Tuple[Any, ...]]
+
+FIELDS: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("greennet", "route"): ("node", "address"),
+    ("greennet", "prefix"): ("prefix", "node"),
+    ("greennet", "link"): ("a", "b", "energy", "latency"),
+    ("greennet", "arc"): ("a", "b", "energy", "latency"),
+    ("quantum", "node"): ("name",),
+    ("quantum", "entangle"): ("a", "b"),
+    ("cosmic", "node"): ("name",),
+    ("cosmic", "channel"): ("name",),
+    ("cosmic", "member"): ("node", "channel"),
+    ("cosmic", "resonance"): ("a", "b", "trust"),
+}
+
+# Fields holding numbers; every other field must be a string (or missing)
+NUMERIC = {"energy", "latency", "trust"}
+
+# Kinds are applied in this order within each batch
+ORDER = [
+    ("quantum", "node"), ("cosmic", "node"), ("cosmic", "channel"),
+    ("greennet", "route"), ("greennet", "prefix"), ("greennet", "link"), ("greennet", "arc"),
+    ("quantum", "entangle"), ("cosmic", "member"), ("cosmic", "resonance"),
+]
+
+
+def _format(path: str, fmt: Optional[str]) -> str:
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported topology format: {fmt}")
+    return fmt
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Record]:
+    """
+    Lazily parse a topology file into ``(layer, kind, values)`` records.
+    Malformed lines (invalid JSON, non-objects, fields of the wrong type)
+    come out as ``(None, None, ())``; records of an unknown layer or kind
+    keep their ``(layer, kind)`` with empty values.
+    """
+    fmt = _format(path, fmt)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            arity = {key: len(fields) for key, fields in FIELDS.items()}
+            for row in csv.reader(f):
+                if not row or row[:2] == ["layer", "kind"]:
+                    continue
+                n = arity.get(tuple(row[:2]))
+                if n is None:
+                    yield row[0], row[1] if len(row) > 1 else "", ()
+                    continue
+                values = tuple(row[2:2 + n])
+                if len(values) < n:
+                    values += (None,) * (n - len(values))
+                yield row[0], row[1], values
+        else:
+            loads = json.loads
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    obj = loads(line)
+                except ValueError:
+                    yield None, None, ()
+                    continue
+                if not isinstance(obj, dict):
+                    yield None, None, ()
+                    continue
+                layer, kind = obj.get("layer"), obj.get("kind")
+                if not isinstance(layer, str) or not isinstance(kind, str):
+                    yield None, None, ()
+                    continue
+                fields = FIELDS.get((layer, kind))
+                if fields is None:
+                    yield layer, kind, ()
+                    continue
+                values = tuple(obj.get(name) for name in fields)
+                if all(_valid(name, value) for name, value in zip(fields, values)):
+                    yield layer, kind, values
+                else:
+                    yield None, None, ()
+
+
+def _valid(field: str, value: Any) -> bool:
+    if value is None or isinstance(value, str):
+        return True
+    return field in NUMERIC and isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def write_records(path: str, records: Iterable[Record], fmt: Optional[str] = None) -> int:
+    """Stream records to a JSONL or CSV file; returns the number written."""
+    fmt = _format(path, fmt)
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(["layer", "kind", "field1", "field2", "field3", "field4"])
+            for layer, kind, values in records:
+                writer.writerow([layer, kind, *("" if v is None else v for v in values)])
+                written += 1
+        else:
+            dumps = json.dumps
+            for layer, kind, values in records:
+                obj = {"layer": layer, "kind": kind}
+                obj.update(zip(FIELDS[(layer, kind)], values))
+                f.write(dumps(obj, ensure_ascii=False) + "\n")
+                written += 1
+    return written
+
+
+def batched(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """Group a record stream into lists of at most ``size``."""
+    it = iter(records)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+# ======================
+# LOADERS (one per record kind; each returns the number accepted)
+# ======================
+
+def _greennet_route(gn, rows) -> int:
+    return gn.add_routes(rows)
+
+
+def _greennet_prefix(gn, rows) -> int:
+    ok = 0
+    for prefix, node in rows:
+        try:
+            network, plen = parse_cidr(prefix)
+        except (ValueError, AttributeError):
+            continue
+        gn.routing_table.insert_int(network, plen, node)
+        ok += 1
+    return ok
+
+
+def _greennet_links(bidirectional: bool) -> Callable:
+    def load(gn, rows) -> int:
+        ok = 0
+        for a, b, energy, latency in rows:
+            try:
+                gn.topology.set_link(a, b, float(energy), float(latency or 0.0), bidirectional)
+            except (TypeError, ValueError):
+                continue
+            ok += 1
+        return ok
+    return load
+
+
+def _quantum_node(qi, rows) -> int:
+    return qi.add_nodes(name for (name,) in rows)
+
+
+def _quantum_entangle(qi, rows) -> int:
+    return qi.entangle_many(rows)
+
+
+def _cosmic_node(cs, rows) -> int:
+    return cs.add_nodes(name for (name,) in rows)
+
+
+def _cosmic_channel(cs, rows) -> int:
+    return cs.create_channels(name for (name,) in rows)
+
+
+def _cosmic_member(cs, rows) -> int:
+    nodes, channels = cs.nodes, cs.channels
+    ok = 0
+    for node, channel in rows:
+        if node in nodes and channel in channels:
+            nodes[node]["channels"].add(channel)
+            channels[channel]["nodes"].add(node)
+            ok += 1
+    return ok
+
+
+def _cosmic_resonance(cs, rows) -> int:
+    scores, engine = cs.trust_scores, cs.trust_engine
+    ok = 0
+    for a, b, trust in rows:
+        if a not in scores or b not in scores:
+            continue
+        try:
+            trust = 85 if trust in (None, "") else float(trust)
+        except ValueError:
+            continue
+        scores[a][b] = scores[b][a] = trust
+        engine.set_trust(a, b, trust)
+        engine.set_trust(b, a, trust)
+        ok += 1
+    return ok
+
+
+LOADERS: Dict[Tuple[str, str], Callable] = {
+    ("greennet", "route"): _greennet_route,
+    ("greennet", "prefix"): _greennet_prefix,
+    ("greennet", "link"): _greennet_links(True),
+    ("greennet", "arc"): _greennet_links(False),
+    ("quantum", "node"): _quantum_node,
+    ("quantum", "entangle"): _quantum_entangle,
+    ("cosmic", "node"): _cosmic_node,
+    ("cosmic", "channel"): _cosmic_channel,
+    ("cosmic", "member"): _cosmic_member,
+    ("cosmic", "resonance"): _cosmic_resonance,
+}
+
+
+def load_topology(
+    path: str,
+    greennet=None,
+    quantum=None,
+    cosmic=None,
+    fmt: Optional[str] = None,
+    batch_size: int = 50_000,
+) -> Dict[str, int]:
+    """
+    Bulk-load a topology file into the given layer instances.
+
+    Records for layers that were not passed in are skipped. Returns counts
+    of accepted records per ``layer.kind`` plus ``rejected`` (malformed
+    lines, invalid rows or references to unknown nodes/channels),
+    ``unknown`` (unrecognised layer or kind) and ``skipped``.
+    """
+    layers = {"greennet": greennet, "quantum": quantum, "cosmic": cosmic}
+    counts: Dict[str, int] = {"rejected": 0, "unknown": 0, "skipped": 0}
+    for batch in batched(iter_records(path, fmt), batch_size):
+        groups: Dict[Tuple[str, str], List[Tuple[Any, ...]]] = {}
+        for layer, kind, values in batch:
+            groups.setdefault((layer, kind), []).append(values)
+        counts["rejected"] += len(groups.pop((None, None), ()))
+        for key in [key for key in groups if key not in FIELDS]:
+            counts["unknown"] += len(groups.pop(key))
+        for key in ORDER:
+            rows = groups.get(key)
+            if not rows:
+                continue
+            target = layers[key[0]]
+            if target is None:
+                counts["skipped"] += len(rows)
+                continue
+            accepted = LOADERS[key](target, rows)
+            name = ".".join(key)
+            counts[name] = counts.get(name, 0) + accepted
+            counts["rejected"] += len(rows) - accepted
+    logger.info(f"📥 Topology loaded from {path}: {counts}")
+    return counts
+
+
+# ======================
+# EXPORTERS
+# ======================
+
+def iter_topology(greennet=None, quantum=None, cosmic=None) -> Iterator[Record]:
+    """Yield the records describing the given layers, nodes before links."""
+    if quantum is not None:
+        for name in quantum.nodes:
+            yield "quantum", "node", (name,)
+        for a, b in quantum.entanglements.links():
+            yield "quantum", "entangle", (a, b)
+
+    if cosmic is not None:
+        for name in cosmic.nodes:
+            yield "cosmic", "node", (name,)
+        for name, channel in cosmic.channels.items():
+            yield "cosmic", "channel", (name,)
+            for node in channel["nodes"]:
+                yield "cosmic", "member", (node, name)
+        for a, peers in cosmic.trust_scores.items():
+            for b, trust in peers.items():
+                if a < b or cosmic.trust_scores.get(b, {}).get(a) != trust:
+                    yield "cosmic", "resonance", (a, b, trust)
+
+    if greennet is not None:
+        routes = greennet.routes
+        for node, address in routes.items():
+            yield "greennet", "route", (node, address)
+        for network, plen, node in greennet.routing_table.prefixes():
+            address = int_to_ip(network)
+            if plen != 32 or routes.get(node) != address:
+                yield "greennet", "prefix", (f"{address}/{plen}", node)
+        links = greennet.topology.links
+        for (a, b), (energy, latency) in links.items():
+            if links.get((b, a)) == (energy, latency):
+                if a < b:
+                    yield "greennet", "link", (a, b, energy, latency)
+            else:
+                yield "greennet", "arc", (a, b, energy, latency)
+
+
+def export_topology(path: str, greennet=None, quantum=None, cosmic=None, fmt: Optional[str] = None) -> int:
+    """Stream the given layers to a JSONL or CSV topology file."""
+    written = write_records(path, iter_topology(greennet, quantum, cosmic), fmt)
+    logger.info(f"📤 Topology exported to {path}: {written} records")
+    return written